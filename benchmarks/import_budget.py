@@ -0,0 +1,159 @@
+"""
+Import-time budget check for the mcp_demo server.
+
+Every stdio client spawns a fresh server process, so the time spent
+importing ``mcp_demo.server`` is paid on every session before it can
+answer ``initialize``. This script imports the module in a fresh
+interpreter with ``python -X importtime``, parses the report, and fails
+(exit status 1) when:
+
+- the total import time (median of ``--runs``) exceeds ``--budget-ms``, or
+- a module that should be deferred (``--forbid``, numpy by default) is
+  imported at startup.
+
+It also lists the slowest top-level imports to show where the time goes.
+
+Usage:
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --fast-start --budget-ms 400
+    python benchmarks/import_budget.py --module mcp_demo.server --forbid numpy openai
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULE = "mcp_demo.server"
+DEFAULT_BUDGET_MS = 1000.0
+DEFAULT_FORBIDDEN = ["numpy"]
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """Parse ``-X importtime`` lines; nesting depth comes from name indentation."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        records.append(
+            ImportRecord(
+                module=stripped,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return records
+
+
+def measure(module: str, env: dict[str, str]) -> list[ImportRecord]:
+    """Import ``module`` in a fresh interpreter and return the import report."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def total_ms(records: list[ImportRecord]) -> float:
+    return sum(record.cumulative_us for record in records if record.depth == 0) / 1000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check mcp_demo server import time")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Module to import")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("MCP_DEMO_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+        help="Maximum median import time in milliseconds",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Fresh interpreters to measure"
+    )
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=DEFAULT_FORBIDDEN,
+        help="Top-level packages that must not be imported at startup",
+    )
+    parser.add_argument(
+        "--fast-start", action="store_true", help="Measure with MCP_DEMO_FAST_START=1"
+    )
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Measure startup imports and exit non-zero if the budget is broken."""
+    args = parse_args()
+    env = {**os.environ, "MCP_DEMO_FAST_START": "1" if args.fast_start else "0"}
+
+    runs = [measure(args.module, env) for _ in range(max(1, args.runs))]
+    totals = [total_ms(records) for records in runs]
+    median = statistics.median(totals)
+    # Report details from the run closest to the median
+    records = min(zip(totals, runs), key=lambda item: abs(item[0] - median))[1]
+
+    print(
+        f"Import of {args.module}: median {median:.1f} ms over {len(runs)} runs "
+        f"(min {min(totals):.1f}, max {max(totals):.1f}); "
+        f"budget {args.budget_ms:.0f} ms"
+    )
+    print("\nSlowest top-level imports:")
+    top_level = sorted(
+        (record for record in records if record.depth == 0),
+        key=lambda record: record.cumulative_us,
+        reverse=True,
+    )
+    for record in top_level[: args.top]:
+        print(f"  {record.cumulative_us / 1000:>9.1f} ms  {record.module}")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(
+            f"median import time {median:.1f} ms exceeds {args.budget_ms:.0f} ms"
+        )
+    imported = {record.module.split(".")[0] for record in records}
+    for package in args.forbid:
+        if package in imported:
+            failures.append(f"{package} is imported at startup but should be deferred")
+
+    if failures:
+        print("\nImport budget check FAILED:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nImport budget check passed")
+
+
+if __name__ == "__main__":
+    main()
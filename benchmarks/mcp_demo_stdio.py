@@ -0,0 +1,281 @@
+"""
+Latency and throughput benchmark for the mcp_demo server over stdio.
+
+Measures the stdio hot path of the ``mcp-server`` entry point:
+- cold start: process spawn until ``initialize`` completes
+- round-trip latency of ``add``, ``divide`` and ``read_resource("greeting://...")``
+- sustained calls/sec from one session with several requests in flight
+- sustained calls/sec across N concurrent sessions (one server process each)
+
+Results are printed and can be saved as JSON. ``--compare`` checks a run
+against a saved baseline and exits with status 1 if any metric regressed by
+more than ``--threshold`` (latencies rising, throughput falling).
+
+Usage:
+    python benchmarks/mcp_demo_stdio.py --json baseline.json
+    python benchmarks/mcp_demo_stdio.py --compare baseline.json --threshold 0.15
+    python benchmarks/mcp_demo_stdio.py --server-command mcp-server --sessions 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from mcp_demo.session_pool import SessionPool
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Metric name suffixes decide which direction counts as a regression
+LOWER_IS_BETTER = "_ms"
+HIGHER_IS_BETTER = "_rps"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(name: str, seconds: list[float]) -> dict[str, float]:
+    """Latency summary in milliseconds, keyed ``<name>_<stat>_ms``."""
+    ordered = sorted(seconds)
+    return {
+        f"{name}_mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        f"{name}_p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        f"{name}_p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        f"{name}_p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+def server_params(args: argparse.Namespace) -> StdioServerParameters:
+    command, *command_args = args.server_command
+    return StdioServerParameters(command=command, args=command_args, cwd=str(REPO_ROOT))
+
+
+async def measure_cold_start(
+    params: StdioServerParameters, runs: int
+) -> dict[str, float]:
+    """Time from spawning the server until ``initialize`` returns."""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                samples.append(time.perf_counter() - started)
+    return summarize("cold_start", samples)
+
+
+async def time_calls(
+    call: Callable[[], Awaitable[Any]], iterations: int, warmup: int
+) -> list[float]:
+    """Run ``call`` sequentially and return each round-trip time in seconds."""
+    for _ in range(warmup):
+        await call()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def measure_latency(
+    params: StdioServerParameters, iterations: int, warmup: int
+) -> dict[str, float]:
+    """Sequential round-trip latency of representative calls on one session."""
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            operations = {
+                "add": lambda: session.call_tool("add", {"a": 10, "b": 5}),
+                "divide": lambda: session.call_tool("divide", {"a": 20, "b": 4}),
+                "greeting": lambda: session.read_resource("greeting://Benchmark"),
+            }
+            metrics: dict[str, float] = {}
+            for name, call in operations.items():
+                metrics.update(
+                    summarize(name, await time_calls(call, iterations, warmup))
+                )
+            return metrics
+
+
+async def drive(session: Any, total: int, in_flight: int) -> float:
+    """Issue ``total`` add calls from ``in_flight`` workers; return elapsed seconds."""
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await session.call_tool("add", {"a": remaining, "b": 1})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(in_flight)))
+    return time.perf_counter() - started
+
+
+async def measure_single_session_throughput(
+    params: StdioServerParameters, total: int, in_flight: int
+) -> dict[str, float]:
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await drive(session, in_flight, in_flight)
+            duration = await drive(session, total, in_flight)
+    return {"single_session_rps": round(total / duration, 2)}
+
+
+async def measure_multi_session_throughput(
+    params: StdioServerParameters, sessions: int, total: int, in_flight: int
+) -> dict[str, float]:
+    async with SessionPool(params, size=sessions) as pool:
+        await drive(pool, sessions * in_flight, sessions * in_flight)
+        duration = await drive(pool, total, sessions * in_flight)
+    return {f"sessions_{sessions}_rps": round(total / duration, 2)}
+
+
+def compare(
+    baseline: dict[str, float], current: dict[str, float], threshold: float
+) -> list[str]:
+    """Describe every metric that regressed by more than ``threshold``."""
+    regressions = []
+    for name, value in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        change = (value - before) / before
+        if name.endswith(LOWER_IS_BETTER) and change > threshold:
+            regressions.append(f"{name}: {before} -> {value} ({change:+.1%})")
+        elif name.endswith(HIGHER_IS_BETTER) and -change > threshold:
+            regressions.append(f"{name}: {before} -> {value} ({change:+.1%})")
+    return regressions
+
+
+def print_metrics(metrics: dict[str, float], baseline: dict[str, float] | None) -> None:
+    for name, value in metrics.items():
+        line = f"{name:<32}{value:>12}"
+        if baseline and baseline.get(name):
+            line += f"{(value - baseline[name]) / baseline[name]:>+10.1%}"
+        print(line)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the mcp_demo server over stdio"
+    )
+    parser.add_argument(
+        "--server-command",
+        nargs="+",
+        default=[sys.executable, "-m", "mcp_demo.server"],
+        help="Server command (default: this Python, -m mcp_demo.server)",
+    )
+    parser.add_argument(
+        "--cold-starts", type=int, default=5, help="Server spawns to time"
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="Calls per latency probe"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=20, help="Untimed calls before each probe"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=2000, help="Calls per throughput run"
+    )
+    parser.add_argument(
+        "--in-flight", type=int, default=8, help="Concurrent requests per session"
+    )
+    parser.add_argument(
+        "--sessions", type=int, default=4, help="Sessions for the multi-session run"
+    )
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    parser.add_argument(
+        "--compare", type=Path, help="Baseline JSON to check for regressions"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Allowed relative regression (0.10 = 10%%)",
+    )
+    return parser.parse_args()
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, float]:
+    params = server_params(args)
+    metrics: dict[str, float] = {}
+    logger.info(f"Measuring cold start over {args.cold_starts} spawns")
+    metrics.update(await measure_cold_start(params, args.cold_starts))
+    logger.info(f"Measuring round-trip latency over {args.iterations} calls")
+    metrics.update(await measure_latency(params, args.iterations, args.warmup))
+    logger.info(f"Measuring single-session throughput ({args.in_flight} in flight)")
+    metrics.update(
+        await measure_single_session_throughput(params, args.requests, args.in_flight)
+    )
+    logger.info(f"Measuring throughput across {args.sessions} sessions")
+    metrics.update(
+        await measure_multi_session_throughput(
+            params, args.sessions, args.requests, args.in_flight
+        )
+    )
+    return metrics
+
+
+def main() -> None:
+    """Run the benchmark, then save and/or compare the results."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["metrics"]
+
+    metrics = asyncio.run(run_benchmark(args))
+    print_metrics(metrics, baseline)
+
+    if args.json:
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "server_command": args.server_command,
+                "iterations": args.iterations,
+                "requests": args.requests,
+                "in_flight": args.in_flight,
+                "sessions": args.sessions,
+            },
+            "metrics": metrics,
+        }
+        args.json.write_text(json.dumps(report, indent=2))
+        logger.info(f"Wrote results to {args.json}")
+
+    if baseline is not None:
+        regressions = compare(baseline, metrics, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
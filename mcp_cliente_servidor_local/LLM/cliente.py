@@ -21,7 +21,8 @@ async def run():
                 print("💬 Escribe tu mensaje (ejemplo: 'Dime el horóscopo de Libra').\nEscribe 'salir' para terminar.\n")
 
                 while True:
-                    user_input = input("🗣️ Tú: ")
+                    # input() bloquea: se lee en un hilo para no parar el event loop
+                    user_input = await asyncio.to_thread(input, "🗣️ Tú: ")
                     if user_input.lower() in {"salir", "exit", "quit"}:
                         break
 
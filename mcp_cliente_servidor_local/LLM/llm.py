@@ -1,11 +1,36 @@
 import os
 import json
-from openai import OpenAI
+import asyncio
+import weakref
+from openai import AsyncOpenAI
 
 # Reemplaza o usa variable de entorno
 OPEN_API_KEY = "OPEN_API_KEY"
 
-client = OpenAI(api_key=OPEN_API_KEY)
+# Límites para las llamadas al LLM
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Cliente y semáforo por event loop: los dos quedan ligados al loop en que
+# se usan, y cada asyncio.run() o reinicio del loop de fondo crea uno nuevo
+_loop_resources = weakref.WeakKeyDictionary()
+
+def llm_resources():
+    """
+    Devuelve el cliente AsyncOpenAI y el semáforo del event loop actual.
+
+    El cliente reutiliza conexiones dentro del loop y el semáforo limita las
+    llamadas simultáneas al LLM a LLM_MAX_CONCURRENCY.
+    """
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None:
+        resources = (
+            AsyncOpenAI(api_key=OPEN_API_KEY, timeout=LLM_TIMEOUT, max_retries=2),
+            asyncio.Semaphore(LLM_MAX_CONCURRENCY),
+        )
+        _loop_resources[loop] = resources
+    return resources
 
 def build_prompt(user_message: str) -> str:
     return f"""
@@ -28,13 +53,25 @@ Usuario: {user_message}
 """
 
 async def interpret_with_gpt(user_message: str):
+    """
+    Pide al LLM que interprete el mensaje sin bloquear el event loop.
+
+    Espera turno en el semáforo del loop y limita la llamada completa (reintentos
+    incluidos) a LLM_TIMEOUT segundos; lanza TimeoutError si se supera.
+    Si la tarea se cancela, la petición HTTP en curso se cancela con ella.
+    """
     prompt = build_prompt(user_message)
 
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0
-    )
+    client, semaphore = llm_resources()
+    async with semaphore:
+        response = await asyncio.wait_for(
+            client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0
+            ),
+            timeout=LLM_TIMEOUT,
+        )
 
     raw = response.choices[0].message.content
     return json.loads(raw)
@@ -3,6 +3,7 @@ import traceback
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from llm import interpret_with_gpt
+from intent_router import router
 
 server_params = StdioServerParameters(
     command="python",
@@ -21,12 +22,18 @@ async def run():
                 print("Escribe 'salir' para terminar.\n")
 
                 while True:
-                    user_input = input("🗣️ Tú: ")
+                    # input() bloquea: se lee en un hilo para no parar el event loop
+                    user_input = await asyncio.to_thread(input, "🗣️ Tú: ")
                     if user_input.lower() in {"salir", "exit", "quit"}:
                         break
 
                     try:
-                        parsed = await interpret_with_gpt(user_input)
+                        # Las peticiones claras de horóscopo no pasan por el LLM
+                        parsed = router.route(user_input)
+                        if parsed is not None:
+                            print("⚡ Ruta rápida (sin LLM)")
+                        else:
+                            parsed = await interpret_with_gpt(user_input)
 
                         # Si el modelo indica usar una herramienta
                         if isinstance(parsed, dict) and "tool" in parsed:
@@ -69,5 +76,11 @@ async def run():
         print("❌ Error general:")
         traceback.print_exc()
 
+    stats = router.stats
+    print(
+        f"📊 Ruta rápida: {stats.fast_path}/{stats.total} mensajes "
+        f"({stats.hit_rate:.0%}) sin LLM"
+    )
+
 if __name__ == "__main__":
     asyncio.run(run())
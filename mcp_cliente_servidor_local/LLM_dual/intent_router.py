@@ -0,0 +1,138 @@
+import re
+import unicodedata
+from dataclasses import dataclass
+
+# Ruta rápida sin LLM: reconoce "horóscopo de <signo>" localmente y devuelve
+# la misma estructura que interpret_with_gpt, así que el cliente llama a la
+# herramienta MCP directamente. Lo ambiguo se sigue enviando al LLM.
+
+TOOL_NAME = "obtener_horoscopo"
+
+# Forma normalizada (sin acentos, minúsculas) -> nombre del signo
+SIGNS = {
+    "aries": "Aries",
+    "tauro": "Tauro",
+    "taurus": "Tauro",
+    "geminis": "Géminis",
+    "gemini": "Géminis",
+    "cancer": "Cáncer",
+    "leo": "Leo",
+    "virgo": "Virgo",
+    "libra": "Libra",
+    "escorpio": "Escorpio",
+    "escorpion": "Escorpio",
+    "scorpio": "Escorpio",
+    "sagitario": "Sagitario",
+    "sagittarius": "Sagitario",
+    "capricornio": "Capricornio",
+    "capricorn": "Capricornio",
+    "acuario": "Acuario",
+    "aquarius": "Acuario",
+    "piscis": "Piscis",
+    "pisces": "Piscis",
+}
+
+# Palabras que indican que se pide un horóscopo, con su peso. Las fuertes
+# alcanzan el umbral por sí solas; las débiles ("hoy", "suerte") son comunes
+# en frases normales ("el precio de la libra hoy") y solo suman
+INTENT_WORDS = {
+    "horoscopo": 3,
+    "horoscopos": 3,
+    "horoscope": 3,
+    "prediccion": 2,
+    "predicciones": 2,
+    "zodiaco": 2,
+    "zodiac": 2,
+    "signo": 2,
+    "astros": 1,
+    "suerte": 1,
+    "depara": 1,
+    "hoy": 1,
+}
+
+# Palabras que no cambian la intención; un mensaje con solo un signo y
+# estas palabras ("libra", "y para piscis?") también va por la ruta rápida
+FILLER_WORDS = frozenset(
+    "y el la de del para mi soy dime dame que por favor porfa "
+    "hola sobre the for my me".split()
+)
+
+INTENT_THRESHOLD = 2
+# Palabras ajenas toleradas junto a la intención ("quiero saber mi horóscopo")
+MAX_OTHER_WORDS = 3
+
+
+def normalize(text: str) -> list[str]:
+    """Minúsculas, sin acentos ni signos de puntuación, separado en palabras."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return re.findall(r"[a-z]+", plain)
+
+
+@dataclass
+class RouterStats:
+    """Cuántos mensajes resolvió la ruta rápida y cuántos fueron al LLM."""
+
+    total: int = 0
+    fast_path: int = 0
+
+    @property
+    def llm(self) -> int:
+        return self.total - self.fast_path
+
+    @property
+    def hit_rate(self) -> float:
+        return self.fast_path / self.total if self.total else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "total": self.total,
+            "fast_path": self.fast_path,
+            "llm": self.llm,
+            "hit_rate": round(self.hit_rate, 3),
+        }
+
+
+class IntentRouter:
+    """Clasificador ligero por palabras clave para peticiones de horóscopo."""
+
+    def __init__(self):
+        self.stats = RouterStats()
+
+    def classify(self, message: str):
+        """
+        Devuelve el signo si el mensaje pide claramente un horóscopo, o None.
+
+        Hace falta exactamente un signo y, además, una palabra de intención
+        fuerte ("horóscopo", "predicción", "signo") o que el resto del mensaje
+        sea de relleno. Así "leo un libro", "cáncer de piel hoy" o "el precio
+        de la libra hoy" no se confunden con un signo, y varios signos en un
+        mensaje se dejan al LLM.
+        """
+        words = normalize(message)
+        signs = {SIGNS[word] for word in words if word in SIGNS}
+        if len(signs) != 1:
+            return None
+        score = sum(INTENT_WORDS.get(word, 0) for word in words)
+        others = [
+            word
+            for word in words
+            if word not in SIGNS
+            and word not in FILLER_WORDS
+            and word not in INTENT_WORDS
+        ]
+        if not others or (score >= INTENT_THRESHOLD and len(others) <= MAX_OTHER_WORDS):
+            return signs.pop()
+        return None
+
+    def route(self, message: str):
+        """Estructura de llamada a la herramienta si el mensaje es claro, o None."""
+        self.stats.total += 1
+        sign = self.classify(message)
+        if sign is None:
+            return None
+        self.stats.fast_path += 1
+        return {"tool": TOOL_NAME, "arguments": {"sign": sign}}
+
+
+router = IntentRouter()
@@ -1,8 +1,19 @@
-from flask import Flask, render_template, request, jsonify
-import asyncio
-from client import run_message
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    render_template,
+    request,
+    stream_with_context,
+)
+import atexit
+import json
+from client import run_message, runner, stream_message_events
+from intent_router import router
 
 app = Flask(__name__)
+# Cierra las sesiones MCP y el loop de fondo al salir
+atexit.register(runner.stop)
 
 @app.route("/")
 def index():
@@ -11,10 +22,32 @@ def index():
 @app.route("/send", methods=["POST"])
 def send_message():
     user_message = request.json.get("message", "")
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    response = loop.run_until_complete(run_message(user_message))
+    response = run_message(user_message)
     return jsonify({"response": response})
 
+@app.route("/stream")
+def stream_message():
+    """
+    Server-Sent Events: envía los fragmentos del LLM, el aviso de llamada a
+    herramienta y su resultado a medida que ocurren.
+    """
+    user_message = request.args.get("message", "")
+
+    def events():
+        stream = runner.stream(lambda pool: stream_message_events(pool, user_message))
+        for event, data in stream:
+            yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.route("/stats")
+def stats():
+    """Tasa de aciertos de la ruta rápida sin LLM."""
+    return jsonify(router.stats.summary())
+
 if __name__ == "__main__":
     app.run(debug=True)
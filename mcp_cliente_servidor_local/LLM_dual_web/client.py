@@ -1,14 +1,100 @@
 import asyncio
+import os
+import queue
+import sys
+import threading
 import traceback
+from pathlib import Path
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from llm import interpret_with_gpt
+from llm import StreamingReply, interpret_with_gpt, stream_gpt
+from intent_router import router
 
 server_params = StdioServerParameters(
-    command="python",
-    args=["server.py"]  # Lanza el servidor del horóscopo
+    command=sys.executable,
+    args=[str(Path(__file__).parent / "server.py")]  # Lanza el servidor del horóscopo
 )
 
+# Sesiones MCP calientes que comparte la app web
+POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2"))
+REQUEST_TIMEOUT = float(os.getenv("MCP_REQUEST_TIMEOUT", "60"))
+
+class SessionPool:
+    """
+    Pool mínimo de sesiones MCP ya inicializadas para la app web.
+
+    Cada sesión vive en su propia tarea, porque los task groups de
+    stdio_client y ClientSession deben abrirse y cerrarse en la misma tarea.
+    Las sesiones libres esperan en una cola y cada una atiende una sola
+    llamada a la vez. No reinicia servidores caídos: si uno falla, reinicia
+    la app.
+    """
+
+    def __init__(self, params: StdioServerParameters, size: int = 2):
+        self.params = params
+        self.size = size
+        self._idle = None
+        self._stop = None
+        self._tasks = []
+
+    async def start(self):
+        """Lanza los servidores y espera a que todas las sesiones estén listas."""
+        loop = asyncio.get_running_loop()
+        self._idle = asyncio.Queue()
+        self._stop = asyncio.Event()
+        ready = [loop.create_future() for _ in range(self.size)]
+        self._tasks = [asyncio.create_task(self._own(future)) for future in ready]
+        try:
+            await asyncio.gather(*ready)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _own(self, ready):
+        try:
+            async with stdio_client(self.params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    ready.set_result(None)
+                    self._idle.put_nowait(session)
+                    await self._stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                traceback.print_exc()
+
+    async def call_tool(self, name: str, arguments: dict | None = None):
+        """Llama a una herramienta con la primera sesión libre."""
+        session = await self._idle.get()
+        try:
+            return await session.call_tool(name, arguments=arguments)
+        finally:
+            self._idle.put_nowait(session)
+
+    async def close(self):
+        """Cierra todas las sesiones y sus servidores."""
+        if self._stop is not None:
+            self._stop.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+def tool_result_text(result) -> str:
+    """
+    Texto de un CallToolResult.
+
+    Si la herramienta falla, o no devuelve contenido estructurado,
+    structuredContent es None y el texto está en result.content.
+    """
+    text = None
+    if result.content and hasattr(result.content[0], "text"):
+        text = result.content[0].text
+    if result.isError:
+        return f"❌ La herramienta falló: {text or 'sin detalle'}"
+    if result.structuredContent is not None:
+        return result.structuredContent.get("result", text or "Sin respuesta")
+    return text or "Sin respuesta"
+
 async def run():
     """Modo terminal: conversación continua"""
     try:
@@ -21,7 +107,8 @@ async def run():
                 print("💬 Escribe tu mensaje. Ejemplo: 'Dime el horóscopo de Libra' o '¿Quién es Albert Einstein?'.\nEscribe 'salir' para terminar.\n")
 
                 while True:
-                    user_input = input("🗣️ Tú: ")
+                    # input() bloquea: se lee en un hilo para no parar el event loop
+                    user_input = await asyncio.to_thread(input, "🗣️ Tú: ")
                     if user_input.lower() in {"salir", "exit", "quit"}:
                         break
 
@@ -41,8 +128,15 @@ async def run():
 async def process_message(session, user_input: str) -> str:
     """
     Procesa un mensaje usando el LLM y MCP.
+
+    `session` puede ser una ClientSession o un SessionPool: solo se usa
+    call_tool, así que con el pool la sesión se ocupa únicamente durante
+    la llamada a la herramienta y no mientras responde el LLM.
     """
-    parsed = await interpret_with_gpt(user_input)
+    # Las peticiones claras de horóscopo no pasan por el LLM
+    parsed = router.route(user_input)
+    if parsed is None:
+        parsed = await interpret_with_gpt(user_input)
 
     # Si el modelo indica herramienta
     if isinstance(parsed, dict) and "tool" in parsed:
@@ -50,7 +144,7 @@ async def process_message(session, user_input: str) -> str:
         args = parsed.get("arguments", {})
         print(f"🔧 Ejecutando {tool} con {args}...")
         result = await session.call_tool(tool, arguments=args)
-        return result.structuredContent.get("result", "Sin respuesta")
+        return tool_result_text(result)
 
     # Si el modelo devuelve solo respuesta libre
     elif isinstance(parsed, dict) and "response" in parsed:
@@ -62,15 +156,149 @@ async def process_message(session, user_input: str) -> str:
 
     return "⚠️ Respuesta inesperada del modelo."
 
-async def run_message(user_input: str) -> str:
+async def stream_message_events(session, user_input: str):
+    """
+    Versión en streaming de process_message para la interfaz web.
+
+    Genera eventos (nombre, datos) a medida que ocurren:
+    - "token": fragmento de la respuesta del LLM
+    - "tool": se va a llamar a una herramienta (y si fue por la ruta rápida)
+    - "result": texto devuelto por la herramienta
+    - "done": respuesta final completa
+    """
+    parsed = router.route(user_input)
+    fast_path = parsed is not None
+    streamed = ""
+    if parsed is None:
+        reply = StreamingReply()
+        async for delta in stream_gpt(user_input):
+            text = reply.feed(delta)
+            if text:
+                yield "token", {"text": text}
+        parsed = reply.result()
+        streamed = reply.streamed
+
+    if isinstance(parsed, dict) and "tool" in parsed:
+        tool = parsed["tool"]
+        args = parsed.get("arguments", {})
+        yield "tool", {"tool": tool, "arguments": args, "fast_path": fast_path}
+        result = await session.call_tool(tool, arguments=args)
+        final = tool_result_text(result)
+        yield "result", {"text": final}
+
+    elif isinstance(parsed, dict) and "response" in parsed:
+        final = parsed["response"]
+        if not streamed:
+            yield "token", {"text": final}
+
+    else:
+        final = "⚠️ Respuesta inesperada del modelo."
+        yield "token", {"text": final}
+
+    yield "done", {"response": final}
+
+class BackgroundRunner:
+    """
+    Event loop de larga vida en su propio hilo, dueño de un pool de sesiones MCP.
+
+    Flask atiende cada petición en un hilo síncrono; en lugar de crear un
+    loop y lanzar un servidor nuevo por mensaje, las peticiones se envían a
+    este loop con run_coroutine_threadsafe y usan sesiones ya inicializadas.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        self.pool_size = pool_size
+        self._loop = None
+        self._thread = None
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Arranca el hilo y el pool la primera vez que se necesitan."""
+        with self._lock:
+            if self._pool is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name="mcp-loop", daemon=True
+            )
+            self._thread.start()
+            pool = SessionPool(server_params, size=self.pool_size)
+            try:
+                asyncio.run_coroutine_threadsafe(pool.start(), self._loop).result()
+            except Exception:
+                # Sin pool no sirve el hilo; se reintenta en la siguiente petición
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join()
+                self._loop.close()
+                raise
+            self._pool = pool
+
+    def run(self, coro_factory, timeout: float = REQUEST_TIMEOUT):
+        """Ejecuta `coro_factory(pool)` en el loop de fondo y espera el resultado."""
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro_factory(self._pool), self._loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stream(self, agen_factory, timeout: float = REQUEST_TIMEOUT):
+        """
+        Recorre `agen_factory(pool)` (un generador asíncrono) en el loop de fondo
+        y entrega sus elementos al hilo que llama, según van llegando.
+
+        Si no llega nada en `timeout` segundos, o si quien consume deja de
+        leer (p. ej. el navegador cierra la conexión), la tarea se cancela.
+        """
+        self.start()
+        items = queue.Queue()
+        finished = object()
+
+        async def pump():
+            try:
+                async for item in agen_factory(self._pool):
+                    items.put(item)
+            except Exception:
+                traceback.print_exc()
+                items.put(("error", {"message": "❌ Error al procesar tu solicitud."}))
+            finally:
+                items.put(finished)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._loop)
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=timeout)
+                except queue.Empty:
+                    yield "error", {"message": "⌛ La respuesta tardó demasiado."}
+                    return
+                if item is finished:
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    def stop(self):
+        """Cierra las sesiones, detiene el loop y espera al hilo."""
+        with self._lock:
+            if self._pool is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._pool.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._pool = None
+
+runner = BackgroundRunner()
+
+def run_message(user_input: str) -> str:
     """
-    Ejecuta UNA sola interacción para app web.
+    Ejecuta UNA sola interacción para app web usando el pool compartido.
     """
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                return await process_message(session, user_input)
+        return runner.run(lambda pool: process_message(pool, user_input))
 
     except Exception as e:
         traceback.print_exc()
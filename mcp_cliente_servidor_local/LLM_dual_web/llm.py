@@ -1,13 +1,39 @@
 import os
+import re
 import json
-from openai import OpenAI
+import asyncio
+import weakref
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
 # Reemplaza o usa variable de entorno
 load_dotenv()
 OPEN_API_KEY = os.getenv("OPEN_API_KEY")
 
-client = OpenAI(api_key=OPEN_API_KEY)
+# Límites para las llamadas al LLM
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Cliente y semáforo por event loop: los dos quedan ligados al loop en que
+# se usan, y cada asyncio.run() o reinicio del loop de fondo crea uno nuevo
+_loop_resources = weakref.WeakKeyDictionary()
+
+def llm_resources():
+    """
+    Devuelve el cliente AsyncOpenAI y el semáforo del event loop actual.
+
+    El cliente reutiliza conexiones dentro del loop y el semáforo limita las
+    llamadas simultáneas al LLM a LLM_MAX_CONCURRENCY.
+    """
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None:
+        resources = (
+            AsyncOpenAI(api_key=OPEN_API_KEY, timeout=LLM_TIMEOUT, max_retries=2),
+            asyncio.Semaphore(LLM_MAX_CONCURRENCY),
+        )
+        _loop_resources[loop] = resources
+    return resources
 
 def build_prompt(user_message: str) -> str:
     return f"""
@@ -45,13 +71,25 @@ Usuario: {user_message}
 """
 
 async def interpret_with_gpt(user_message: str):
+    """
+    Pide al LLM que interprete el mensaje sin bloquear el event loop.
+
+    Espera turno en el semáforo del loop y limita la llamada completa (reintentos
+    incluidos) a LLM_TIMEOUT segundos; lanza TimeoutError si se supera.
+    Si la tarea se cancela, la petición HTTP en curso se cancela con ella.
+    """
     prompt = build_prompt(user_message)
 
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0
-    )
+    client, semaphore = llm_resources()
+    async with semaphore:
+        response = await asyncio.wait_for(
+            client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0
+            ),
+            timeout=LLM_TIMEOUT,
+        )
 
     raw = response.choices[0].message.content
 
@@ -59,4 +97,90 @@ async def interpret_with_gpt(user_message: str):
         return json.loads(raw)
     except Exception:
         return {"response": raw}
- 
+
+async def stream_gpt(user_message: str):
+    """
+    Igual que interpret_with_gpt, pero devuelve el texto del LLM en fragmentos
+    a medida que llega (generador asíncrono).
+
+    LLM_TIMEOUT limita la espera hasta que empieza la respuesta y el tiempo
+    entre fragmentos.
+    """
+    prompt = build_prompt(user_message)
+
+    client, semaphore = llm_resources()
+    async with semaphore:
+        stream = await asyncio.wait_for(
+            client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                stream=True
+            ),
+            timeout=LLM_TIMEOUT,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+RESPONSE_PREFIX = re.compile(r'"response"\s*:\s*"')
+
+class StreamingReply:
+    """
+    Extrae, mientras llega, el texto que debe ver el usuario.
+
+    El LLM responde con JSON ({"response": "..."} o {"tool": ...}) o con
+    texto libre. feed() devuelve solo el texto nuevo del campo "response"
+    (o del texto libre); una llamada a herramienta no produce texto.
+    """
+
+    def __init__(self):
+        self.raw = ""
+        self.streamed = ""
+
+    def feed(self, delta: str) -> str:
+        self.raw += delta
+        text = self.raw.lstrip()
+        if not text:
+            return ""
+        if text.startswith("{"):
+            visible = self._response_so_far(text)
+        else:
+            visible = text
+        if visible is None or len(visible) <= len(self.streamed):
+            return ""
+        new = visible[len(self.streamed):]
+        self.streamed = visible
+        return new
+
+    def result(self):
+        """Respuesta completa, con el mismo formato que interpret_with_gpt."""
+        try:
+            return json.loads(self.raw)
+        except Exception:
+            return {"response": self.raw}
+
+    @staticmethod
+    def _response_so_far(text: str):
+        match = RESPONSE_PREFIX.search(text)
+        if match is None:
+            return None
+        body = text[match.end():]
+        # Cortar en la comilla de cierre (la que no va escapada)
+        escaped = False
+        for index, char in enumerate(body):
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                body = body[:index]
+                break
+        # Puede quedar una secuencia de escape a medias (p. ej. "\u00"): se
+        # recorta hasta que el fragmento sea una cadena JSON válida
+        for cut in range(0, 7):
+            try:
+                return json.loads('"' + body[:len(body) - cut] + '"')
+            except ValueError:
+                continue
+        return None
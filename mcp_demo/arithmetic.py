@@ -0,0 +1,173 @@
+"""
+Vectorized arithmetic for the MCP demo server.
+
+Applies the demo server's four operations to whole columns of operands in
+one NumPy pass, so bulk numeric work needs a single tool call instead of
+one JSON-RPC round-trip per operation. Results match the scalar tools
+exactly: values that could overflow int64 (or lose precision in float64
+division) are computed with Python integers instead, and division by zero
+yields 0 like the scalar ``divide`` tool.
+
+Dependencies:
+- numpy: vectorized evaluation
+"""
+
+from __future__ import annotations
+
+import logging
+import operator
+from collections.abc import Callable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+# Results at or beyond this magnitude may not fit in int64
+INT64_SAFE_LIMIT = float(2**62)
+# Integers beyond this magnitude are not exactly representable in float64
+FLOAT64_EXACT_LIMIT = 2**53
+
+
+def _python_divide(a: int, b: int) -> float:
+    """Scalar division with the demo server's divide-by-zero semantics."""
+    if b == 0:
+        return 0
+    return a / b
+
+
+_PYTHON_OPERATIONS: dict[str, Callable[[int, int], int | float]] = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": _python_divide,
+}
+
+_NUMPY_OPERATIONS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+}
+
+
+def _validate(op: str, a: Sequence[int], b: Sequence[int]) -> None:
+    if op not in OPERATIONS:
+        raise ValueError(f"Unknown operation {op!r}; expected one of {OPERATIONS}")
+    if len(a) != len(b):
+        raise ValueError(
+            f"Operand columns must have the same length (got {len(a)} and {len(b)})"
+        )
+
+
+def _to_int64(values: Sequence[int]) -> np.ndarray | None:
+    """Convert to an int64 array, or None if any value does not fit."""
+    try:
+        return np.asarray(values, dtype=np.int64)
+    except OverflowError:
+        return None
+
+
+def _apply_python(op: str, a: Sequence[int], b: Sequence[int]) -> list[int | float]:
+    function = _PYTHON_OPERATIONS[op]
+    return [function(x, y) for x, y in zip(a, b)]
+
+
+def _apply_numpy(op: str, a: np.ndarray, b: np.ndarray) -> list[int | float] | None:
+    """Evaluate with NumPy, or return None when the result would be inexact."""
+    if op == "divide":
+        # Compare as int64: a float64 copy would round 2**53 + 1 into range
+        operands = np.concatenate([a, b])
+        if np.any((operands > FLOAT64_EXACT_LIMIT) | (operands < -FLOAT64_EXACT_LIMIT)):
+            return None
+        zero = b == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            quotient = np.true_divide(a, np.where(zero, 1, b))
+        return np.where(zero, 0.0, quotient).tolist()
+
+    # Estimate the magnitude in float64 first so int64 never silently wraps
+    estimate = _NUMPY_OPERATIONS[op](a.astype(np.float64), b.astype(np.float64))
+    if np.any(np.abs(estimate) >= INT64_SAFE_LIMIT):
+        return None
+    return _NUMPY_OPERATIONS[op](a, b).tolist()
+
+
+def batch_apply(op: str, a: Sequence[int], b: Sequence[int]) -> list[int | float]:
+    """
+    Apply one operation element-wise to two operand columns.
+
+    Args:
+        op: One of "add", "subtract", "multiply", "divide"
+        a: Left operands
+        b: Right operands, same length as ``a``
+
+    Returns:
+        One result per operand pair, identical to calling the scalar tool
+
+    Raises:
+        ValueError: If the operation is unknown or the columns differ in length
+    """
+    _validate(op, a, b)
+    if not a:
+        return []
+
+    a_array = _to_int64(a)
+    b_array = _to_int64(b)
+    results = None
+    if a_array is not None and b_array is not None:
+        results = _apply_numpy(op, a_array, b_array)
+    if results is None:
+        logger.debug(f"Falling back to Python integers for batch {op}")
+        results = _apply_python(op, a, b)
+
+    if op == "divide":
+        zero_divisions = sum(1 for value in b if value == 0)
+        if zero_divisions:
+            logger.warning(
+                f"Division by zero in {zero_divisions} batch elements, returning 0"
+            )
+    return results
+
+
+def batch_calculate(
+    ops: Sequence[str], a: Sequence[int], b: Sequence[int]
+) -> list[int | float]:
+    """
+    Apply a column of operations to two operand columns.
+
+    Rows are grouped by operation so each group is evaluated in one
+    vectorized pass, then results are returned in the original row order.
+
+    Args:
+        ops: Operation for each row
+        a: Left operand for each row
+        b: Right operand for each row
+
+    Returns:
+        One result per row
+
+    Raises:
+        ValueError: If an operation is unknown or the columns differ in length
+    """
+    if not len(ops) == len(a) == len(b):
+        raise ValueError(
+            "ops, a and b must have the same length "
+            f"(got {len(ops)}, {len(a)} and {len(b)})"
+        )
+
+    rows_by_op: dict[str, list[int]] = {}
+    for row, op in enumerate(ops):
+        if op not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation {op!r} at row {row}; expected one of {OPERATIONS}"
+            )
+        rows_by_op.setdefault(op, []).append(row)
+
+    results: list[int | float] = [0] * len(ops)
+    for op, rows in rows_by_op.items():
+        group_results = batch_apply(
+            op, [a[row] for row in rows], [b[row] for row in rows]
+        )
+        for row, value in zip(rows, group_results):
+            results[row] = value
+    return results
@@ -7,6 +7,11 @@ of the Model Context Protocol using FastMCP. Includes examples of:
 - Listing available tools and resources
 - Calling mathematical tools
 - Accessing dynamic resources
+- Asking an LLM which tools to call, optionally for many prompts at once
+
+For running many calls against the server, ``create_session_pool`` returns
+a pool of warm, initialized sessions (see session_pool.py) so each call
+skips the process spawn and handshake.
 
 Dependencies:
 - mcp: MCP client library for Python
@@ -21,13 +26,20 @@ import asyncio
 import json
 import logging
 import os
+from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import httpx
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
+from mcp_demo.llm_cache import LLMSelectionCache, make_llm_cache_key
+from mcp_demo.session_pool import SessionPool
+from mcp_demo.tool_catalog import ToolCatalog, to_openai_tool
+from mcp_demo.tool_dispatch import dispatch_tool_calls
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -40,6 +52,31 @@ SERVER_PARAMS = StdioServerParameters(
     env=None,
 )
 
+# Number of server processes kept warm by create_session_pool()
+SESSION_POOL_SIZE = int(os.getenv("MCP_SESSION_POOL_SIZE", "4"))
+
+# LLM configuration
+LLM_ENDPOINT = "https://models.github.ai/inference"
+LLM_MODEL = "o3-mini"
+LLM_SYSTEM_PROMPT = (
+    "You are a helpful assistant. Use the available tools when needed to solve "
+    "problems accurately."
+)
+# Concurrent prompts allowed by call_llm_many(); the HTTP pool is sized to match
+LLM_MAX_CONCURRENCY = int(os.getenv("MCP_LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT = float(os.getenv("MCP_LLM_TIMEOUT", "60"))
+
+# On-disk cache of tool selections, keyed by model, prompts and tool schemas
+LLM_CACHE_ENABLED = os.getenv("MCP_LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_PATH = Path(os.getenv("MCP_LLM_CACHE_PATH", ".cache/llm_selections.sqlite3"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("MCP_LLM_CACHE_MAX_ENTRIES", "1000"))
+
+# Execution of LLM-suggested tool calls
+TOOL_MAX_CONCURRENCY = int(os.getenv("MCP_TOOL_MAX_CONCURRENCY", "8"))
+TOOL_TIMEOUT = float(os.getenv("MCP_TOOL_TIMEOUT", "30"))
+
+_async_llm_client: AsyncOpenAI | None = None
+
 def load_env_file(env_file_path: str = ".env") -> None:
     """
     Load environment variables from .env file if it exists.
@@ -67,10 +104,14 @@ def load_env_file(env_file_path: str = ".env") -> None:
         logger.debug(f"No .env file found at {env_path}")
 
 
+@lru_cache(maxsize=1)
 def get_openai_token() -> str:
     """
     Get OpenAI token from environment variables.
     
+    The lookup (including reading .env) happens once; later calls return the
+    cached token. A missing token is not cached, so it is looked up again.
+    
     Returns:
         The OpenAI token string
         
@@ -99,6 +140,25 @@ def get_openai_token() -> str:
     return token
 
 
+def create_session_pool(size: int = SESSION_POOL_SIZE) -> SessionPool:
+    """
+    Create a pool of initialized sessions to the demo server.
+    
+    Args:
+        size: Number of server processes to keep warm
+        
+    Returns:
+        An unstarted SessionPool; use it with ``async with``
+        
+    Example:
+        async with create_session_pool() as pool:
+            results = await asyncio.gather(
+                *(pool.call_tool("add", {"a": i, "b": 1}) for i in range(1000))
+            )
+    """
+    return SessionPool(SERVER_PARAMS, size=size)
+
+
 def convert_to_llm_tool(tool: Any) -> dict[str, Any]:
     """
     Convert MCP tool to LLM-compatible tool schema.
@@ -108,28 +168,143 @@ def convert_to_llm_tool(tool: Any) -> dict[str, Any]:
         
     Returns:
         Dictionary containing the tool schema in OpenAI format
+        
+    Note:
+        ToolCatalog caches these conversions per session; prefer it when
+        the same tools are offered to the LLM repeatedly.
     """
-    return {
-        "type": "function",
-        "function": {
-            "name": tool.name,
-            "description": tool.description,
-            "parameters": {
-                "type": "object",
-                "properties": tool.inputSchema["properties"],
-                "required": tool.inputSchema.get("required", []),
-            },
-        },
-    }
-
-
-def call_llm(prompt: str, functions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return to_openai_tool(tool)
+
+
+def build_llm_messages(prompt: str) -> list[dict[str, str]]:
+    """Build the chat messages sent to the LLM for ``prompt``."""
+    return [
+        {"role": "system", "content": LLM_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def parse_tool_calls(response_message: Any) -> list[dict[str, Any]]:
+    """
+    Extract the tool calls suggested in an LLM response message.
+    
+    Args:
+        response_message: ``choices[0].message`` of a chat completion
+        
+    Returns:
+        List of functions to call, each with ``name`` and ``args``
+        
+    Raises:
+        ValueError: If a tool call has invalid JSON arguments
+    """
+    if response_message.content:
+        logger.info(f"LLM response: {response_message.content}")
+    
+    functions_to_call = []
+    
+    if response_message.tool_calls:
+        logger.info(f"LLM suggested {len(response_message.tool_calls)} tool calls")
+        for tool_call in response_message.tool_calls:
+            logger.debug(
+                f"Tool call: {tool_call.function.name} "
+                f"with args: {tool_call.function.arguments}"
+            )
+            
+            try:
+                name = tool_call.function.name
+                args = json.loads(tool_call.function.arguments)
+                functions_to_call.append({"name": name, "args": args})
+            except json.JSONDecodeError as e:
+                logger.error(
+                    f"Failed to parse tool arguments: {tool_call.function.arguments}"
+                )
+                raise ValueError(f"Invalid JSON in tool arguments: {e}") from e
+    else:
+        logger.debug("No tool calls suggested by LLM")
+    
+    return functions_to_call
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> LLMSelectionCache | None:
+    """Return the shared tool-selection cache, or None if it is disabled."""
+    if not LLM_CACHE_ENABLED:
+        return None
+    return LLMSelectionCache(LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES)
+
+
+def _cache_lookup(
+    prompt: str, functions: list[dict[str, Any]], use_cache: bool
+) -> tuple[str | None, list[dict[str, Any]] | None]:
+    """Return the cache key (None when not caching) and any cached result."""
+    cache = get_llm_cache()
+    if cache is None:
+        return None, None
+    if not use_cache:
+        cache.record_bypass()
+        return None, None
+    key = make_llm_cache_key(LLM_MODEL, LLM_SYSTEM_PROMPT, prompt, functions)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"Using cached tool selection for prompt: {prompt}")
+    return key, cached
+
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> OpenAI:
+    """Return the shared synchronous LLM client, creating it on first use."""
+    return OpenAI(base_url=LLM_ENDPOINT, api_key=get_openai_token())
+
+
+def get_async_llm_client() -> AsyncOpenAI:
+    """
+    Return the shared async LLM client, creating it on first use.
+    
+    The client keeps a connection pool sized for ``LLM_MAX_CONCURRENCY`` so
+    concurrent prompts reuse HTTP connections instead of opening new ones.
+    Call ``close_async_llm_client()`` before the event loop shuts down.
+    """
+    global _async_llm_client
+    if _async_llm_client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONCURRENCY,
+                max_keepalive_connections=LLM_MAX_CONCURRENCY,
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(LLM_TIMEOUT, connect=10.0),
+        )
+        _async_llm_client = AsyncOpenAI(
+            base_url=LLM_ENDPOINT,
+            api_key=get_openai_token(),
+            http_client=http_client,
+        )
+    return _async_llm_client
+
+
+async def close_async_llm_client() -> None:
+    """Close the shared async LLM client and its connections, if created."""
+    global _async_llm_client
+    if _async_llm_client is not None:
+        await _async_llm_client.close()
+        _async_llm_client = None
+
+
+def call_llm(
+    prompt: str, functions: list[dict[str, Any]], use_cache: bool = True
+) -> list[dict[str, Any]]:
     """
     Call LLM with prompt and available functions.
     
+    Blocking version; use ``call_llm_async`` from async code. Results are
+    served from the on-disk selection cache when the same model, prompts
+    and tool schemas were seen before.
+    
     Args:
         prompt: User prompt to send to the LLM
         functions: List of available function schemas in OpenAI tool format
+        use_cache: Set to False to always ask the LLM (the fresh result is
+            not stored either)
         
     Returns:
         List of functions to call with their arguments, each containing:
@@ -140,59 +315,68 @@ def call_llm(prompt: str, functions: list[dict[str, Any]]) -> list[dict[str, Any
         ValueError: If token is not available
         Exception: If LLM call fails or response parsing errors occur
     """
-    token = get_openai_token()
-    endpoint = "https://models.github.ai/inference"
-    model_name = "o3-mini"
-    
-    client = OpenAI(
-        base_url=endpoint,
-        api_key=token,
-    )
+    key, cached = _cache_lookup(prompt, functions, use_cache)
+    if cached is not None:
+        return cached
+
+    client = get_llm_client()
 
     logger.info(f"Calling LLM with prompt: {prompt}")
     logger.debug(f"Available functions: {[f['function']['name'] for f in functions]}")
     
-    messages = [
-        {
-            "role": "system",
-            "content": "You are a helpful assistant. Use the available tools when needed to solve problems accurately.",
-        },
-        {
-            "role": "user",
-            "content": prompt,
-        },
-    ]
-    
     try:
         response = client.chat.completions.create(
-            messages=messages,
-            model=model_name,
+            messages=build_llm_messages(prompt),
+            model=LLM_MODEL,
             tools=functions if functions else None,
             # Removed temperature parameter - not supported by o3-mini
         )
+        functions_to_call = parse_tool_calls(response.choices[0].message)
+        if key is not None:
+            get_llm_cache().set(key, functions_to_call)
+        return functions_to_call
         
-        response_message = response.choices[0].message
-        
-        if response_message.content:
-            logger.info(f"LLM response: {response_message.content}")
-        
-        functions_to_call = []
+    except Exception as e:
+        logger.error(f"Error calling LLM: {e}")
+        raise
+
+
+async def call_llm_async(
+    prompt: str, functions: list[dict[str, Any]], use_cache: bool = True
+) -> list[dict[str, Any]]:
+    """
+    Call LLM with prompt and available functions without blocking the event loop.
+    
+    Args:
+        prompt: User prompt to send to the LLM
+        functions: List of available function schemas in OpenAI tool format
+        use_cache: Set to False to bypass the selection cache
         
-        if response_message.tool_calls:
-            logger.info(f"LLM suggested {len(response_message.tool_calls)} tool calls")
-            for tool_call in response_message.tool_calls:
-                logger.debug(f"Tool call: {tool_call.function.name} with args: {tool_call.function.arguments}")
-                
-                try:
-                    name = tool_call.function.name
-                    args = json.loads(tool_call.function.arguments)
-                    functions_to_call.append({"name": name, "args": args})
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse tool arguments: {tool_call.function.arguments}")
-                    raise ValueError(f"Invalid JSON in tool arguments: {e}") from e
-        else:
-            logger.debug("No tool calls suggested by LLM")
+    Returns:
+        List of functions to call with their arguments (same format as call_llm)
         
+    Raises:
+        ValueError: If token is not available
+        Exception: If LLM call fails or response parsing errors occur
+    """
+    key, cached = await asyncio.to_thread(_cache_lookup, prompt, functions, use_cache)
+    if cached is not None:
+        return cached
+
+    client = get_async_llm_client()
+
+    logger.info(f"Calling LLM with prompt: {prompt}")
+    logger.debug(f"Available functions: {[f['function']['name'] for f in functions]}")
+    
+    try:
+        response = await client.chat.completions.create(
+            messages=build_llm_messages(prompt),
+            model=LLM_MODEL,
+            tools=functions if functions else None,
+        )
+        functions_to_call = parse_tool_calls(response.choices[0].message)
+        if key is not None:
+            await asyncio.to_thread(get_llm_cache().set, key, functions_to_call)
         return functions_to_call
         
     except Exception as e:
@@ -200,6 +384,36 @@ def call_llm(prompt: str, functions: list[dict[str, Any]]) -> list[dict[str, Any
         raise
 
 
+async def call_llm_many(
+    prompts: Sequence[str],
+    functions: list[dict[str, Any]],
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+    use_cache: bool = True,
+) -> list[list[dict[str, Any]] | Exception]:
+    """
+    Run many prompts through the LLM concurrently.
+    
+    Args:
+        prompts: User prompts to send
+        functions: List of available function schemas in OpenAI tool format
+        max_concurrency: Maximum number of requests in flight at once
+        use_cache: Set to False to bypass the selection cache
+        
+    Returns:
+        One entry per prompt, in order: the functions to call, or the
+        exception raised for that prompt
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(prompt: str) -> list[dict[str, Any]]:
+        async with semaphore:
+            return await call_llm_async(prompt, functions, use_cache=use_cache)
+
+    return await asyncio.gather(
+        *(run_one(prompt) for prompt in prompts), return_exceptions=True
+    )
+
+
 async def run_client() -> None:
     """
     Connect to MCP server and demonstrate its capabilities.
@@ -214,11 +428,15 @@ async def run_client() -> None:
     Raises:
         Exception: If connection to server fails or operations error
     """
+    catalog = ToolCatalog()
     try:
         async with stdio_client(SERVER_PARAMS) as (read, write):
-            async with ClientSession(read, write) as session:
+            async with ClientSession(
+                read, write, message_handler=catalog.handle_message
+            ) as session:
                 # Initialize MCP session
                 await session.initialize()
+                catalog.bind(session)
                 logger.info("MCP client connected to server")
 
                 print("MCP Client connected to server!")
@@ -226,8 +444,7 @@ async def run_client() -> None:
 
                 # List available tools on the server
                 print("\nAvailable tools:")
-                tools = await session.list_tools()
-                for tool in tools.tools:
+                for tool in await catalog.tools():
                     print(f"  - {tool.name}: {tool.description}")
 
                 # List available resources on the server
@@ -280,21 +497,26 @@ async def run_client() -> None:
                 try:
                     token = get_openai_token()
                     print("\nDemonstrating LLM integration:")
-                    functions = []
-                    
-                    for tool in tools.tools:
-                        logger.debug(f"Converting tool: {tool.name}")
-                        functions.append(convert_to_llm_tool(tool))
-
                     prompt = "Add 2 to 25"
 
-                    # Ask LLM what tools to call, if any
-                    functions_to_call = call_llm(prompt, functions)
+                    # Offer only the cached schemas relevant to the prompt
+                    functions = await catalog.select(prompt)
 
-                    # Call suggested functions
-                    for f in functions_to_call:
-                        result = await session.call_tool(f["name"], arguments=f["args"])
-                        print(f"Tool result: {result.content[0].text}")
+                    # Ask LLM what tools to call, if any
+                    functions_to_call = await call_llm_async(prompt, functions)
+
+                    # Call suggested functions concurrently, results in order
+                    outcomes = await dispatch_tool_calls(
+                        session,
+                        functions_to_call,
+                        max_concurrency=TOOL_MAX_CONCURRENCY,
+                        timeout=TOOL_TIMEOUT,
+                    )
+                    for outcome in outcomes:
+                        if outcome.ok:
+                            print(f"Tool result: {outcome.text}")
+                        else:
+                            print(f"Tool {outcome.name} failed: {outcome.text}")
                         
                     if not functions_to_call:
                         print("LLM didn't suggest any tool calls for this prompt")
@@ -314,6 +536,8 @@ async def run_client() -> None:
     except Exception as e:
         logger.error(f"Error in MCP client session: {e}")
         raise
+    finally:
+        await close_async_llm_client()
 
 
 def main() -> None:
@@ -0,0 +1,221 @@
+"""
+Safe arithmetic expression evaluation for the MCP demo server.
+
+Lets a client compute something like ``(a + b) * c / d`` in one tool call
+instead of chaining add/multiply/divide calls. Expressions are parsed with
+``ast`` and only the demo server's four operations, unary signs, numeric
+literals, named variables and a few math functions are accepted; anything
+else is rejected before evaluation. Nothing is passed to ``eval``.
+
+Each expression is compiled once into a tree of NumPy closures and kept in
+an LRU cache keyed by its source text, so evaluating the same expression
+again skips parsing and validation. A list of variable bindings is
+evaluated in a single vectorized pass.
+
+Dependencies:
+- numpy: vectorized evaluation
+"""
+
+from __future__ import annotations
+
+import ast
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+EXPRESSION_CACHE_SIZE = 256
+MAX_EXPRESSION_LENGTH = 1000
+# Nesting through parentheses, function calls and unary signs. Flat chains
+# such as ``a + b + c`` nest on the left operand and do not count; their
+# length is already bounded by MAX_EXPRESSION_LENGTH.
+MAX_EXPRESSION_DEPTH = 50
+
+Evaluator = Callable[[Mapping[str, np.ndarray]], np.ndarray]
+
+
+def _safe_divide(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise division returning 0 where the divisor is zero, like ``divide``."""
+    zero = b == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quotient = np.true_divide(a, np.where(zero, 1, b))
+    return np.where(zero, 0.0, quotient)
+
+
+def _minimum(*args: np.ndarray) -> np.ndarray:
+    return np.minimum.reduce(np.broadcast_arrays(*args))
+
+
+def _maximum(*args: np.ndarray) -> np.ndarray:
+    return np.maximum.reduce(np.broadcast_arrays(*args))
+
+
+_BINARY_OPERATORS: dict[type, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: _safe_divide,
+}
+
+_UNARY_OPERATORS: dict[type, Callable[[np.ndarray], np.ndarray]] = {
+    ast.UAdd: np.positive,
+    ast.USub: np.negative,
+}
+
+# name: (function, minimum arguments, maximum arguments or None for variadic)
+_FUNCTIONS: dict[str, tuple[Callable[..., np.ndarray], int, int | None]] = {
+    "abs": (np.abs, 1, 1),
+    "sqrt": (np.sqrt, 1, 1),
+    "floor": (np.floor, 1, 1),
+    "ceil": (np.ceil, 1, 1),
+    "round": (np.round, 1, 1),
+    "min": (_minimum, 2, None),
+    "max": (_maximum, 2, None),
+}
+
+ALLOWED_FUNCTIONS = tuple(sorted(_FUNCTIONS))
+
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """A validated expression ready for repeated, vectorized evaluation."""
+
+    source: str
+    variables: tuple[str, ...]
+    evaluator: Evaluator
+
+    def evaluate(self, bindings: Sequence[Mapping[str, float]]) -> list[float | None]:
+        """
+        Evaluate the expression once per set of variable bindings.
+
+        Args:
+            bindings: One mapping of variable name to value per evaluation
+
+        Returns:
+            One result per binding; None where the result is not a finite
+            number (for example the square root of a negative value)
+
+        Raises:
+            ValueError: If a binding is missing a variable or a value does not
+                fit in a float
+        """
+        if not bindings:
+            return []
+        columns: dict[str, np.ndarray] = {}
+        for name in self.variables:
+            missing = [
+                row for row, binding in enumerate(bindings) if name not in binding
+            ]
+            if missing:
+                raise ValueError(
+                    f"Variable {name!r} is missing from bindings {missing}"
+                )
+            try:
+                columns[name] = np.asarray(
+                    [binding[name] for binding in bindings], dtype=np.float64
+                )
+            except OverflowError as e:
+                raise ValueError(
+                    f"Variable {name!r} has a value that is too large"
+                ) from e
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            result = self.evaluator(columns)
+        result = np.broadcast_to(np.asarray(result, dtype=np.float64), (len(bindings),))
+        return [value if np.isfinite(value) else None for value in result.tolist()]
+
+
+class _Compiler:
+    """Turns a validated AST into nested NumPy closures."""
+
+    def __init__(self) -> None:
+        self.variables: set[str] = set()
+
+    def compile(self, node: ast.AST, depth: int = 0) -> Evaluator:
+        if depth > MAX_EXPRESSION_DEPTH:
+            raise ValueError("Expression is nested too deeply")
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(f"Unsupported literal {node.value!r}")
+            try:
+                constant = np.float64(node.value)
+            except OverflowError as e:
+                raise ValueError("Numeric literal is too large") from e
+            return lambda columns: constant
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            self.variables.add(name)
+            return lambda columns: columns[name]
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            operation = _BINARY_OPERATORS[type(node.op)]
+            left = self.compile(node.left, depth)
+            right = self.compile(node.right, depth + 1)
+            return lambda columns: operation(left(columns), right(columns))
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+            operation = _UNARY_OPERATORS[type(node.op)]
+            operand = self.compile(node.operand, depth + 1)
+            return lambda columns: operation(operand(columns))
+
+        if isinstance(node, ast.Call):
+            return self._compile_call(node, depth)
+
+        unsupported = type(getattr(node, "op", node)).__name__
+        raise ValueError(f"Unsupported syntax: {unsupported}")
+
+    def _compile_call(self, node: ast.Call, depth: int) -> Evaluator:
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+            raise ValueError(
+                f"Unsupported function; allowed functions are {ALLOWED_FUNCTIONS}"
+            )
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        name = node.func.id
+        function, min_args, max_args = _FUNCTIONS[name]
+        if len(node.args) < min_args or (
+            max_args is not None and len(node.args) > max_args
+        ):
+            raise ValueError(f"Wrong number of arguments for {name}()")
+        arguments = [self.compile(argument, depth + 1) for argument in node.args]
+        return lambda columns: function(*(argument(columns) for argument in arguments))
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Parse, validate and compile an arithmetic expression.
+
+    Results are cached by source text; ``compile_expression.cache_info()``
+    reports hits and misses.
+
+    Args:
+        source: Expression such as ``"(a + b) * c / d"`` or ``"sqrt(x) + 1"``
+
+    Returns:
+        The compiled expression
+
+    Raises:
+        ValueError: If the expression is too long, not valid Python syntax,
+            or uses anything besides + - * /, numbers, variables and the
+            allowed functions
+    """
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(
+            f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters"
+        )
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}") from e
+
+    compiler = _Compiler()
+    evaluator = compiler.compile(tree.body)
+    return CompiledExpression(
+        source=source,
+        variables=tuple(sorted(compiler.variables)),
+        evaluator=evaluator,
+    )
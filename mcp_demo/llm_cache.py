@@ -0,0 +1,147 @@
+"""
+Persistent cache for LLM tool-selection results.
+
+The tool calls suggested by ``call_llm`` depend only on the model, the
+system prompt, the user prompt and the tool schemas offered. Regression
+runs and batch jobs replay the same prompts constantly, so each result is
+stored in SQLite under a SHA-256 hash of exactly those inputs. A replayed
+prompt then skips the LLM round-trip entirely, while any change to the
+prompt, model or schemas produces a different key.
+
+The file holds at most ``max_entries`` results; the least recently used
+ones are evicted first.
+
+Usage:
+    cache = LLMSelectionCache(Path(".cache/llm_selections.sqlite3"))
+    key = make_llm_cache_key(model, system_prompt, prompt, functions)
+    functions_to_call = cache.get(key)
+    if functions_to_call is None:
+        functions_to_call = ...  # call the LLM
+        cache.set(key, functions_to_call)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def make_llm_cache_key(
+    model: str, system_prompt: str, prompt: str, functions: list[dict[str, Any]]
+) -> str:
+    """Hash everything that determines the LLM's tool selection."""
+    payload = json.dumps(
+        {"model": model, "system": system_prompt, "prompt": prompt, "tools": functions},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class LLMCacheStats:
+    """Counters for the tool-selection cache."""
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+class LLMSelectionCache:
+    """SQLite-backed LRU of tool-selection results, safe to use from threads."""
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        Args:
+            db_path: SQLite file; created with its parent directory on first use
+            max_entries: Maximum number of results kept
+        """
+        self.db_path = db_path
+        self.max_entries = max(1, max_entries)
+        self.stats = LLMCacheStats()
+        self._db: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list[dict[str, Any]] | None:
+        """Return the cached tool calls for ``key``, or None on a miss."""
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT functions FROM selections WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            db.execute(
+                "UPDATE selections SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            db.commit()
+            self.stats.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, functions_to_call: list[dict[str, Any]]) -> None:
+        """Store a result and evict the least recently used beyond the cap."""
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO selections (key, functions, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, json.dumps(functions_to_call), time.time()),
+            )
+            evicted = db.execute(
+                "DELETE FROM selections WHERE key IN ("
+                "SELECT key FROM selections ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            db.commit()
+            self.stats.stores += 1
+            self.stats.evictions += max(evicted, 0)
+
+    def record_bypass(self) -> None:
+        self.stats.bypasses += 1
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            db = self._connect()
+            db.execute("DELETE FROM selections")
+            db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            entries = (
+                self._connect().execute("SELECT COUNT(*) FROM selections").fetchone()[0]
+            )
+        return {"path": str(self.db_path), "entries": entries, **asdict(self.stats)}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS selections ("
+                "key TEXT PRIMARY KEY, functions TEXT NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+            self._db.commit()
+            logger.debug(f"Opened LLM selection cache at {self.db_path}")
+        return self._db
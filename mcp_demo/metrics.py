@@ -0,0 +1,290 @@
+"""
+Per-tool and per-resource metrics for FastMCP servers.
+
+``instrument(mcp)`` wraps the server's ``tools/call`` and
+``resources/read`` request handlers, so every registered tool and resource
+is covered, including ones registered later. For each handler it records:
+
+- call and error counts (a tool result with ``isError`` counts as an error)
+- an in-flight gauge
+- a latency histogram with fixed buckets (one bisect per call)
+
+The data is exposed as the ``metrics://server`` resource (JSON, hottest
+handlers first) and, when the server runs over HTTP, as Prometheus text
+at ``/metrics``. Metrics are per process; with several HTTP workers each
+worker reports its own.
+
+Resources are labelled by URI scheme (``greeting://``) rather than full
+URI, so templated resources do not create one series per argument.
+
+Works with both the MCP SDK's FastMCP and the standalone fastmcp package.
+
+Usage:
+    mcp = FastMCP("Demo")
+    metrics = instrument(mcp)
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from mcp import types
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+METRICS_RESOURCE_URI = "metrics://server"
+METRICS_HTTP_PATH = "/metrics"
+
+
+@dataclass
+class HandlerMetrics:
+    """Counters and latency histogram for one tool or resource."""
+
+    kind: str
+    name: str
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    # One count per bucket in LATENCY_BUCKETS plus a final +Inf bucket
+    bucket_counts: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+
+    def observe(self, seconds: float, error: bool) -> None:
+        self.calls += 1
+        self.errors += error
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def percentile(self, fraction: float) -> float | None:
+        """Upper bound of the bucket holding the given fraction of calls."""
+        if not self.calls:
+            return None
+        rank = fraction * self.calls
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max_seconds)
+        return self.max_seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        def ms(seconds: float | None) -> float | None:
+            return round(seconds * 1000, 3) if seconds is not None else None
+
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "total_ms": ms(self.total_seconds),
+            "mean_ms": ms(self.total_seconds / self.calls) if self.calls else None,
+            "p50_ms": ms(self.percentile(0.50)),
+            "p95_ms": ms(self.percentile(0.95)),
+            "p99_ms": ms(self.percentile(0.99)),
+            "max_ms": ms(self.max_seconds),
+        }
+
+
+class ServerMetrics:
+    """Registry of HandlerMetrics for one server process."""
+
+    def __init__(self, server_name: str) -> None:
+        self.server_name = server_name
+        self.started_at = time.time()
+        self._handlers: dict[tuple[str, str], HandlerMetrics] = {}
+
+    def handler(self, kind: str, name: str) -> HandlerMetrics:
+        key = (kind, name)
+        metrics = self._handlers.get(key)
+        if metrics is None:
+            metrics = self._handlers[key] = HandlerMetrics(kind=kind, name=name)
+        return metrics
+
+    async def timed(
+        self, kind: str, name: str, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Await ``call`` while recording it under ``kind``/``name``."""
+        metrics = self.handler(kind, name)
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        error = True
+        try:
+            result = await call()
+            error = bool(getattr(getattr(result, "root", result), "isError", False))
+            return result
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(time.perf_counter() - started, error)
+
+    def snapshot(self) -> dict[str, Any]:
+        """All handlers as JSON-ready dicts, most total time first."""
+        handlers = sorted(
+            self._handlers.values(),
+            key=lambda metrics: metrics.total_seconds,
+            reverse=True,
+        )
+        return {
+            "server": self.server_name,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "buckets_ms": [bound * 1000 for bound in LATENCY_BUCKETS],
+            "handlers": [metrics.snapshot() for metrics in handlers],
+        }
+
+    def prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP mcp_requests_total MCP tool calls and resource reads.",
+            "# TYPE mcp_requests_total counter",
+        ]
+        handlers = list(self._handlers.values())
+        for metrics in handlers:
+            lines.append(
+                f"mcp_requests_total{{{self._labels(metrics)}}} {metrics.calls}"
+            )
+        lines += [
+            "# HELP mcp_request_errors_total "
+            "MCP tool calls and resource reads that failed.",
+            "# TYPE mcp_request_errors_total counter",
+        ]
+        for metrics in handlers:
+            lines.append(
+                f"mcp_request_errors_total{{{self._labels(metrics)}}} {metrics.errors}"
+            )
+        lines += [
+            "# HELP mcp_requests_in_flight MCP requests currently being handled.",
+            "# TYPE mcp_requests_in_flight gauge",
+        ]
+        for metrics in handlers:
+            lines.append(
+                f"mcp_requests_in_flight{{{self._labels(metrics)}}} {metrics.in_flight}"
+            )
+        lines += [
+            "# HELP mcp_request_duration_seconds MCP request latency.",
+            "# TYPE mcp_request_duration_seconds histogram",
+        ]
+        for metrics in handlers:
+            labels = self._labels(metrics)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, metrics.bucket_counts):
+                cumulative += count
+                lines.append(
+                    f"mcp_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f"mcp_request_duration_seconds_bucket"
+                f'{{{labels},le="+Inf"}} {metrics.calls}'
+            )
+            lines.append(
+                f"mcp_request_duration_seconds_sum{{{labels}}} {metrics.total_seconds}"
+            )
+            lines.append(
+                f"mcp_request_duration_seconds_count{{{labels}}} {metrics.calls}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def _labels(self, metrics: HandlerMetrics) -> str:
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        return (
+            f'server="{escape(self.server_name)}",kind="{metrics.kind}",'
+            f'name="{escape(metrics.name)}"'
+        )
+
+
+def _resource_label(uri: Any) -> str:
+    scheme, separator, _ = str(uri).partition("://")
+    return f"{scheme}://" if separator else str(uri)
+
+
+def instrument(
+    server: Any,
+    resource_uri: str | None = METRICS_RESOURCE_URI,
+    http_path: str | None = METRICS_HTTP_PATH,
+) -> ServerMetrics:
+    """
+    Record metrics for every tool call and resource read on a FastMCP server.
+
+    Call this once, right after creating the server.
+
+    Args:
+        server: A FastMCP instance (MCP SDK or standalone fastmcp)
+        resource_uri: URI of the JSON metrics resource, or None to skip it
+        http_path: Path of the Prometheus endpoint when served over HTTP,
+            or None to skip it
+
+    Returns:
+        The ServerMetrics being recorded into
+    """
+    metrics = ServerMetrics(server.name)
+    handlers = server._mcp_server.request_handlers
+
+    call_tool = handlers.get(types.CallToolRequest)
+    if call_tool is not None:
+
+        async def timed_call_tool(request: types.CallToolRequest) -> Any:
+            return await metrics.timed(
+                "tool", request.params.name, lambda: call_tool(request)
+            )
+
+        handlers[types.CallToolRequest] = timed_call_tool
+
+    read_resource = handlers.get(types.ReadResourceRequest)
+    if read_resource is not None:
+
+        async def timed_read_resource(request: types.ReadResourceRequest) -> Any:
+            label = _resource_label(request.params.uri)
+            return await metrics.timed(
+                "resource", label, lambda: read_resource(request)
+            )
+
+        handlers[types.ReadResourceRequest] = timed_read_resource
+
+    if resource_uri is not None:
+
+        @server.resource(resource_uri)
+        def server_metrics() -> str:
+            """Calls, errors, in-flight requests and latency per tool and resource."""
+            return json.dumps(metrics.snapshot(), indent=2)
+
+    if http_path is not None and hasattr(server, "custom_route"):
+
+        @server.custom_route(http_path, methods=["GET"])
+        async def prometheus_metrics(request: Any) -> Any:
+            from starlette.responses import PlainTextResponse
+
+            return PlainTextResponse(
+                metrics.prometheus(), media_type="text/plain; version=0.0.4"
+            )
+
+    logger.debug(f"Instrumented MCP server {server.name}")
+    return metrics
@@ -3,19 +3,46 @@ MCP Server for mathematical operations and greetings.
 
 This server provides a FastMCP-based Model Context Protocol server with:
 - Mathematical operations: add, subtract, multiply, divide
+- Vectorized batch variants of the mathematical operations
+- Safe arithmetic expression evaluation with named variables
 - Dynamic greeting and farewell resources
+- Per-tool call and latency metrics (metrics://server, /metrics over HTTP)
+
+Startup is kept lean because every stdio client spawns a fresh process:
+the NumPy-backed modules are imported on the first batch or evaluate call,
+not at startup. Setting MCP_DEMO_FAST_START=1 serves the same tools with
+the MCP SDK's built-in FastMCP, whose import graph is much smaller than
+the standalone fastmcp package. benchmarks/import_budget.py keeps startup
+imports within budget.
 
 Dependencies:
 - fastmcp: FastMCP framework for building MCP servers
+- numpy: vectorized batch operations (imported on first use)
+
+Transports:
+- stdio (default): one server process per client
+- http: Streamable HTTP behind uvicorn, optionally with several worker
+  processes. With more than one worker the server runs stateless, since
+  sessions held in one worker's memory are not visible to the others.
 
 Usage:
     python mcp_demo/server.py
+    MCP_DEMO_FAST_START=1 python mcp_demo/server.py
+    mcp-server --transport http --host 0.0.0.0 --port 8000 --workers 4
 """
 from __future__ import annotations
 
+import argparse
 import logging
+import os
+from typing import Any
+
+if os.getenv("MCP_DEMO_FAST_START", "0") == "1":
+    from mcp.server.fastmcp import FastMCP
+else:
+    from fastmcp import FastMCP
 
-from fastmcp import FastMCP
+from mcp_demo.metrics import instrument
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +50,8 @@ logger = logging.getLogger(__name__)
 
 # Create MCP server instance
 mcp = FastMCP("Demo")
+# Per-tool latency histograms, exposed as metrics://server and /metrics over HTTP
+metrics = instrument(mcp)
 
 
 @mcp.tool()
@@ -88,6 +117,116 @@ def divide(a: int, b: int) -> float:
     return a / b
 
 
+@mcp.tool()
+def batch_add(a: list[int], b: list[int]) -> list[int]:
+    """Add two columns of numbers element-wise in a single call.
+    
+    Args:
+        a: First numbers to add
+        b: Second numbers to add, same length as a
+        
+    Returns:
+        The element-wise sums a[i] + b[i]
+    """
+    from mcp_demo import arithmetic
+
+    return arithmetic.batch_apply("add", a, b)
+
+
+@mcp.tool()
+def batch_subtract(a: list[int], b: list[int]) -> list[int]:
+    """Subtract two columns of numbers element-wise in a single call.
+    
+    Args:
+        a: Numbers to subtract from
+        b: Numbers to subtract, same length as a
+        
+    Returns:
+        The element-wise differences a[i] - b[i]
+    """
+    from mcp_demo import arithmetic
+
+    return arithmetic.batch_apply("subtract", a, b)
+
+
+@mcp.tool()
+def batch_multiply(a: list[int], b: list[int]) -> list[int]:
+    """Multiply two columns of numbers element-wise in a single call.
+    
+    Args:
+        a: First numbers to multiply
+        b: Second numbers to multiply, same length as a
+        
+    Returns:
+        The element-wise products a[i] * b[i]
+    """
+    from mcp_demo import arithmetic
+
+    return arithmetic.batch_apply("multiply", a, b)
+
+
+@mcp.tool()
+def batch_divide(a: list[int], b: list[int]) -> list[float]:
+    """Divide two columns of numbers element-wise in a single call.
+    
+    Args:
+        a: Dividends
+        b: Divisors, same length as a
+        
+    Returns:
+        The element-wise quotients a[i] / b[i], with 0 where b[i] is zero
+        (same semantics as divide)
+    """
+    from mcp_demo import arithmetic
+
+    return arithmetic.batch_apply("divide", a, b)
+
+
+@mcp.tool()
+def batch_calculate(ops: list[str], a: list[int], b: list[int]) -> list[int | float]:
+    """Apply a different operation to each row of operands in a single call.
+    
+    Args:
+        ops: Operation per row: "add", "subtract", "multiply" or "divide"
+        a: Left operand per row
+        b: Right operand per row
+        
+    Returns:
+        One result per row, in the same order as the inputs
+    """
+    from mcp_demo import arithmetic
+
+    return arithmetic.batch_calculate(ops, a, b)
+
+
+@mcp.tool()
+def evaluate(
+    expression: str, variables: list[dict[str, float]] | None = None
+) -> list[float | None]:
+    """Evaluate an arithmetic expression for one or many sets of variables.
+    
+    Supports + - * / (division by zero gives 0, like divide), parentheses,
+    numbers, named variables and the functions abs, sqrt, floor, ceil,
+    round, min and max. Compiled expressions are cached, and all variable
+    bindings are evaluated in one vectorized pass.
+    
+    Args:
+        expression: Expression to evaluate, e.g. "(a + b) * c / d"
+        variables: One mapping of variable name to value per evaluation,
+            e.g. [{"a": 1, "b": 2, "c": 3, "d": 4}]; omit for constant
+            expressions
+        
+    Returns:
+        One result per set of variables; null where the result is not a
+        finite number
+    """
+    from mcp_demo import expressions
+
+    compiled = expressions.compile_expression(expression)
+    bindings = variables if variables is not None else [{}]
+    return compiled.evaluate(bindings)
+
+
 @mcp.resource("greeting://{name}")
 def greeting(name: str) -> str:
     """Generate a personalized greeting.
@@ -114,10 +253,75 @@ def farewell(name: str) -> str:
     return f"Goodbye, {name}!"
 
 
+def create_http_app() -> Any:
+    """Build the Streamable HTTP ASGI app; uvicorn calls this once per worker.
+    
+    Settings come from environment variables set by ``main()`` so that
+    worker processes started by uvicorn see the same configuration.
+    
+    Returns:
+        The ASGI application serving MCP at MCP_DEMO_HTTP_PATH
+    """
+    path = os.getenv("MCP_DEMO_HTTP_PATH", "/mcp")
+    stateless = os.getenv("MCP_DEMO_HTTP_STATELESS", "0") == "1"
+    if hasattr(mcp, "http_app"):
+        return mcp.http_app(path=path, stateless_http=stateless)
+    # MCP SDK FastMCP (MCP_DEMO_FAST_START=1) is configured through settings
+    mcp.settings.streamable_http_path = path
+    mcp.settings.stateless_http = stateless
+    return mcp.streamable_http_app()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the MCP demo server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--host", default=os.getenv("MCP_DEMO_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("MCP_DEMO_PORT", "8000"))
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("MCP_DEMO_WORKERS", "1")),
+        help="uvicorn worker processes for the http transport",
+    )
+    parser.add_argument(
+        "--path",
+        default=os.getenv("MCP_DEMO_HTTP_PATH", "/mcp"),
+        help="MCP endpoint path",
+    )
+    parser.add_argument(
+        "--stateless",
+        action="store_true",
+        help="Serve without per-client sessions (always on with more than one worker)",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
-    """Start the MCP server."""
-    logger.info("Starting MCP server")
-    mcp.run()
+    """Start the MCP server over stdio or Streamable HTTP."""
+    args = parse_args()
+    if args.transport == "stdio":
+        logger.info("Starting MCP server")
+        mcp.run()
+        return
+
+    import uvicorn
+
+    stateless = args.stateless or args.workers > 1
+    os.environ["MCP_DEMO_HTTP_PATH"] = args.path
+    os.environ["MCP_DEMO_HTTP_STATELESS"] = "1" if stateless else "0"
+    logger.info(
+        f"Starting MCP server on http://{args.host}:{args.port}{args.path} "
+        f"with {args.workers} worker(s){' (stateless)' if stateless else ''}"
+    )
+    uvicorn.run(
+        "mcp_demo.server:create_http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+    )
 
 
 if __name__ == "__main__":
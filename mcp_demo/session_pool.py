@@ -0,0 +1,300 @@
+"""
+Pool of warm, initialized MCP client sessions.
+
+Spawning the server process and running the ``initialize`` handshake costs
+far more than a tool call, so running many prompts through a fresh
+``stdio_client`` each time is dominated by startup. SessionPool keeps N
+server processes running with initialized sessions and hands them out to
+concurrent asyncio tasks:
+
+- Checkout is first come, first served: waiters are queued in order.
+- Sessions idle longer than ``health_check_interval`` are pinged before
+  they are handed out, and a session whose caller raised is pinged before
+  it goes back to the pool.
+- A session whose server crashed or stopped answering is closed and
+  respawned in the background with exponential backoff.
+
+Each session lives in its own owner task, because the anyio task groups
+inside ``stdio_client`` and ``ClientSession`` must be entered and exited
+from the same task.
+
+Usage:
+    async with SessionPool(SERVER_PARAMS, size=4) as pool:
+        result = await pool.call_tool("add", {"a": 1, "b": 2})
+
+        async with pool.session() as session:
+            tools = await session.list_tools()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.types import CallToolResult
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """Counters for pool activity."""
+
+    checkouts: int = 0
+    waits: int = 0
+    health_checks: int = 0
+    respawns: int = 0
+    spawn_failures: int = 0
+
+
+class _PooledSession:
+    """One server process plus its initialized session, owned by a task."""
+
+    def __init__(self, slot: int, server_params: StdioServerParameters) -> None:
+        self.slot = slot
+        self.server_params = server_params
+        self.session: ClientSession | None = None
+        self.error: BaseException | None = None
+        self.last_used = time.monotonic()
+        self.uses = 0
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self, timeout: float) -> None:
+        """Spawn the server and wait for the handshake to finish.
+
+        Raises:
+            RuntimeError: If the server fails to start or initialize in time
+        """
+        self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.slot}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except TimeoutError:
+            await self.close()
+            raise RuntimeError(
+                f"MCP session {self.slot} did not initialize within {timeout}s"
+            )
+        except asyncio.CancelledError:
+            await self.close()
+            raise
+        if self.session is None:
+            await self.close()
+            raise RuntimeError(f"MCP session {self.slot} failed to start: {self.error}")
+        self.last_used = time.monotonic()
+
+    async def _run(self) -> None:
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            self.error = e
+            logger.warning(f"MCP session {self.slot} exited with error: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self, timeout: float) -> bool:
+        """Return True if the server answers a ping within ``timeout`` seconds."""
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed for MCP session {self.slot}: {e}")
+            return False
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Shut down the session and its server process."""
+        self._stop.set()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except TimeoutError:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class SessionPool:
+    """Fixed-size pool of initialized MCP client sessions."""
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        size: int = 4,
+        health_check_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+        start_timeout: float = 30.0,
+        max_respawn_delay: float = 30.0,
+    ) -> None:
+        """
+        Configure the pool; call ``start()`` or use ``async with`` to spawn it.
+
+        Args:
+            server_params: How to launch the MCP server
+            size: Number of server processes and sessions to keep warm
+            health_check_interval: Ping sessions idle longer than this before use
+            ping_timeout: Seconds to wait for a health check ping
+            start_timeout: Seconds to wait for a server to initialize
+            max_respawn_delay: Upper bound on the backoff between respawn attempts
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.server_params = server_params
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.start_timeout = start_timeout
+        self.max_respawn_delay = max_respawn_delay
+        self.stats = PoolStats()
+        self._idle: asyncio.Queue[_PooledSession] = asyncio.Queue()
+        self._sessions: dict[int, _PooledSession] = {}
+        self._respawns: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    async def start(self) -> None:
+        """Spawn and initialize every session concurrently.
+
+        Raises:
+            RuntimeError: If any server fails to start; the others are closed
+        """
+        entries = [
+            _PooledSession(slot, self.server_params) for slot in range(self.size)
+        ]
+        results = await asyncio.gather(
+            *(entry.start(self.start_timeout) for entry in entries),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await asyncio.gather(*(entry.close() for entry in entries))
+            raise RuntimeError(
+                f"{len(errors)} of {self.size} MCP sessions failed to start"
+            ) from errors[0]
+        for entry in entries:
+            self._sessions[entry.slot] = entry
+            self._idle.put_nowait(entry)
+        logger.info(f"MCP session pool started with {self.size} sessions")
+
+    async def close(self) -> None:
+        """Stop respawns and shut down every session."""
+        self._closed = True
+        for task in self._respawns:
+            task.cancel()
+        await asyncio.gather(*self._respawns, return_exceptions=True)
+        await asyncio.gather(*(entry.close() for entry in self._sessions.values()))
+        self._sessions.clear()
+        logger.info("MCP session pool closed")
+
+    async def __aenter__(self) -> SessionPool:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """Check out a healthy session for exclusive use.
+
+        If the caller's block raises, the session is health-checked before it
+        is returned to the pool and respawned if it no longer responds.
+        """
+        entry = await self._checkout()
+        failed = False
+        try:
+            yield entry.session
+        except Exception:
+            failed = True
+            raise
+        finally:
+            entry.uses += 1
+            entry.last_used = time.monotonic()
+            if failed and not await entry.ping(self.ping_timeout):
+                self._schedule_respawn(entry)
+            else:
+                self._idle.put_nowait(entry)
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> CallToolResult:
+        """Call a tool on any available session."""
+        async with self.session() as session:
+            return await session.call_tool(name, arguments=arguments)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "respawning": len(self._respawns),
+            **asdict(self.stats),
+        }
+
+    async def _checkout(self) -> _PooledSession:
+        if self._closed:
+            raise RuntimeError("Session pool is closed")
+        while True:
+            if self._idle.empty():
+                self.stats.waits += 1
+            entry = await self._idle.get()
+            if not entry.alive:
+                self._schedule_respawn(entry)
+                continue
+            if time.monotonic() - entry.last_used > self.health_check_interval:
+                self.stats.health_checks += 1
+                if not await entry.ping(self.ping_timeout):
+                    self._schedule_respawn(entry)
+                    continue
+            self.stats.checkouts += 1
+            return entry
+
+    def _schedule_respawn(self, entry: _PooledSession) -> None:
+        if self._closed:
+            return
+        task = asyncio.create_task(self._respawn(entry))
+        self._respawns.add(task)
+        task.add_done_callback(self._respawns.discard)
+
+    async def _respawn(self, entry: _PooledSession) -> None:
+        """Replace a dead session, retrying with exponential backoff."""
+        logger.warning(f"Respawning MCP session {entry.slot}")
+        await entry.close()
+        delay = 0.5
+        while not self._closed:
+            replacement = _PooledSession(entry.slot, self.server_params)
+            try:
+                await replacement.start(self.start_timeout)
+            except RuntimeError as e:
+                self.stats.spawn_failures += 1
+                logger.error(f"{e}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_respawn_delay)
+                continue
+            if self._closed:
+                await replacement.close()
+                return
+            self.stats.respawns += 1
+            self._sessions[entry.slot] = replacement
+            self._idle.put_nowait(replacement)
+            return
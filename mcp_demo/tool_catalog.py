@@ -0,0 +1,237 @@
+"""
+Cached tool catalog for an MCP client session.
+
+Listing tools and converting every schema to the OpenAI tool format on
+each prompt is wasted work: the catalog only changes when the server says
+so. ToolCatalog fetches the tool list once per session (following
+pagination), converts and serializes each schema once, and invalidates the
+cache only when the server sends ``notifications/tools/list_changed``.
+
+With many tools attached, schemas make up most of each LLM request, so
+``select()`` puts the tools whose name and description best match a
+prompt first and fills the rest of a size budget in catalog order, instead
+of sending all of them.
+
+Usage:
+    catalog = ToolCatalog()
+    handler = catalog.handle_message
+    async with ClientSession(read, write, message_handler=handler) as session:
+        await session.initialize()
+        catalog.bind(session)
+        functions = await catalog.select("Add 2 to 25", limit=5)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from mcp import ClientSession
+from mcp.types import ServerNotification, Tool, ToolListChangedNotification
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how i in is it me of on or please the "
+    "to what with you".split()
+)
+
+
+def _terms(text: str) -> set[str]:
+    return {word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS}
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """A tool with its LLM schema, converted and serialized once."""
+
+    tool: Tool
+    schema: dict[str, Any]
+    serialized: str
+    name_terms: frozenset[str]
+    description_terms: frozenset[str]
+
+    def score(self, prompt_terms: set[str]) -> int:
+        """Relevance to a prompt: name matches count double."""
+        return 2 * len(prompt_terms & self.name_terms) + len(
+            prompt_terms & self.description_terms
+        )
+
+
+class ToolCatalog:
+    """Per-session cache of tools and their LLM schemas."""
+
+    def __init__(
+        self,
+        session: ClientSession | None = None,
+        converter: Callable[[Tool], dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Args:
+            session: Session to list tools from; can also be set with ``bind()``
+            converter: Tool to LLM schema conversion; defaults to the OpenAI
+                function format
+        """
+        self.session = session
+        self.converter = converter or to_openai_tool
+        self.fetches = 0
+        self.invalidations = 0
+        self._entries: list[CatalogEntry] | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def bind(self, session: ClientSession) -> None:
+        """Attach the catalog to a session and drop anything cached."""
+        self.session = session
+        self._generation += 1
+        self._entries = None
+
+    def invalidate(self) -> None:
+        """Forget the cached tool list; the next access fetches it again."""
+        self._generation += 1
+        self._entries = None
+        self.invalidations += 1
+
+    async def handle_message(self, message: Any) -> None:
+        """``message_handler`` for ClientSession; invalidates on list_changed."""
+        if isinstance(message, ServerNotification) and isinstance(
+            message.root, ToolListChangedNotification
+        ):
+            logger.info("Server tool list changed; invalidating tool catalog")
+            self.invalidate()
+
+    async def entries(self) -> list[CatalogEntry]:
+        """Return the cached entries, fetching them if needed."""
+        if self._entries is not None:
+            return self._entries
+        async with self._lock:
+            # Another task may have fetched while we waited for the lock
+            if self._entries is not None:
+                return self._entries
+            generation = self._generation
+            entries = [self._make_entry(tool) for tool in await self._fetch_tools()]
+            # Only cache if no list_changed arrived while fetching
+            if generation == self._generation:
+                self._entries = entries
+            return entries
+
+    async def tools(self) -> list[Tool]:
+        return [entry.tool for entry in await self.entries()]
+
+    async def schemas(self) -> list[dict[str, Any]]:
+        """All tool schemas in LLM format."""
+        return [entry.schema for entry in await self.entries()]
+
+    async def select(
+        self, prompt: str, limit: int = 8, max_chars: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Choose the tool schemas most relevant to ``prompt``.
+
+        Tools are ranked by how many prompt words appear in their name
+        (weighted double) and description. Whatever budget the matches leave
+        is filled with the unmatched tools in catalog order, so a prompt that
+        names one tool but needs another still gets both. If no tool
+        matches, every tool is returned in catalog order rather than an
+        arbitrary first few.
+
+        Args:
+            prompt: User prompt the tools will be offered for
+            limit: Maximum number of tools to return when some tool matches
+            max_chars: Optional budget on the total serialized schema size;
+                applies whether or not any tool matched
+
+        Returns:
+            Selected schemas in LLM format, matches first by relevance
+        """
+        entries = await self.entries()
+        prompt_terms = _terms(prompt)
+        scored = [
+            (entry.score(prompt_terms), index, entry)
+            for index, entry in enumerate(entries)
+        ]
+        matched = sorted(
+            (item for item in scored if item[0] > 0),
+            key=lambda item: (-item[0], item[1]),
+        )
+        if not matched:
+            limit = len(scored)
+        ranked = matched + [item for item in scored if item[0] == 0]
+
+        selected: list[dict[str, Any]] = []
+        used_chars = 0
+        for _, _, entry in ranked:
+            if len(selected) >= limit:
+                break
+            size = len(entry.serialized)
+            if max_chars is not None and selected and used_chars + size > max_chars:
+                break
+            selected.append(entry.schema)
+            used_chars += size
+        logger.debug(
+            f"Selected tools {[s['function']['name'] for s in selected]} for prompt"
+        )
+        return selected
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "cached": self._entries is not None,
+            "tools": len(self._entries) if self._entries is not None else 0,
+            "fetches": self.fetches,
+            "invalidations": self.invalidations,
+        }
+
+    async def _fetch_tools(self) -> list[Tool]:
+        if self.session is None:
+            raise RuntimeError("ToolCatalog is not bound to a session")
+        tools: list[Tool] = []
+        cursor = None
+        while True:
+            result = await self.session.list_tools(cursor=cursor)
+            tools.extend(result.tools)
+            cursor = result.nextCursor
+            if not cursor:
+                break
+        self.fetches += 1
+        logger.debug(f"Fetched {len(tools)} tools from server")
+        return tools
+
+    def _make_entry(self, tool: Tool) -> CatalogEntry:
+        schema = self.converter(tool)
+        return CatalogEntry(
+            tool=tool,
+            schema=schema,
+            serialized=json.dumps(schema, separators=(",", ":")),
+            name_terms=frozenset(_terms(tool.name)),
+            description_terms=frozenset(_terms(tool.description or "")),
+        )
+
+
+def to_openai_tool(tool: Tool) -> dict[str, Any]:
+    """
+    Convert an MCP tool to the OpenAI function tool format.
+
+    Args:
+        tool: MCP tool with name, description and inputSchema
+
+    Returns:
+        Dictionary containing the tool schema in OpenAI format
+    """
+    return {
+        "type": "function",
+        "function": {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": {
+                "type": "object",
+                "properties": tool.inputSchema.get("properties", {}),
+                "required": tool.inputSchema.get("required", []),
+            },
+        },
+    }
@@ -0,0 +1,116 @@
+"""
+Concurrent execution of LLM-suggested tool calls.
+
+An LLM turn often suggests several independent tool calls (for example a
+handful of ``add`` calls). Awaiting them one at a time serializes work the
+server could do in parallel; MCP sessions multiplex requests, so they can
+be in flight together.
+
+dispatch_tool_calls runs the calls concurrently under a concurrency cap,
+bounds each call with a per-tool timeout, and returns one outcome per call
+in the original order. A failing or timed-out call is reported in its
+outcome and does not cancel the others.
+
+Usage:
+    outcomes = await dispatch_tool_calls(session, functions_to_call, timeout=10)
+    for outcome in outcomes:
+        print(outcome.name, outcome.text if outcome.ok else outcome.error)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from mcp.types import CallToolResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOOL_TIMEOUT = 30.0
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class ToolCaller(Protocol):
+    """Anything with ClientSession's ``call_tool``, e.g. a session or SessionPool."""
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any] | None = None
+    ) -> CallToolResult: ...
+
+
+@dataclass
+class ToolCallOutcome:
+    """Result of one dispatched tool call."""
+
+    name: str
+    args: dict[str, Any] = field(default_factory=dict)
+    result: CallToolResult | None = None
+    error: str | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return (
+            self.error is None and self.result is not None and not self.result.isError
+        )
+
+    @property
+    def text(self) -> str:
+        """Text of the first content block, or the error message."""
+        if self.error is not None:
+            return self.error
+        if self.result is None or not self.result.content:
+            return ""
+        return getattr(self.result.content[0], "text", "")
+
+
+async def dispatch_tool_calls(
+    caller: ToolCaller,
+    calls: Sequence[Mapping[str, Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    timeout: float | None = DEFAULT_TOOL_TIMEOUT,
+    timeouts: Mapping[str, float] | None = None,
+) -> list[ToolCallOutcome]:
+    """
+    Run tool calls concurrently and collect their outcomes in order.
+
+    Args:
+        caller: Session (or pool) to call the tools on
+        calls: Calls as returned by call_llm, each with ``name`` and ``args``
+        max_concurrency: Maximum number of calls in flight at once
+        timeout: Default per-call timeout in seconds; None for no limit
+        timeouts: Per-tool overrides of ``timeout``, keyed by tool name
+
+    Returns:
+        One ToolCallOutcome per call, in the same order as ``calls``
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    timeouts = timeouts or {}
+
+    async def run_one(call: Mapping[str, Any]) -> ToolCallOutcome:
+        outcome = ToolCallOutcome(name=call["name"], args=dict(call.get("args") or {}))
+        limit = timeouts.get(outcome.name, timeout)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                outcome.result = await asyncio.wait_for(
+                    caller.call_tool(outcome.name, arguments=outcome.args), limit
+                )
+            except TimeoutError:
+                outcome.error = f"Tool {outcome.name} timed out after {limit}s"
+            except Exception as e:
+                outcome.error = f"Tool {outcome.name} failed: {e}"
+            outcome.elapsed = time.perf_counter() - started
+        if outcome.error is not None:
+            logger.warning(outcome.error)
+        return outcome
+
+    outcomes = await asyncio.gather(*(run_one(call) for call in calls))
+    failed = sum(1 for outcome in outcomes if not outcome.ok)
+    if failed:
+        logger.info(f"{failed} of {len(outcomes)} tool calls failed")
+    return list(outcomes)
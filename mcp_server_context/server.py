@@ -1,6 +1,13 @@
 from mcp.server.fastmcp import FastMCP
 
+try:
+    # Métricas opcionales: solo si el paquete mcp_demo está instalado
+    from mcp_demo.metrics import instrument
+except ImportError:
+    instrument = None
+
 mcp = FastMCP(name="Servidor MCP con contexto mutable")
+metrics = instrument(mcp) if instrument is not None else None
 
 root_context = {"message": "¡Bienvenido!", "user_data": {}}
 
@@ -1,7 +1,14 @@
 from mcp.server.fastmcp import FastMCP
 import random
 
+try:
+    # Métricas opcionales: solo si el paquete mcp_demo está instalado
+    from mcp_demo.metrics import instrument
+except ImportError:
+    instrument = None
+
 mcp = FastMCP("ServidorMCPHoroscopo")
+metrics = instrument(mcp) if instrument is not None else None
 
 @mcp.tool()
 def obtener_horoscopo(signo: str) -> str:
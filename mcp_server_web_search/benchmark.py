@@ -0,0 +1,285 @@
+"""
+Load benchmark for the web search MCP server.
+
+Starts the fake SerpApi upstream (see fake_serpapi.py), launches server.py
+over stdio pointed at it, and drives one tool at each requested concurrency
+level. Reports p50/p95/p99 latency, throughput, error count and the server
+process RSS. No SerpApi credits are used.
+
+Usage:
+    python mcp_server_web_search/benchmark.py --concurrency 1 8 32 --requests 200
+    python mcp_server_web_search/benchmark.py --tool qna --latency-ms 400 --json r.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fake_serpapi import FakeSerpApiConfig, start_in_thread
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+logger = logging.getLogger(__name__)
+
+SERVER_PATH = Path(__file__).parent / "server.py"
+REPEATED_QUERIES = [f"model context protocol topic {i}" for i in range(10)]
+
+
+@dataclass
+class LevelResult:
+    """Measurements for one concurrency level."""
+
+    tool: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    server_rss_mb: Optional[float]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def child_rss_bytes() -> Optional[int]:
+    """Total resident memory of this process's direct children (Linux only)."""
+    proc = Path("/proc")
+    if not proc.exists():
+        return None
+    parent_pid = os.getpid()
+    total = 0
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            # The command name may contain spaces; fields resume after ")"
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+            if ppid != parent_pid:
+                continue
+            for line in (entry / "status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            continue
+    return total
+
+
+def tool_arguments(tool: str, index: int, repeat_queries: bool) -> Dict[str, Any]:
+    """Arguments for the ``index``-th call of ``tool``."""
+    if repeat_queries:
+        query = REPEATED_QUERIES[index % len(REPEATED_QUERIES)]
+    else:
+        query = f"benchmark query {index}"
+    if tool == "qna":
+        return {"question": query}
+    if tool == "batch_search":
+        return {
+            "queries": [query, f"{query} news"],
+            "search_types": ["general", "news"],
+        }
+    return {"query": query}
+
+
+async def run_level(
+    server_params: StdioServerParameters,
+    tool: str,
+    concurrency: int,
+    total_requests: int,
+    repeat_queries: bool,
+) -> LevelResult:
+    """Drive ``tool`` with ``concurrency`` workers against a fresh server."""
+    async with stdio_client(server_params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            # Warm up connections and imports before measuring
+            await session.call_tool(
+                tool, arguments=tool_arguments(tool, -1, repeat_queries)
+            )
+
+            latencies: List[float] = []
+            errors = 0
+            next_index = 0
+
+            async def worker() -> None:
+                nonlocal next_index, errors
+                while next_index < total_requests:
+                    index = next_index
+                    next_index += 1
+                    started = time.perf_counter()
+                    result = await session.call_tool(
+                        tool, arguments=tool_arguments(tool, index, repeat_queries)
+                    )
+                    latencies.append(time.perf_counter() - started)
+                    text = result.content[0].text if result.content else ""
+                    if result.isError or text.startswith("Error"):
+                        errors += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            duration = time.perf_counter() - started
+            rss = child_rss_bytes()
+
+    latencies.sort()
+    return LevelResult(
+        tool=tool,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        duration_s=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 2) if duration else 0.0,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        max_ms=round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        server_rss_mb=round(rss / (1024 * 1024), 1) if rss else None,
+    )
+
+
+def print_results(results: List[LevelResult]) -> None:
+    header = (
+        f"{'tool':<16}{'conc':>6}{'reqs':>7}{'errs':>6}{'rps':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rss MB':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        rss = (
+            f"{result.server_rss_mb:.1f}" if result.server_rss_mb is not None else "n/a"
+        )
+        print(
+            f"{result.tool:<16}{result.concurrency:>6}{result.requests:>7}{result.errors:>6}"
+            f"{result.throughput_rps:>10.2f}{result.p50_ms:>10.2f}{result.p95_ms:>10.2f}"
+            f"{result.p99_ms:>10.2f}{rss:>9}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the web search MCP server")
+    parser.add_argument(
+        "--tool",
+        default="general_search",
+        choices=[
+            "general_search",
+            "news_search",
+            "product_search",
+            "qna",
+            "batch_search",
+        ],
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument(
+        "--requests", type=int, default=100, help="Calls per concurrency level"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=200.0, help="Fake upstream latency"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=50.0, help="Fake upstream jitter"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fake upstream error rate"
+    )
+    parser.add_argument(
+        "--base-url",
+        help="Use an already running upstream instead of starting the fake",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep the response cache and local index enabled",
+    )
+    parser.add_argument(
+        "--repeat-queries",
+        action="store_true",
+        help="Cycle through 10 queries instead of unique ones",
+    )
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    return parser.parse_args()
+
+
+async def run_benchmark(args: argparse.Namespace) -> List[LevelResult]:
+    fake_server = None
+    base_url = args.base_url
+    if base_url is None:
+        fake_server = start_in_thread(
+            FakeSerpApiConfig(
+                latency_ms=args.latency_ms,
+                jitter_ms=args.jitter_ms,
+                error_rate=args.error_rate,
+            )
+        )
+        base_url = fake_server.base_url
+        logger.info(f"Started fake SerpApi at {base_url}")
+
+    env = {
+        **os.environ,
+        "SERPAPI_BASE_URL": base_url,
+        "SERPAPI_KEY": os.environ.get("SERPAPI_KEY", "benchmark"),
+        # Measure the server, not the upstream plan limit
+        "SERPAPI_RATE_LIMIT": os.environ.get("SERPAPI_RATE_LIMIT", "100000"),
+        "SERPAPI_RATE_BURST": os.environ.get("SERPAPI_RATE_BURST", "100000"),
+    }
+    if not args.cache:
+        env["SERPAPI_CACHE_ENABLED"] = "0"
+        env["LOCAL_INDEX_ENABLED"] = "0"
+    server_params = StdioServerParameters(
+        command=sys.executable, args=[str(SERVER_PATH)], env=env
+    )
+
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            logger.info(
+                f"Running {args.requests} x {args.tool} at concurrency {concurrency}"
+            )
+            results.append(
+                await run_level(
+                    server_params,
+                    args.tool,
+                    concurrency,
+                    args.requests,
+                    args.repeat_queries,
+                )
+            )
+    finally:
+        if fake_server is not None:
+            fake_server.shutdown()
+            fake_server.server_close()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print or save the results."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    results = asyncio.run(run_benchmark(args))
+    print_results(results)
+    if args.json:
+        args.json.write_text(
+            json.dumps([asdict(result) for result in results], indent=2)
+        )
+        logger.info(f"Wrote results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
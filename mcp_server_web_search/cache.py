@@ -0,0 +1,303 @@
+"""
+Two-tier cache for SerpApi responses.
+
+Responses are cached in a size-bounded in-memory LRU and persisted to a
+SQLite file so they survive server restarts. Entries are keyed on the
+normalized request parameters and expire after a per-engine TTL. Once an
+entry is past its TTL it can still be served for a short stale window while
+a background task refreshes it.
+
+Usage:
+    cache = SearchCache(db_path=Path(".cache/serpapi.sqlite3"))
+    await cache.open()
+    data, is_stale = await cache.get(params)
+    await cache.set(params, data)
+    await cache.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Request parameters that identify a SerpApi response
+CACHE_KEY_FIELDS = ("engine", "q", "num", "shopping_intent")
+
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_STALE_SECONDS = 600.0
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_PRUNE_EVERY = 256
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce request parameters to the fields that affect the response.
+
+    The query is lower-cased and its whitespace collapsed so trivially
+    different spellings of the same search share one cache entry.
+    """
+    normalized: Dict[str, Any] = {"engine": params.get("engine", "google")}
+    for name in CACHE_KEY_FIELDS:
+        value = params.get(name)
+        if value is None or name == "engine":
+            continue
+        if name == "q":
+            value = " ".join(str(value).lower().split())
+        elif name == "num":
+            value = int(value)
+        normalized[name] = value
+    return normalized
+
+
+def make_cache_key(params: Dict[str, Any]) -> str:
+    """Build a stable cache key from request parameters."""
+    payload = json.dumps(
+        normalize_params(params), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A cached SerpApi response and the time it was stored."""
+
+    data: Dict[str, Any]
+    stored_at: float
+    ttl: float
+
+    def age(self, now: float) -> float:
+        return now - self.stored_at
+
+    def is_fresh(self, now: float) -> bool:
+        return self.age(now) <= self.ttl
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for the cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    pruned_rows: int = 0
+
+
+class SearchCache:
+    """In-memory LRU backed by a persistent SQLite tier."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        engine_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        stale_seconds: float = DEFAULT_STALE_SECONDS,
+        prune_every: int = DEFAULT_PRUNE_EVERY,
+    ) -> None:
+        """
+        Args:
+            db_path: SQLite file for the persistent tier, or None for memory only
+            max_entries: Maximum number of entries kept in memory
+            engine_ttls: TTL in seconds per SerpApi engine
+            default_ttl: TTL for engines not listed in engine_ttls
+            stale_seconds: How long past its TTL an entry may still be served
+                while it is refreshed in the background
+            prune_every: Number of disk writes between sweeps that delete
+                rows too old to be served
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.engine_ttls = engine_ttls or {}
+        self.default_ttl = default_ttl
+        self.stale_seconds = stale_seconds
+        self.prune_every = prune_every
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def ttl_for(self, params: Dict[str, Any]) -> float:
+        """Return the TTL that applies to a request's engine."""
+        return self.engine_ttls.get(params.get("engine", "google"), self.default_ttl)
+
+    async def open(self) -> None:
+        """Open the SQLite tier and drop rows too old to be served.
+
+        Expired rows are also swept every ``prune_every`` writes so the file
+        stays bounded on a long-running server.
+        """
+        if self.db_path is None:
+            return
+        await asyncio.to_thread(self._open_db)
+        logger.info(f"Opened SerpApi cache at {self.db_path}")
+
+    async def close(self) -> None:
+        """Cancel pending refreshes and close the SQLite tier."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        if self._db is not None:
+            await asyncio.to_thread(self._close_db)
+
+    async def get(
+        self, params: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Look up a cached response.
+
+        Returns:
+            A ``(data, is_stale)`` tuple. ``data`` is None on a miss; ``is_stale``
+            is True when the entry is past its TTL but inside the stale window.
+        """
+        key = make_cache_key(params)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        from_disk = False
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._load, key)
+            from_disk = entry is not None
+
+        if entry is None or not self._is_servable(entry, now):
+            self._memory.pop(key, None)
+            self.stats.misses += 1
+            return None, False
+
+        if from_disk:
+            # Only rows that can still be served are promoted into memory
+            self._remember(key, entry)
+            self.stats.disk_hits += 1
+        else:
+            self._memory.move_to_end(key)
+            self.stats.memory_hits += 1
+
+        if entry.is_fresh(now):
+            return entry.data, False
+        self.stats.stale_hits += 1
+        return entry.data, True
+
+    async def set(self, params: Dict[str, Any], data: Dict[str, Any]) -> None:
+        """Store a response in both tiers."""
+        key = make_cache_key(params)
+        entry = CacheEntry(data=data, stored_at=time.time(), ttl=self.ttl_for(params))
+        self._remember(key, entry)
+        self.stats.stores += 1
+        if self._db is not None:
+            await asyncio.to_thread(self._store, key, entry)
+
+    def schedule_refresh(
+        self,
+        params: Dict[str, Any],
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> None:
+        """Refresh a stale entry in the background, at most once per key."""
+        key = make_cache_key(params)
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, params, fetch))
+        self._refreshing[key] = task
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return counters and sizes for reporting."""
+        lookups = self.stats.memory_hits + self.stats.disk_hits + self.stats.misses
+        hits = self.stats.memory_hits + self.stats.disk_hits
+        return {
+            **self.stats.__dict__,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "persistent": self._db is not None,
+        }
+
+    async def _refresh(
+        self,
+        key: str,
+        params: Dict[str, Any],
+        fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> None:
+        try:
+            data = await fetch()
+            if "error" not in data:
+                await self.set(params, data)
+                self.stats.refreshes += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats.refresh_errors += 1
+            logger.warning(f"Background refresh of cached SerpApi response failed: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _is_servable(self, entry: CacheEntry, now: float) -> bool:
+        """True while an entry is fresh or inside the stale window."""
+        return entry.age(now) <= entry.ttl + self.stale_seconds
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _open_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db_lock:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, ttl REAL NOT NULL)"
+            )
+            self._prune_db()
+            self._db.commit()
+
+    def _close_db(self) -> None:
+        with self._db_lock:
+            self._db.close()
+            self._db = None
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT data, stored_at, ttl FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(data=json.loads(row[0]), stored_at=row[1], ttl=row[2])
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, data, stored_at, ttl) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(entry.data), entry.stored_at, entry.ttl),
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= self.prune_every:
+                self._prune_db()
+            self._db.commit()
+
+    def _prune_db(self) -> None:
+        """Delete rows past their stale window. Caller holds ``_db_lock``."""
+        cursor = self._db.execute(
+            "DELETE FROM responses WHERE stored_at + ttl + ? < ?",
+            (self.stale_seconds, time.time()),
+        )
+        self.stats.pruned_rows += max(cursor.rowcount, 0)
+        self._writes_since_prune = 0
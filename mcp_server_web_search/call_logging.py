@@ -0,0 +1,159 @@
+"""
+Level-gated, batched client logging for tool calls.
+
+Every ``ctx.info``/``ctx.error`` is a separate JSON-RPC notification written
+to the transport. CallLogger checks the level the client requested with
+``logging/setLevel`` before a message is formatted or sent, and can either
+forward each message immediately, coalesce all of a call's messages into a
+single notification sent when the call finishes, or stay quiet.
+
+Modes:
+- "immediate": one notification per message that passes the level check
+- "batched": one notification per tool call with all of its messages
+- "quiet": no client notifications; messages only go to the server logger
+
+In every mode, messages that do not reach the client (quiet mode, or below
+the client's level) are written to this module's logger instead, so
+upstream errors are never dropped silently.
+
+Usage:
+    log_policy = ClientLogPolicy(default_level="info", mode="batched")
+    log_policy.install(mcp)
+
+    log = CallLogger(ctx, log_policy)
+    try:
+        await log.info("Found %d results", len(results))
+    finally:
+        await log.flush()
+"""
+
+from __future__ import annotations
+
+import logging
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Tuple
+
+from mcp.server.fastmcp import Context, FastMCP
+
+logger = logging.getLogger(__name__)
+
+# RFC 5424 severities used by MCP logging, lowest first
+LOG_LEVELS = {
+    "debug": 0,
+    "info": 1,
+    "notice": 2,
+    "warning": 3,
+    "error": 4,
+    "critical": 5,
+    "alert": 6,
+    "emergency": 7,
+}
+LOG_MODES = ("immediate", "batched", "quiet")
+# Server-side logging level for messages that are not sent to the client
+PYTHON_LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "notice": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "alert": logging.CRITICAL,
+    "emergency": logging.CRITICAL,
+}
+
+
+@dataclass
+class LogStats:
+    """Counters for client log traffic."""
+
+    messages: int = 0
+    suppressed: int = 0
+    notifications: int = 0
+
+
+class ClientLogPolicy:
+    """Tracks each client's requested log level and the delivery mode."""
+
+    def __init__(self, default_level: str = "info", mode: str = "immediate") -> None:
+        if default_level not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level {default_level!r}")
+        if mode not in LOG_MODES:
+            raise ValueError(f"Unknown log mode {mode!r}; expected one of {LOG_MODES}")
+        self.default_level = default_level
+        self.mode = mode
+        self.stats = LogStats()
+        self._session_levels: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def install(self, server: FastMCP) -> None:
+        """Register a ``logging/setLevel`` handler that records each session's level."""
+        lowlevel = server._mcp_server
+
+        @lowlevel.set_logging_level()
+        async def handle_set_level(level: str) -> None:
+            self._session_levels[lowlevel.request_context.session] = level
+            logger.debug(f"Client requested log level {level}")
+
+    def threshold(self, ctx: Context) -> int:
+        """Minimum severity the client behind ``ctx`` wants to receive."""
+        level = self._session_levels.get(ctx.session, self.default_level)
+        return LOG_LEVELS.get(level, LOG_LEVELS[self.default_level])
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "default_level": self.default_level,
+            **asdict(self.stats),
+        }
+
+
+class CallLogger:
+    """Per-call client logger that gates by level and optionally batches."""
+
+    def __init__(self, ctx: Context, policy: ClientLogPolicy) -> None:
+        self.ctx = ctx
+        self.policy = policy
+        self._threshold = -1 if policy.mode == "quiet" else policy.threshold(ctx)
+        self._pending: List[Tuple[str, str]] = []
+
+    def is_enabled(self, level: str) -> bool:
+        """Return True if a message at ``level`` would reach the client."""
+        return self.policy.mode != "quiet" and LOG_LEVELS[level] >= self._threshold
+
+    async def debug(self, message: str, *args: Any) -> None:
+        await self.log("debug", message, *args)
+
+    async def info(self, message: str, *args: Any) -> None:
+        await self.log("info", message, *args)
+
+    async def warning(self, message: str, *args: Any) -> None:
+        await self.log("warning", message, *args)
+
+    async def error(self, message: str, *args: Any) -> None:
+        await self.log("error", message, *args)
+
+    async def log(self, level: str, message: str, *args: Any) -> None:
+        """Send or queue a message, or hand it to the server logger if gated.
+
+        ``args`` are %-formatted only when the message is actually emitted.
+        """
+        self.policy.stats.messages += 1
+        if not self.is_enabled(level):
+            self.policy.stats.suppressed += 1
+            logger.log(PYTHON_LOG_LEVELS[level], message, *args)
+            return
+        text = message % args if args else message
+        if self.policy.mode == "batched":
+            self._pending.append((level, text))
+            return
+        self.policy.stats.notifications += 1
+        await self.ctx.log(level, text)
+
+    async def flush(self) -> None:
+        """Send queued messages as one notification at the highest queued level."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        level = max((entry[0] for entry in pending), key=LOG_LEVELS.__getitem__)
+        self.policy.stats.notifications += 1
+        await self.ctx.log(level, "\n".join(text for _, text in pending))
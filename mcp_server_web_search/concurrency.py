@@ -0,0 +1,110 @@
+"""
+Concurrency helpers for the web search server.
+
+Provides SingleFlight, which collapses concurrent identical upstream
+requests into a single shared call, and TokenBucket, which keeps upstream
+traffic under the SerpApi plan's request rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task instead of starting their own. The
+    task is shielded, so a cancelled caller does not cancel the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def is_pending(self, key: str) -> bool:
+        """Return True if a call for ``key`` is currently in flight."""
+        return key in self._inflight
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key`` or join the call already in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return counters for reporting."""
+        return {
+            "in_flight": len(self._inflight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for upstream requests.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``acquire`` waits until a token is available, so bursts up to
+    ``capacity`` go through immediately and sustained traffic is held to
+    ``rate`` requests per second.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waits = 0
+
+    async def acquire(self) -> None:
+        """Wait for and consume one token."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self.waits += 1
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def try_acquire(self) -> bool:
+        """Consume one token only if it is available right now.
+
+        Returns False without waiting when the bucket is empty or other
+        callers are already queued in ``acquire``, so optional requests
+        never take tokens ahead of required ones.
+        """
+        if self._lock.locked():
+            return False
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return limiter settings and counters for reporting."""
+        return {"rate": self.rate, "capacity": self.capacity, "waits": self.waits}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
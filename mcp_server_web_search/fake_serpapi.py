@@ -0,0 +1,199 @@
+"""
+Local stand-in for the SerpApi search endpoint.
+
+Serves the JSON fixtures in ``fixtures/<engine>.json`` for ``GET /search``
+so the web search server can be exercised and benchmarked without spending
+API credits. Latency and upstream errors can be injected to reproduce slow
+or unhealthy upstream conditions.
+
+Usage:
+    python mcp_server_web_search/fake_serpapi.py --port 8765 --latency-ms 300
+    SERPAPI_BASE_URL=http://127.0.0.1:8765/search SERPAPI_KEY=fake \\
+        python mcp_server_web_search/server.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@dataclass
+class FakeSerpApiConfig:
+    """Behaviour of the fake upstream."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 30.0
+
+
+def load_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> Dict[str, bytes]:
+    """Load every ``<engine>.json`` fixture, keyed by engine name."""
+    return {
+        path.stem: path.read_bytes() for path in sorted(fixtures_dir.glob("*.json"))
+    }
+
+
+class FakeSerpApiServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering SerpApi-style search requests."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple,
+        config: FakeSerpApiConfig,
+        fixtures: Optional[Dict[str, bytes]] = None,
+    ) -> None:
+        super().__init__(address, FakeSerpApiHandler)
+        self.config = config
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/search"
+
+    def next_request(self) -> int:
+        with self._count_lock:
+            self.request_count += 1
+            return self.request_count
+
+
+class FakeSerpApiHandler(BaseHTTPRequestHandler):
+    """Request handler serving fixtures with injected latency and errors."""
+
+    server: FakeSerpApiServer
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/search":
+            self._send_json(404, {"error": f"Unknown path {url.path}"})
+            return
+
+        self.server.next_request()
+        config = self.server.config
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+        if not params.get("api_key"):
+            self._send_json(401, {"error": "Invalid API key."})
+            return
+
+        if config.timeout_rate and random.random() < config.timeout_rate:
+            time.sleep(config.timeout_seconds)
+        delay_ms = config.latency_ms + random.uniform(
+            -config.jitter_ms, config.jitter_ms
+        )
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+        if config.error_rate and random.random() < config.error_rate:
+            self._send_json(config.error_status, {"error": "Injected upstream error."})
+            return
+
+        engine = params.get("engine", "google")
+        body = self.server.fixtures.get(engine)
+        if body is None:
+            self._send_json(400, {"error": f"Unsupported engine: {engine}"})
+            return
+        self._send_body(200, body)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format, *args)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send_body(status, json.dumps(payload).encode("utf-8"))
+
+    def _send_body(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_in_thread(
+    config: FakeSerpApiConfig, host: str = "127.0.0.1", port: int = 0
+) -> FakeSerpApiServer:
+    """Start a fake server on a background thread; port 0 picks a free port."""
+    server = FakeSerpApiServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Fake SerpApi server for offline testing"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="Base response delay"
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=0.0, help="Uniform +/- delay jitter"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with an error",
+    )
+    parser.add_argument(
+        "--error-status", type=int, default=503, help="HTTP status for errors"
+    )
+    parser.add_argument(
+        "--timeout-rate", type=float, default=0.0, help="Fraction of requests that hang"
+    )
+    parser.add_argument(
+        "--timeout-seconds",
+        type=float,
+        default=30.0,
+        help="How long hanging requests hang",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the fake SerpApi server until interrupted."""
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    config = FakeSerpApiConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+    )
+    server = FakeSerpApiServer((args.host, args.port), config)
+    logger.info(f"Fake SerpApi listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Fake SerpApi stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Local BM25 index over previously fetched search results.
+
+Titles, snippets and links returned by SerpApi are added to an in-memory
+inverted index as they arrive and persisted to SQLite, so later searches
+(including paraphrases of earlier ones) can be answered locally without a
+network round-trip. News hits keep their source and date so they can be
+formatted like upstream results. Indexing and ranking run in a worker
+thread to keep the event loop free.
+
+Usage:
+    index = LocalIndex(db_path=Path(".cache/local_index.sqlite3"))
+    await index.open()
+    await index.add_response(serpapi_json, engine="google")
+    hits = await index.search("python async http client", limit=5)
+    await index.close()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Result lists in a SerpApi response that carry title/link/snippet hits
+INDEXED_RESULT_KEYS = ("organic_results", "news_results")
+
+DEFAULT_MAX_DOCUMENTS = 50_000
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+# Very common English and Spanish words that carry no ranking signal
+_STOPWORDS = frozenset(
+    "a an and are as at be by de del el en for from how in is it la las los of on "
+    "or para por que the to un una what when where who why with y".split()
+)
+
+
+def source_name(source: Any) -> str:
+    """Return a hit's source as text; google_news returns it as an object."""
+    if isinstance(source, dict):
+        return source.get("name") or ""
+    return source or ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased, accent-folded terms without stopwords."""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return [
+        token for token in _TOKEN_PATTERN.findall(folded) if token not in _STOPWORDS
+    ]
+
+
+@dataclass
+class IndexedDocument:
+    """A search hit stored in the local index."""
+
+    link: str
+    title: str
+    snippet: str
+    engine: str
+    term_counts: Counter
+    length: int
+    source: str = ""
+    date: str = ""
+
+    def as_result(self) -> Dict[str, Any]:
+        """Return the document as a SerpApi-style hit for result formatters."""
+        result = {"title": self.title, "link": self.link, "snippet": self.snippet}
+        if self.source:
+            result["source"] = self.source
+        if self.date:
+            result["date"] = self.date
+        return result
+
+
+@dataclass
+class LocalHit:
+    """A document matched by a local search.
+
+    ``coverage`` is the fraction of distinct query terms the document
+    contains and is used to decide whether local results are good enough to
+    answer a query without going upstream.
+    """
+
+    document: IndexedDocument
+    score: float
+    coverage: float
+
+
+class LocalIndex:
+    """Incrementally updated BM25 inverted index backed by SQLite."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_documents: int = DEFAULT_MAX_DOCUMENTS,
+    ) -> None:
+        """
+        Args:
+            db_path: SQLite file for persistence, or None for memory only
+            max_documents: Oldest documents are dropped beyond this size, in
+                memory and in the SQLite file
+        """
+        self.db_path = db_path
+        self.max_documents = max_documents
+        self._documents: OrderedDict[str, IndexedDocument] = OrderedDict()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        # Guards the in-memory index, which is read and updated from threads
+        self._index_lock = threading.Lock()
+        self.searches = 0
+        self.local_answers = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    async def open(self) -> None:
+        """Open the SQLite file and load stored documents into memory."""
+        if self.db_path is None:
+            return
+        rows = await asyncio.to_thread(self._open_db)
+        with self._index_lock:
+            for row in rows:
+                self._add_document(*row)
+        logger.info(f"Loaded {len(self._documents)} documents into local search index")
+
+    async def close(self) -> None:
+        """Close the SQLite file."""
+        if self._db is not None:
+            await asyncio.to_thread(self._close_db)
+
+    async def add_response(self, data: Dict[str, Any], engine: str) -> int:
+        """Index every hit of a SerpApi response and persist it.
+
+        Returns:
+            The number of documents added or updated
+        """
+        rows = []
+        for key in INDEXED_RESULT_KEYS:
+            for result in data.get(key, []):
+                link = result.get("link")
+                if not link:
+                    continue
+                rows.append(
+                    (
+                        link,
+                        result.get("title", ""),
+                        result.get("snippet", ""),
+                        engine,
+                        source_name(result.get("source")),
+                        result.get("date") or "",
+                    )
+                )
+        if rows:
+            await asyncio.to_thread(self._add_rows, rows)
+        return len(rows)
+
+    async def search(
+        self, query: str, limit: int = 5, engine: Optional[str] = None
+    ) -> List[LocalHit]:
+        """Rank indexed documents for ``query`` with BM25.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of hits to return
+            engine: Only return documents fetched with this SerpApi engine
+        """
+        return await asyncio.to_thread(self._search, query, limit, engine)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return index size and usage counters for reporting."""
+        return {
+            "documents": len(self._documents),
+            "terms": len(self._postings),
+            "searches": self.searches,
+            "local_answers": self.local_answers,
+            "persistent": self._db is not None,
+        }
+
+    def _add_rows(self, rows: List[tuple]) -> None:
+        with self._index_lock:
+            for row in rows:
+                self._add_document(*row)
+        if self._db is not None:
+            self._store(rows)
+
+    def _search(self, query: str, limit: int, engine: Optional[str]) -> List[LocalHit]:
+        with self._index_lock:
+            return self._rank(query, limit, engine)
+
+    def _rank(self, query: str, limit: int, engine: Optional[str]) -> List[LocalHit]:
+        self.searches += 1
+        query_terms = set(tokenize(query))
+        if not query_terms or not self._documents:
+            return []
+
+        document_count = len(self._documents)
+        average_length = self._total_length / document_count
+        scores: Dict[str, float] = {}
+        matched_terms: Dict[str, int] = {}
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            document_frequency = len(postings)
+            idf = math.log(
+                1
+                + (document_count - document_frequency + 0.5)
+                / (document_frequency + 0.5)
+            )
+            for link, frequency in postings.items():
+                document = self._documents[link]
+                if engine is not None and document.engine != engine:
+                    continue
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * document.length / average_length
+                )
+                term_score = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                scores[link] = scores.get(link, 0.0) + term_score
+                matched_terms[link] = matched_terms.get(link, 0) + 1
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            LocalHit(
+                document=self._documents[link],
+                score=score,
+                coverage=matched_terms[link] / len(query_terms),
+            )
+            for link, score in ranked
+        ]
+
+    def _add_document(
+        self,
+        link: str,
+        title: str,
+        snippet: str,
+        engine: str,
+        source: str = "",
+        date: str = "",
+    ) -> None:
+        if link in self._documents:
+            self._remove_document(link)
+        terms = Counter(tokenize(f"{title} {snippet} {link}"))
+        length = sum(terms.values())
+        self._documents[link] = IndexedDocument(
+            link=link,
+            title=title,
+            snippet=snippet,
+            engine=engine,
+            term_counts=terms,
+            length=length,
+            source=source,
+            date=date,
+        )
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[link] = frequency
+        while len(self._documents) > self.max_documents:
+            self._remove_document(next(iter(self._documents)))
+
+    def _remove_document(self, link: str) -> None:
+        document = self._documents.pop(link)
+        self._total_length -= document.length
+        for term in document.term_counts:
+            postings = self._postings[term]
+            del postings[link]
+            if not postings:
+                del self._postings[term]
+
+    def _open_db(self) -> Iterable[tuple]:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db_lock:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "link TEXT PRIMARY KEY, title TEXT NOT NULL, snippet TEXT NOT NULL, "
+                "engine TEXT NOT NULL, added_at REAL NOT NULL, "
+                "source TEXT NOT NULL DEFAULT '', date TEXT NOT NULL DEFAULT '')"
+            )
+            columns = {
+                row[1] for row in self._db.execute("PRAGMA table_info(documents)")
+            }
+            for column in ("source", "date"):
+                # Files written before news metadata was indexed
+                if column not in columns:
+                    self._db.execute(
+                        f"ALTER TABLE documents ADD COLUMN {column} "
+                        "TEXT NOT NULL DEFAULT ''"
+                    )
+            self._db.commit()
+            return self._db.execute(
+                "SELECT link, title, snippet, engine, source, date FROM documents "
+                "ORDER BY added_at DESC, rowid DESC LIMIT ?",
+                (self.max_documents,),
+            ).fetchall()[::-1]
+
+    def _close_db(self) -> None:
+        with self._db_lock:
+            self._db.close()
+            self._db = None
+
+    def _store(self, rows: List[tuple]) -> None:
+        added_at = time.time()
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO documents "
+                "(link, title, snippet, engine, source, date, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row, added_at) for row in rows],
+            )
+            # Keep the file bounded like the in-memory index
+            self._db.execute(
+                "DELETE FROM documents WHERE link IN ("
+                "SELECT link FROM documents ORDER BY added_at DESC, rowid DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_documents,),
+            )
+            self._db.commit()
@@ -0,0 +1,202 @@
+"""
+Tail-latency and failure handling for upstream SerpApi calls.
+
+Provides:
+- LatencyTracker: rolling latency window used to pick the hedge delay
+- CircuitBreaker: fails fast while the upstream keeps failing
+- RetryPolicy: bounded retries with exponential, fully jittered backoff
+- hedged: issues a duplicate request when the first one is slow
+- UpstreamStats: counters reported alongside the breaker state
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because the circuit breaker is open."""
+
+
+@dataclass
+class UpstreamStats:
+    """Counters for upstream attempts, retries and hedges."""
+
+    attempts: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedges_skipped: int = 0
+    failures: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class LatencyTracker:
+    """Rolling window of recent upstream latencies."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20) -> None:
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Nearest-rank percentile, or None until enough samples are collected."""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(1, math.ceil(fraction * len(ordered))) - 1]
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50 = self.percentile(0.50)
+        p95 = self.percentile(0.95)
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    refuses requests for ``reset_timeout`` seconds. It then lets a single
+    trial request through (half-open); success closes it again, failure
+    re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def before_request(self) -> None:
+        """Check whether a request may proceed.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a
+                trial request already in flight
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    "SerpApi circuit breaker is open; upstream is unhealthy"
+                )
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    "SerpApi circuit breaker is half-open; trial in progress"
+                )
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+
+    def release(self) -> None:
+        """Give up a half-open trial without an outcome, e.g. on cancellation."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if (
+            self.state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter."""
+
+    def __init__(
+        self, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0
+    ) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+async def hedged(
+    fn: Callable[[], Awaitable[T]],
+    delay: Optional[float],
+    on_hedge: Optional[Callable[[], None]] = None,
+    may_hedge: Optional[Callable[[], bool]] = None,
+) -> T:
+    """Run ``fn``; if it has not finished after ``delay`` seconds, run it again.
+
+    The first attempt to succeed wins and the other is cancelled. If one
+    attempt fails while the other is still running, the other one decides
+    the outcome. ``delay=None`` disables hedging.
+
+    ``may_hedge`` is asked once the delay has passed; returning False keeps
+    waiting on the first attempt alone (e.g. when no rate-limit token is
+    free). ``on_hedge`` is called only when the duplicate is actually sent.
+    """
+    primary = asyncio.ensure_future(fn())
+    if delay is None:
+        return await primary
+
+    tasks = {primary}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done and (may_hedge is None or may_hedge()):
+            if on_hedge is not None:
+                on_hedge()
+            tasks.add(asyncio.ensure_future(fn()))
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -2,12 +2,47 @@ from __future__ import annotations
 
 import os
 import json
+import asyncio
 import httpx
 import logging
-from typing import Dict, Any
+import time
+import importlib.util
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypedDict,
+)
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP, Context
 
+try:
+    from mcp_demo.metrics import instrument
+except ImportError:
+    # Metrics are optional; the server also runs without the mcp_demo package
+    instrument = None
+
+from cache import SearchCache, make_cache_key
+from call_logging import CallLogger, ClientLogPolicy
+from concurrency import SingleFlight, TokenBucket
+from local_index import LocalHit, LocalIndex, source_name
+from resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    RetryPolicy,
+    UpstreamStats,
+    hedged,
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -17,251 +52,1011 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")
 if not SERPAPI_KEY:
-    logger.error("SERPAPI_KEY environment variable not found. Please configure your SerpApi key in .env file.")
+    logger.error(
+        "SERPAPI_KEY environment variable not found. "
+        "Please configure your SerpApi key in .env file."
+    )
     raise EnvironmentError("SERPAPI_KEY environment variable is required")
 
-SERPAPI_BASE_URL = "https://serpapi.com/search"
+SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com/search")
 DEFAULT_TIMEOUT = 10.0
 DEFAULT_RESULTS_LIMIT = 5
 
-mcp = FastMCP("WebSearchServer")
+# Connection pool tuning for the shared SerpApi client
+HTTP_MAX_CONNECTIONS = int(os.getenv("SERPAPI_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("SERPAPI_MAX_KEEPALIVE_CONNECTIONS", "10")
+)
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("SERPAPI_KEEPALIVE_EXPIRY", "30.0"))
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)
+HTTP2_ENABLED = (
+    os.getenv("SERPAPI_HTTP2", "1") != "0"
+    and importlib.util.find_spec("h2") is not None
+)
+
+# Response cache: in-memory LRU plus a persistent SQLite tier
+CACHE_ENABLED = os.getenv("SERPAPI_CACHE_ENABLED", "1") != "0"
+CACHE_PATH = Path(
+    os.getenv(
+        "SERPAPI_CACHE_PATH", Path(__file__).parent / ".cache" / "serpapi.sqlite3"
+    )
+)
+CACHE_MAX_ENTRIES = int(os.getenv("SERPAPI_CACHE_MAX_ENTRIES", "512"))
+CACHE_STALE_SECONDS = float(os.getenv("SERPAPI_CACHE_STALE_SECONDS", "600"))
+# News goes stale quickly; web and shopping results change more slowly
+CACHE_ENGINE_TTLS = {
+    "google": 6 * 3600.0,
+    "google_news": 15 * 60.0,
+    "google_shopping": 3600.0,
+}
+
+# Upstream rate limit (requests per second) and batch fan-out bounds
+RATE_LIMIT_PER_SECOND = float(os.getenv("SERPAPI_RATE_LIMIT", "5"))
+RATE_LIMIT_BURST = float(os.getenv("SERPAPI_RATE_BURST", "10"))
+DEFAULT_BATCH_CONCURRENCY = 5
+MAX_BATCH_CONCURRENCY = int(os.getenv("SERPAPI_MAX_BATCH_CONCURRENCY", "20"))
+MAX_BATCH_SEARCHES = 100
+
+# Local BM25 index over fetched results; answers are served locally only when
+# enough hits cover most of the query terms
+LOCAL_INDEX_ENABLED = os.getenv("LOCAL_INDEX_ENABLED", "1") != "0"
+LOCAL_INDEX_PATH = Path(
+    os.getenv(
+        "LOCAL_INDEX_PATH", Path(__file__).parent / ".cache" / "local_index.sqlite3"
+    )
+)
+LOCAL_INDEX_MIN_COVERAGE = float(os.getenv("LOCAL_INDEX_MIN_COVERAGE", "0.8"))
+LOCAL_INDEX_MIN_HITS = int(os.getenv("LOCAL_INDEX_MIN_HITS", "3"))
+
+# Tail-latency handling: a duplicate request is sent once the first has taken
+# longer than the recent p95, and failing upstreams are retried with jittered
+# backoff until the circuit breaker opens
+HEDGE_ENABLED = os.getenv("SERPAPI_HEDGE", "1") != "0"
+HEDGE_DEFAULT_DELAY = 2.0
+HEDGE_MIN_DELAY = 0.25
+RETRY_MAX_ATTEMPTS = int(os.getenv("SERPAPI_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 2.0
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("SERPAPI_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("SERPAPI_BREAKER_RESET_SECONDS", "30"))
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Client log notifications: "immediate", "batched" (one per tool call) or "quiet".
+# Clients can raise the level with logging/setLevel; this is the default.
+CLIENT_LOG_MODE = os.getenv("SERPAPI_CLIENT_LOG_MODE", "immediate")
+CLIENT_LOG_LEVEL = os.getenv("SERPAPI_CLIENT_LOG_LEVEL", "info")
+
+
+@dataclass
+class AppContext:
+    """Resources shared by every tool call for the lifetime of the server."""
+    http_client: httpx.AsyncClient
+    cache: Optional[SearchCache] = None
+    index: Optional[LocalIndex] = None
+    inflight: SingleFlight = field(default_factory=SingleFlight)
+    rate_limiter: TokenBucket = field(
+        default_factory=lambda: TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+    )
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+    breaker: CircuitBreaker = field(
+        default_factory=lambda: CircuitBreaker(
+            BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+        )
+    )
+    retry_policy: RetryPolicy = field(
+        default_factory=lambda: RetryPolicy(
+            RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+        )
+    )
+    upstream_stats: UpstreamStats = field(default_factory=UpstreamStats)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled, keep-alive HTTP client used for all SerpApi calls."""
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        timeout=DEFAULT_TIMEOUT,
+        limits=limits,
+        http2=HTTP2_ENABLED,
+    )
+
+
+@asynccontextmanager
+async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
+    """Open the shared HTTP client on startup and close it on shutdown."""
+    http_client = create_http_client()
+    logger.info(
+        f"Opened SerpApi HTTP client (http2={HTTP2_ENABLED}, "
+        f"max_connections={HTTP_MAX_CONNECTIONS})"
+    )
+    cache = None
+    if CACHE_ENABLED:
+        cache = SearchCache(
+            db_path=CACHE_PATH,
+            max_entries=CACHE_MAX_ENTRIES,
+            engine_ttls=CACHE_ENGINE_TTLS,
+            stale_seconds=CACHE_STALE_SECONDS,
+        )
+        await cache.open()
+    index = None
+    if LOCAL_INDEX_ENABLED:
+        index = LocalIndex(db_path=LOCAL_INDEX_PATH)
+        await index.open()
+    try:
+        yield AppContext(http_client=http_client, cache=cache, index=index)
+    finally:
+        if index is not None:
+            await index.close()
+        if cache is not None:
+            await cache.close()
+        await http_client.aclose()
+        logger.info("Closed SerpApi HTTP client")
+
 
-async def make_serpapi_request(ctx: Context, params: Dict[str, Any]) -> Dict[str, Any]:
-    """Make a request to SerpApi with proper error handling."""
+mcp = FastMCP("WebSearchServer", lifespan=app_lifespan)
+log_policy = ClientLogPolicy(default_level=CLIENT_LOG_LEVEL, mode=CLIENT_LOG_MODE)
+log_policy.install(mcp)
+# Per-tool latency histograms, exposed as metrics://server
+metrics = instrument(mcp) if instrument is not None else None
+
+async def fetch_serpapi(
+    client: httpx.AsyncClient, params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Send one request to SerpApi and return the decoded JSON body."""
     request_params = {**params, "api_key": SERPAPI_KEY}
+    response = await client.get(SERPAPI_BASE_URL, params=request_params)
+    response.raise_for_status()
+    return response.json()
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return True for upstream failures worth retrying.
+
+    Timeouts, transport errors, 5xx responses and 429 are retryable.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def hedge_delay(app: AppContext) -> Optional[float]:
+    """Delay after which a duplicate request is sent, or None to disable hedging."""
+    if not HEDGE_ENABLED:
+        return None
+    p95 = app.latency.percentile(0.95)
+    if p95 is None:
+        return HEDGE_DEFAULT_DELAY
+    return min(max(p95, HEDGE_MIN_DELAY), DEFAULT_TIMEOUT)
+
+
+async def resilient_fetch(app: AppContext, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch from SerpApi with hedging, jittered retries and a circuit breaker.
+
+    Raises:
+        CircuitOpenError: If the breaker refuses the request
+        httpx.HTTPError: If the last attempt fails or the error is not retryable
+    """
+    # Rate-limit tokens are taken outside timed_attempt, so the hedge delay
+    # and the latency window only see time spent on the network
+    async def timed_attempt() -> Dict[str, Any]:
+        app.upstream_stats.attempts += 1
+        started = time.perf_counter()
+        try:
+            data = await fetch_serpapi(app.http_client, params)
+        except asyncio.CancelledError:
+            # The losing side of a hedge took at least this long; leaving it
+            # out would compute the p95 from winners only
+            app.latency.record(time.perf_counter() - started)
+            raise
+        app.latency.record(time.perf_counter() - started)
+        return data
+
+    def take_hedge_token() -> bool:
+        # Hedges are optional: send one only if a token is free right now
+        if app.rate_limiter.try_acquire():
+            return True
+        app.upstream_stats.hedges_skipped += 1
+        return False
+
+    def count_hedge() -> None:
+        app.upstream_stats.hedges += 1
+
+    attempt = 0
+    while True:
+        app.breaker.before_request()
+        try:
+            await app.rate_limiter.acquire()
+            data = await hedged(
+                timed_attempt,
+                hedge_delay(app),
+                on_hedge=count_hedge,
+                may_hedge=take_hedge_token,
+            )
+        except asyncio.CancelledError:
+            app.breaker.release()
+            raise
+        except (httpx.HTTPError, json.JSONDecodeError) as e:
+            if not is_retryable(e):
+                # The upstream answered; the request itself was rejected
+                app.breaker.record_success()
+                raise
+            app.breaker.record_failure()
+            app.upstream_stats.failures += 1
+            attempt += 1
+            if attempt >= app.retry_policy.max_attempts:
+                raise
+            app.upstream_stats.retries += 1
+            delay = app.retry_policy.backoff(attempt - 1)
+            logger.warning(
+                f"SerpApi attempt {attempt} failed ({e!r}), retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+        app.breaker.record_success()
+        return data
+
+
+async def refresh(app: AppContext, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Re-fetch a stale cached response through the resilient upstream path.
+
+    The cache stores the returned data itself; the refreshed hits are added
+    to the local index here, as fetch_and_store does for fresh requests.
+    """
+    data = await resilient_fetch(app, params)
+    if "error" not in data and app.index is not None:
+        await app.index.add_response(data, params.get("engine", "google"))
+    return data
+
+
+async def make_serpapi_request(
+    ctx: Context, params: Dict[str, Any], log: Optional[CallLogger] = None
+) -> Dict[str, Any]:
+    """Make a request to SerpApi with proper error handling.
+
+    Uses the pooled client from the server lifespan so TCP/TLS connections
+    to serpapi.com are reused across tool calls. Responses are served from
+    the cache when possible; stale entries are returned immediately and
+    refreshed in the background. Concurrent identical requests share one
+    upstream call, while each caller still logs to its own context.
+
+    Pass the calling tool's ``log`` so its messages are batched with the
+    tool's own; without one, messages are flushed before returning.
+    """
+    if log is None:
+        log = CallLogger(ctx, log_policy)
+        try:
+            return await make_serpapi_request(ctx, params, log)
+        finally:
+            await log.flush()
+
+    app: AppContext = ctx.request_context.lifespan_context
+    engine = params.get("engine", "google")
+
+    if app.cache is not None:
+        cached, is_stale = await app.cache.get(params)
+        if cached is not None:
+            if is_stale:
+                await log.info(
+                    "Serving stale cached response for engine: %s, revalidating",
+                    engine,
+                )
+                app.cache.schedule_refresh(params, lambda: refresh(app, params))
+            else:
+                await log.info("Serving cached response for engine: %s", engine)
+            return cached
     
+    async def fetch_and_store() -> Dict[str, Any]:
+        data = await resilient_fetch(app, params)
+        if "error" not in data:
+            if app.cache is not None:
+                await app.cache.set(params, data)
+            if app.index is not None:
+                await app.index.add_response(data, engine)
+        return data
+
+    key = make_cache_key(params)
     try:
-        async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            await ctx.info(f"Making SerpAPI request with engine: {params.get('engine', 'google')}")
-            response = await client.get(SERPAPI_BASE_URL, params=request_params)
-            response.raise_for_status()
-            data = response.json()
-            await ctx.info("Received response from SerpAPI")
-            return data
+        if app.inflight.is_pending(key):
+            await log.info("Joining in-flight SerpAPI request with engine: %s", engine)
+        else:
+            await log.info("Making SerpAPI request with engine: %s", engine)
+        data = await app.inflight.run(key, fetch_and_store)
+        await log.info("Received response from SerpAPI")
+        return data
+    except CircuitOpenError as e:
+        await log.error(str(e))
+        raise Exception(str(e))
     except httpx.TimeoutException:
-        await ctx.error("Request to SerpApi timed out")
+        await log.error("Request to SerpApi timed out")
         raise Exception("Request to SerpApi timed out")
     except httpx.RequestError as e:
-        await ctx.error(f"Request error to SerpApi: {e}")
+        await log.error("Request error to SerpApi: %s", e)
         raise Exception(f"Request to SerpApi failed: {e}")
     except httpx.HTTPStatusError as e:
-        await ctx.error(f"HTTP error from SerpApi: {e.response.status_code} - {e.response.text}")
+        await log.error(
+            "HTTP error from SerpApi: %s - %s",
+            e.response.status_code,
+            e.response.text,
+        )
         raise Exception(f"HTTP error from SerpApi: {e.response.status_code}")
     except json.JSONDecodeError:
-        await ctx.error("Failed to decode JSON response from SerpApi")
+        await log.error("Failed to decode JSON response from SerpApi")
         raise Exception("Failed to decode JSON response from SerpApi")
 
+def format_organic_result(index: int, result: Dict[str, Any]) -> str:
+    """Format one organic web result as markdown."""
+    return (
+        f"## {index}. {result.get('title', 'No title')}\n"
+        f"**Link**: {result.get('link', 'No link')}\n"
+        f"**Snippet**: {result.get('snippet', 'No summary')}\n"
+    )
+
+def format_news_result(index: int, result: Dict[str, Any]) -> str:
+    """Format one news result as markdown."""
+    return (
+        f"## {index}. {result.get('title', 'No title')}\n"
+        f"**Source**: {source_name(result.get('source')) or 'No source'}\n"
+        f"**Date**: {result.get('date', 'No date')}\n"
+        f"**Link**: {result.get('link', 'No link')}\n"
+        f"**Snippet**: {result.get('snippet', 'No summary')}\n"
+    )
+
+def format_product_result(index: int, result: Dict[str, Any]) -> str:
+    """Format one shopping result as markdown."""
+    return (
+        f"## {index}. {result.get('title', 'No title')}\n"
+        f"**Price**: {result.get('price', 'No price')}\n"
+        f"**Rating**: {result.get('rating', 'No rating')}\n"
+        f"({result.get('reviews', 'No reviews')})\n"
+        f"**Source**: {result.get('source', 'No source')}\n"
+        f"**Link**: {result.get('link', 'No link')}\n"
+    )
+
+def format_related_question(index: int, question: Dict[str, Any]) -> str:
+    """Format one related question as markdown."""
+    return (
+        f"## {index}. {question.get('question', 'No question')}\n"
+        f"**Link**: {question.get('link', 'No link')}\n"
+    )
+
+
+class SearchRecord(TypedDict, total=False):
+    """One search hit; fields not requested or not returned are omitted."""
+    position: int
+    title: str
+    link: str
+    snippet: str
+    source: str
+    date: str
+    price: str
+    rating: float
+    reviews: int
+
+
+StructuredSearchType = Literal["general", "news", "product", "qna"]
+
+
+class StructuredSearchResult(TypedDict):
+    """Structured response of the structured_search tool.
+
+    ``answer`` is None unless a Q&A search returned an answer box.
+    """
+    query: str
+    search_type: str
+    count: int
+    results: List[SearchRecord]
+    answer: Optional[str]
+
+
+@dataclass(frozen=True)
+class SearchType:
+    """How to query one kind of search and format its results."""
+    label: str
+    params: Dict[str, Any]
+    results_key: str
+    format_result: Callable[[int, Dict[str, Any]], str]
+    record_fields: Tuple[str, ...]
+
+
+SEARCH_TYPES: Dict[str, SearchType] = {
+    "general": SearchType(
+        "organic",
+        {"engine": "google"},
+        "organic_results",
+        format_organic_result,
+        ("position", "title", "link", "snippet"),
+    ),
+    "news": SearchType(
+        "news",
+        {"engine": "google_news"},
+        "news_results",
+        format_news_result,
+        ("position", "title", "link", "snippet", "source", "date"),
+    ),
+    "product": SearchType(
+        "product",
+        {"engine": "google_shopping", "shopping_intent": "high"},
+        "shopping_results",
+        format_product_result,
+        ("position", "title", "link", "source", "price", "rating", "reviews"),
+    ),
+}
+
+# Q&A searches list organic hits like general searches and add the answer box;
+# kept out of SEARCH_TYPES because batch_search has no place for the answer
+QNA_SEARCH_TYPE = SearchType(
+    "Q&A",
+    {"engine": "google"},
+    "organic_results",
+    format_organic_result,
+    ("position", "title", "link", "snippet"),
+)
+
+
+def build_search_params(
+    search_type: SearchType, query: str, num_results: int
+) -> Dict[str, Any]:
+    """Build SerpApi request parameters for a search type."""
+    return {"q": query, "num": num_results, **search_type.params}
+
+
+def format_results(
+    search_type: SearchType, results: List[Dict[str, Any]], num_results: int
+) -> str:
+    """Format the first ``num_results`` hits as a markdown document."""
+    return "\n\n".join(
+        search_type.format_result(i + 1, result)
+        for i, result in enumerate(results[:num_results])
+    )
+
+
+def answer_box_text(answer_box: Dict[str, Any]) -> Optional[str]:
+    """Return the direct answer held in a SerpApi answer box, if any."""
+    if "answer" in answer_box:
+        return str(answer_box["answer"])
+    if "snippet" in answer_box:
+        return answer_box["snippet"]
+    if "snippet_highlighted_words" in answer_box:
+        return " ".join(answer_box["snippet_highlighted_words"])
+    return None
+
+
+def build_record(
+    position: int, result: Dict[str, Any], fields: Tuple[str, ...]
+) -> SearchRecord:
+    """Project a raw SerpApi hit onto the requested record fields."""
+    record: Dict[str, Any] = {}
+    for name in fields:
+        value = position if name == "position" else result.get(name)
+        if value is None:
+            continue
+        if name == "source" and isinstance(value, dict):
+            # google_news returns the source as an object
+            value = value.get("name")
+            if value is None:
+                continue
+        record[name] = value
+    return record
+
+
+async def answer_from_index(
+    log: CallLogger,
+    query: str,
+    num_results: int,
+    engine: str,
+    format_result: Callable[[int, Dict[str, Any]], str],
+) -> Optional[str]:
+    """Answer a query from the local index when recall is high enough.
+
+    Hits are formatted with the calling tool's ``format_result`` so the
+    answer looks the same whether it came from the index or from SerpApi.
+
+    Returns:
+        Formatted results, or None if too few indexed hits cover the query
+    """
+    app: AppContext = log.ctx.request_context.lifespan_context
+    if app.index is None:
+        return None
+    hits = [
+        hit
+        for hit in await app.index.search(query, limit=num_results, engine=engine)
+        if hit.coverage >= LOCAL_INDEX_MIN_COVERAGE
+    ]
+    if not hits or len(hits) < min(num_results, LOCAL_INDEX_MIN_HITS):
+        return None
+    app.index.local_answers += 1
+    await log.info("Answering from local index with %d results", len(hits))
+    return format_local_hits(hits, format_result)
+
+
+def format_for_engine(engine: str) -> Callable[[int, Dict[str, Any]], str]:
+    """Return the result formatter of the search type that uses ``engine``."""
+    for search_type in SEARCH_TYPES.values():
+        if search_type.params["engine"] == engine:
+            return search_type.format_result
+    return format_organic_result
+
+
+def format_local_hits(
+    hits: List[LocalHit],
+    format_result: Optional[Callable[[int, Dict[str, Any]], str]] = None,
+) -> str:
+    """Format local index hits like upstream results.
+
+    Without ``format_result`` each hit is formatted for the engine it was
+    fetched with, so news hits keep their source and date.
+    """
+    return "\n\n".join(
+        (format_result or format_for_engine(hit.document.engine))(
+            i + 1, hit.document.as_result()
+        )
+        for i, hit in enumerate(hits)
+    )
+
+
+async def render_results(
+    ctx: Context,
+    format_result: Callable[[int, Dict[str, Any]], str],
+    results: List[Dict[str, Any]],
+    stream: bool = False,
+) -> str:
+    """Format hits as markdown, optionally streaming each one as it is ready.
+
+    When ``stream`` is set, every formatted hit is sent to the client in a
+    progress notification before the next one is formatted, so the first
+    result arrives without waiting for the whole document. Clients that
+    did not request progress simply receive the final document.
+    """
+    formatted_results = []
+    for i, result in enumerate(results):
+        formatted = format_result(i + 1, result)
+        if stream:
+            await ctx.report_progress(i + 1, len(results), message=formatted)
+        formatted_results.append(formatted)
+    return "\n\n".join(formatted_results)
+
+
 @mcp.tool()
-async def general_search(query: str, num_results: int = DEFAULT_RESULTS_LIMIT) -> str:
+async def general_search(
+    query: str,
+    num_results: int = DEFAULT_RESULTS_LIMIT,
+    stream: bool = False,
+    use_local_index: bool = False,
+) -> str:
     """Perform a general web search using SerpApi.
     
     Args:
         query: Search query string
         num_results: Maximum number of results to return (default: 5)
+        stream: Also send each result as a progress notification as soon as
+            it is formatted (default: False)
+        use_local_index: Answer from previously fetched results when they
+            cover the query well enough (default: False)
         
     Returns:
         Formatted search results as markdown string
     """
     # Get context from FastMCP - it's injected automatically
     ctx = mcp.get_context()
-    await ctx.info(f"Performing general search for: {query} with {num_results} results")
+    log = CallLogger(ctx, log_policy)
+    await log.info(
+        "Performing general search for: %s with %d results", query, num_results
+    )
 
     try:
-        params = {
-            "q": query,
-            "num": num_results,
-            "engine": "google"
-        }
+        if use_local_index:
+            local_results = await answer_from_index(
+                log, query, num_results, "google", format_organic_result
+            )
+            if local_results is not None:
+                return local_results
 
-        response_data = await make_serpapi_request(ctx, params)
+        search_type = SEARCH_TYPES["general"]
+        params = build_search_params(search_type, query, num_results)
+
+        response_data = await make_serpapi_request(ctx, params, log)
         organic_results = response_data.get("organic_results", [])
         
         if not organic_results:
-            await ctx.info("No organic results found")
+            await log.info("No organic results found")
             return "No organic results found."
         
-        formatted_results = []
-        for i, result in enumerate(organic_results[:num_results]):
-            formatted_results.append(
-                f"## {i+1}. {result.get('title', 'No title')}\n"
-                f"**Link**: {result.get('link', 'No link')}\n"
-                f"**Snippet**: {result.get('snippet', 'No summary')}\n"
-            )
-        
-        await ctx.info(f"Found {len(organic_results)} organic results")
-        return "\n\n".join(formatted_results)
+        await log.info("Found %d organic results", len(organic_results))
+        return await render_results(
+            ctx, search_type.format_result, organic_results[:num_results], stream
+        )
         
     except Exception as e:
-        await ctx.error(f"Error performing general search: {str(e)}")
+        await log.error("Error performing general search: %s", e)
         return f"Error performing general search: {str(e)}"
+    finally:
+        await log.flush()
 
 @mcp.tool()
-async def news_search(query: str, num_results: int = DEFAULT_RESULTS_LIMIT) -> str:
+async def news_search(
+    query: str,
+    num_results: int = DEFAULT_RESULTS_LIMIT,
+    stream: bool = False,
+    use_local_index: bool = False,
+) -> str:
     """Perform a news search using SerpApi.
     
     Args:
         query: Search query string
         num_results: Maximum number of results to return (default: 5)
+        stream: Also send each result as a progress notification as soon as
+            it is formatted (default: False)
+        use_local_index: Answer from previously fetched results when they
+            cover the query well enough (default: False)
         
     Returns:
         Formatted news results as markdown string
     """
     ctx = mcp.get_context()
-    await ctx.info(f"Performing news search for: {query} with {num_results} results")
+    log = CallLogger(ctx, log_policy)
+    await log.info("Performing news search for: %s with %d results", query, num_results)
 
     try:
-        params = {
-            "q": query,
-            "num": num_results,
-            "engine": "google_news"
-        }
+        if use_local_index:
+            local_results = await answer_from_index(
+                log, query, num_results, "google_news", format_news_result
+            )
+            if local_results is not None:
+                return local_results
+
+        search_type = SEARCH_TYPES["news"]
+        params = build_search_params(search_type, query, num_results)
 
-        response_data = await make_serpapi_request(ctx, params)
+        response_data = await make_serpapi_request(ctx, params, log)
         news_results = response_data.get("news_results", [])
         
         if not news_results:
-            await ctx.info("No news results found")
+            await log.info("No news results found")
             return "No news results found."
         
-        formatted_results = []
-        for i, result in enumerate(news_results[:num_results]):
-            formatted_results.append(
-                f"## {i+1}. {result.get('title', 'No title')}\n"
-                f"**Source**: {result.get('source', 'No source')}\n"
-                f"**Date**: {result.get('date', 'No date')}\n"
-                f"**Link**: {result.get('link', 'No link')}\n"
-                f"**Snippet**: {result.get('snippet', 'No summary')}\n"
-            )
-        
-        await ctx.info(f"Found {len(news_results)} news results")
-        return "\n\n".join(formatted_results)
+        await log.info("Found %d news results", len(news_results))
+        return await render_results(
+            ctx, search_type.format_result, news_results[:num_results], stream
+        )
         
     except Exception as e:
-        await ctx.error(f"Error performing news search: {str(e)}")
+        await log.error("Error performing news search: %s", e)
         return f"Error performing news search: {str(e)}"
+    finally:
+        await log.flush()
 
 @mcp.tool()
-async def product_search(query: str, num_results: int = DEFAULT_RESULTS_LIMIT) -> str:
+async def product_search(
+    query: str, num_results: int = DEFAULT_RESULTS_LIMIT, stream: bool = False
+) -> str:
     """Perform a product search using SerpApi.
     
     Args:
         query: Search query string
         num_results: Maximum number of results to return (default: 5)
+        stream: Also send each result as a progress notification as soon as
+            it is formatted (default: False)
         
     Returns:
         Formatted product results as markdown string
     """
     ctx = mcp.get_context()
-    await ctx.info(f"Performing product search for: {query} with {num_results} results")
+    log = CallLogger(ctx, log_policy)
+    await log.info(
+        "Performing product search for: %s with %d results", query, num_results
+    )
 
     try:
-        params = {
-            "q": query,
-            "num": num_results,
-            "engine": "google_shopping",
-            "shopping_intent": "high"
-        }
+        search_type = SEARCH_TYPES["product"]
+        params = build_search_params(search_type, query, num_results)
 
-        response_data = await make_serpapi_request(ctx, params)
+        response_data = await make_serpapi_request(ctx, params, log)
         product_results = response_data.get("shopping_results", [])
         
         if not product_results:
-            await ctx.info("No product results found")
+            await log.info("No product results found")
             return "No product results found."
         
-        formatted_results = []
-        for i, result in enumerate(product_results[:num_results]):
-            formatted_results.append(
-                f"## {i+1}. {result.get('title', 'No title')}\n"
-                f"**Price**: {result.get('price', 'No price')}\n"
-                f"**Rating**: {result.get('rating', 'No rating')}\n"
-                f"({result.get('reviews', 'No reviews')})\n"
-                f"**Source**: {result.get('source', 'No source')}\n"
-                f"**Link**: {result.get('link', 'No link')}\n"
-            )
-        
-        await ctx.info(f"Found {len(product_results)} product results")
-        return "\n\n".join(formatted_results)
+        await log.info("Found %d product results", len(product_results))
+        return await render_results(
+            ctx, search_type.format_result, product_results[:num_results], stream
+        )
         
     except Exception as e:
-        await ctx.error(f"Error performing product search: {str(e)}")
+        await log.error("Error performing product search: %s", e)
         return f"Error performing product search: {str(e)}"
+    finally:
+        await log.flush()
+
+@mcp.tool()
+async def structured_search(
+    query: str,
+    search_type: StructuredSearchType = "general",
+    num_results: int = DEFAULT_RESULTS_LIMIT,
+    fields: Optional[List[str]] = None,
+) -> StructuredSearchResult:
+    """Perform a search and return typed records instead of markdown.
+
+    The records are returned as structured content, so callers can consume
+    them directly instead of parsing the markdown of the other tools. A
+    "qna" search returns the organic hits plus the answer box text, when
+    Google shows one, in ``answer``.
+    
+    Args:
+        query: Search query string
+        search_type: One of "general", "news", "product", "qna"
+            (default: "general")
+        num_results: Maximum number of results to return (default: 5)
+        fields: Record fields to include, e.g. ["title", "link"]; all fields
+            available for the search type when omitted
+        
+    Returns:
+        The query, search type, result count and one record per hit
+
+    Raises:
+        ValueError: If the search type or a requested field is unknown
+    """
+    ctx = mcp.get_context()
+    log = CallLogger(ctx, log_policy)
+
+    if search_type == "qna":
+        search_type_config = QNA_SEARCH_TYPE
+    else:
+        search_type_config = SEARCH_TYPES.get(search_type)
+    if search_type_config is None:
+        raise ValueError(
+            f"Unknown search type {search_type!r}; "
+            f"expected one of {[*SEARCH_TYPES, 'qna']}"
+        )
+    if fields is None:
+        selected_fields = search_type_config.record_fields
+    else:
+        unknown = [
+            name for name in fields if name not in search_type_config.record_fields
+        ]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields {unknown} for {search_type} search; "
+                f"available: {list(search_type_config.record_fields)}"
+            )
+        selected_fields = tuple(fields)
+
+    try:
+        await log.info("Performing structured %s search for: %s", search_type, query)
+        params = build_search_params(search_type_config, query, num_results)
+        response_data = await make_serpapi_request(ctx, params, log)
+    finally:
+        await log.flush()
+    results = response_data.get(search_type_config.results_key, [])[:num_results]
+
+    records = [
+        build_record(i + 1, result, selected_fields) for i, result in enumerate(results)
+    ]
+    structured: StructuredSearchResult = {
+        "query": query,
+        "search_type": search_type,
+        "count": len(records),
+        "results": records,
+        "answer": None,
+    }
+    if search_type_config is QNA_SEARCH_TYPE:
+        structured["answer"] = answer_box_text(response_data.get("answer_box") or {})
+    return structured
+
+@mcp.tool()
+async def batch_search(
+    queries: List[str],
+    search_types: Optional[List[str]] = None,
+    num_results: int = DEFAULT_RESULTS_LIMIT,
+    max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    stream: bool = False,
+) -> str:
+    """Run many searches concurrently and return all results in one response.
+
+    Every query is run against every requested search type. Requests run
+    with bounded concurrency and share the server-wide SerpApi rate limit;
+    a failing search is reported in its own section without affecting the
+    others.
+    
+    Args:
+        queries: Search query strings
+        search_types: Any of "general", "news", "product" (default: ["general"])
+        num_results: Maximum number of results per search (default: 5)
+        max_concurrency: Maximum searches in flight at once (default: 5)
+        stream: Also send each section as a progress notification as soon as
+            its search finishes, in completion order (default: False)
+        
+    Returns:
+        One markdown section per (search type, query) pair, in request order
+    """
+    ctx = mcp.get_context()
+    log = CallLogger(ctx, log_policy)
+    search_types = search_types or ["general"]
+
+    unknown = [name for name in search_types if name not in SEARCH_TYPES]
+    if unknown:
+        return f"Error performing batch search: unknown search types {unknown}"
+    jobs = [(name, query) for query in queries for name in search_types]
+    if not jobs:
+        return "No queries to search."
+    if len(jobs) > MAX_BATCH_SEARCHES:
+        return (
+            "Error performing batch search: "
+            f"at most {MAX_BATCH_SEARCHES} searches per batch"
+        )
+
+    concurrency = max(1, min(max_concurrency, MAX_BATCH_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = 0
+
+    async def search_job(name: str, query: str) -> Tuple[str, bool]:
+        search_type = SEARCH_TYPES[name]
+        heading = f"# [{name}] {query}"
+        async with semaphore:
+            try:
+                params = build_search_params(search_type, query, num_results)
+                response_data = await make_serpapi_request(ctx, params, log)
+            except Exception as e:
+                return f"{heading}\n**Error**: {str(e)}", False
+        results = response_data.get(search_type.results_key, [])
+        if not results:
+            return f"{heading}\nNo {search_type.label} results found.", True
+        return f"{heading}\n\n{format_results(search_type, results, num_results)}", True
+
+    async def run_job(name: str, query: str) -> Tuple[str, bool]:
+        nonlocal completed
+        section, ok = await search_job(name, query)
+        completed += 1
+        if stream:
+            await ctx.report_progress(completed, len(jobs), message=section)
+        return section, ok
+
+    try:
+        await log.info(
+            "Performing batch search: %d searches, concurrency %d",
+            len(jobs),
+            concurrency,
+        )
+        outcomes = await asyncio.gather(*(run_job(name, query) for name, query in jobs))
+        failed = sum(not ok for _, ok in outcomes)
+        await log.info(
+            "Batch search finished: %d succeeded, %d failed",
+            len(jobs) - failed,
+            failed,
+        )
+        return "\n\n".join(section for section, _ in outcomes)
+    finally:
+        await log.flush()
 
 @mcp.tool()
-async def qna(question: str) -> str:
+async def qna(
+    question: str, stream: bool = False, use_local_index: bool = False
+) -> str:
     """Perform a question and answer search using SerpApi.
     
     Args:
         question: Question to search for
+        stream: Also send each listed result as a progress notification as
+            soon as it is formatted (default: False)
+        use_local_index: Answer from previously fetched results when they
+            cover the question well enough (default: False)
         
     Returns:
         Answer or related information as markdown string
     """
     ctx = mcp.get_context()
-    await ctx.info(f"Performing Q&A search for: {question}")
+    log = CallLogger(ctx, log_policy)
+    await log.info("Performing Q&A search for: %s", question)
 
     try:
+        if use_local_index:
+            local_results = await answer_from_index(
+                log, question, 5, "google", format_organic_result
+            )
+            if local_results is not None:
+                return local_results
+
         params = {
             "q": question,
             "engine": "google",
         }
 
-        response_data = await make_serpapi_request(ctx, params)
+        response_data = await make_serpapi_request(ctx, params, log)
 
         # Check for direct answer
         answer_results = response_data.get("answer_box", {})
         if answer_results:
-            await ctx.info("Found direct answer")
-            if "answer" in answer_results:
-                return f"**Answer**: {answer_results['answer']}\n\n"
-            elif "snippet" in answer_results:
-                return f"**Answer**: {answer_results['snippet']}\n\n"
-            elif "snippet_highlighted_words" in answer_results:
-                return f"**Answer**: {' '.join(answer_results['snippet_highlighted_words'])}\n\n"
+            await log.info("Found direct answer")
+            answer = answer_box_text(answer_results)
+            if answer is not None:
+                return f"**Answer**: {answer}\n\n"
         
         # Check knowledge graph
         knowledge_results = response_data.get("knowledge_graph", {})
         if knowledge_results and "description" in knowledge_results:
-            await ctx.info("Found knowledge graph information")
+            await log.info("Found knowledge graph information")
             return f"**Description**: {knowledge_results['description']}\n\n"
         
         # Check featured snippet
         if "featured_snippet" in response_data:
             featured_snippet = response_data["featured_snippet"]
             if "text" in featured_snippet:
-                await ctx.info("Found featured snippet")
+                await log.info("Found featured snippet")
                 return f"**Featured Snippet**: {featured_snippet['text']}\n\n"
         
         # Related questions
         related_questions = response_data.get("related_questions", [])
         if related_questions:
-            await ctx.info("Found related questions")
-            formatted_questions = []
-            for i, question in enumerate(related_questions):
-                formatted_questions.append(
-                    f"## {i+1}. {question.get('question', 'No question')}\n"
-                    f"**Link**: {question.get('link', 'No link')}\n"
-                )
-            return "\n\n".join(formatted_questions)
+            await log.info("Found related questions")
+            return await render_results(
+                ctx, format_related_question, related_questions, stream
+            )
         
         # Fallback to organic results
         organic_results = response_data.get("organic_results", [])
         if organic_results:
-            await ctx.info("Found organic results")
-            formatted_results = []
-            for i, result in enumerate(organic_results[:5]):
-                formatted_results.append(
-                    f"## {i+1}. {result.get('title', 'No title')}\n"
-                    f"**Link**: {result.get('link', 'No link')}\n"
-                    f"**Snippet**: {result.get('snippet', 'No summary')}\n"
-                )
-            return "\n\n".join(formatted_results)
+            await log.info("Found organic results")
+            return await render_results(
+                ctx, format_organic_result, organic_results[:5], stream
+            )
             
         return "No results found for the question."
         
     except Exception as e:
-        await ctx.error(f"Error performing Q&A search: {str(e)}")
+        await log.error("Error performing Q&A search: %s", e)
         return f"Error performing Q&A search: {str(e)}"
+    finally:
+        await log.flush()
+
+@mcp.tool()
+async def local_search(query: str, num_results: int = DEFAULT_RESULTS_LIMIT) -> str:
+    """Search previously fetched results in the local index without calling SerpApi.
+
+    The index holds titles, snippets and links returned by earlier general,
+    news and Q&A searches, ranked with BM25.
+    
+    Args:
+        query: Search query string
+        num_results: Maximum number of results to return (default: 5)
+        
+    Returns:
+        Formatted search results as markdown string
+    """
+    ctx = mcp.get_context()
+    log = CallLogger(ctx, log_policy)
+    app: AppContext = ctx.request_context.lifespan_context
+    if app.index is None:
+        return "Local index is disabled."
+
+    hits = await app.index.search(query, limit=num_results)
+    await log.info("Local search for: %s found %d results", query, len(hits))
+    await log.flush()
+    if not hits:
+        return "No local results found."
+    return format_local_hits(hits)
+
+@mcp.resource("cache://stats")
+def cache_stats() -> str:
+    """Report cache, coalescing, upstream, local index and logging counters as JSON."""
+    app: AppContext = mcp.get_context().request_context.lifespan_context
+    stats: Dict[str, Any] = {"enabled": app.cache is not None}
+    if app.cache is not None:
+        stats.update(app.cache.snapshot())
+    stats["requests"] = app.inflight.snapshot()
+    stats["rate_limit"] = app.rate_limiter.snapshot()
+    stats["upstream"] = {
+        **app.upstream_stats.snapshot(),
+        "latency": app.latency.snapshot(),
+        "circuit_breaker": app.breaker.snapshot(),
+    }
+    if app.index is not None:
+        stats["local_index"] = app.index.snapshot()
+    stats["client_logging"] = log_policy.snapshot()
+    return json.dumps(stats, indent=2)
 
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+# The LLM_dual example is a script directory; its modules import each other
+# by bare name (``from intent_router import router``).
+sys.path.insert(
+    0,
+    str(
+        Path(__file__).resolve().parents[2] / "mcp_cliente_servidor_local" / "LLM_dual"
+    ),
+)
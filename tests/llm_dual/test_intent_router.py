@@ -0,0 +1,58 @@
+import pytest
+from intent_router import TOOL_NAME, IntentRouter, normalize
+
+
+def test_normalize_strips_accents_and_punctuation():
+    assert normalize("¿Horóscopo de Géminis?") == ["horoscopo", "de", "geminis"]
+
+
+@pytest.mark.parametrize(
+    ("message", "sign"),
+    [
+        ("horóscopo de aries", "Aries"),
+        ("¿Qué dice mi horóscopo? Soy Tauro", "Tauro"),
+        ("predicción para géminis hoy", "Géminis"),
+        ("mi signo es escorpio", "Escorpio"),
+        ("quiero saber mi horóscopo de leo", "Leo"),
+        ("qué me depara hoy el horóscopo de cáncer", "Cáncer"),
+        ("libra", "Libra"),
+        ("y para piscis?", "Piscis"),
+        ("horoscope for pisces", "Piscis"),
+    ],
+)
+def test_clear_horoscope_requests_take_the_fast_path(message, sign):
+    assert IntentRouter().classify(message) == sign
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "leo un libro",
+        "cáncer de piel",
+        "el precio de la libra hoy",
+        "cancer de piel hoy",
+        "hoy leo un libro",
+        "que me depara el cancer de mama",
+        "que suerte tengo, leo",
+        "horóscopo de aries y tauro",
+        "hola, ¿cómo estás?",
+        "",
+    ],
+)
+def test_ambiguous_messages_go_to_the_llm(message):
+    assert IntentRouter().classify(message) is None
+
+
+def test_route_returns_the_tool_call_and_counts_hits():
+    router = IntentRouter()
+    assert router.route("horóscopo de virgo") == {
+        "tool": TOOL_NAME,
+        "arguments": {"sign": "Virgo"},
+    }
+    assert router.route("leo un libro") is None
+    assert router.stats.summary() == {
+        "total": 2,
+        "fast_path": 1,
+        "llm": 1,
+        "hit_rate": 0.5,
+    }
@@ -0,0 +1,54 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openai")
+
+import llm  # noqa: E402
+
+
+class FakeCompletions:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        content = json.dumps({"response": "hola"})
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    fake = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=fake))
+    monkeypatch.setattr(llm, "AsyncOpenAI", lambda **kwargs: client)
+    monkeypatch.setattr(llm, "LLM_MAX_CONCURRENCY", 2)
+    return fake
+
+
+def test_llm_calls_work_across_event_loops(completions):
+    async def burst():
+        # More calls than the semaphore allows, so some of them wait on it
+        return await asyncio.gather(
+            *(llm.interpret_with_gpt(f"mensaje {n}") for n in range(5))
+        )
+
+    # A second asyncio.run() must not reuse the first loop's semaphore
+    for _ in range(2):
+        assert asyncio.run(burst()) == [{"response": "hola"}] * 5
+    assert completions.peak == 2
+
+
+def test_each_loop_gets_its_own_client_and_semaphore(completions):
+    async def resources():
+        return llm.llm_resources()
+
+    first, second = asyncio.run(resources()), asyncio.run(resources())
+    assert first[1] is not second[1]
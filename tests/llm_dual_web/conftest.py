@@ -0,0 +1,30 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+WEB_DIR = (
+    Path(__file__).resolve().parents[2] / "mcp_cliente_servidor_local" / "LLM_dual_web"
+)
+
+# LLM_dual and LLM_dual_web are script directories with modules of the same
+# name (llm, intent_router), so each test imports them fresh from here.
+EXAMPLE_MODULES = ("client", "llm", "intent_router")
+
+
+@pytest.fixture
+def web_client(monkeypatch):
+    pytest.importorskip("mcp")
+    pytest.importorskip("openai")
+    monkeypatch.setenv("OPEN_API_KEY", "test-key")
+    monkeypatch.syspath_prepend(str(WEB_DIR))
+    saved = {
+        name: sys.modules.pop(name) for name in EXAMPLE_MODULES if name in sys.modules
+    }
+    try:
+        yield importlib.import_module("client")
+    finally:
+        for name in EXAMPLE_MODULES:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
@@ -0,0 +1,94 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp import StdioServerParameters  # noqa: E402
+from mcp.types import CallToolResult, TextContent  # noqa: E402
+
+
+def tool_result(text, structured=None, is_error=False):
+    return CallToolResult(
+        content=[TextContent(type="text", text=text)],
+        structuredContent=structured,
+        isError=is_error,
+    )
+
+
+class FakeSession:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    async def call_tool(self, name, arguments=None):
+        self.calls.append((name, arguments))
+        return self.result
+
+
+def collect(agen):
+    async def scenario():
+        return [event async for event in agen]
+
+    return asyncio.run(scenario())
+
+
+def test_tool_result_text_prefers_structured_content(web_client):
+    result = tool_result("texto", structured={"result": "estructurado"})
+    assert web_client.tool_result_text(result) == "estructurado"
+
+
+def test_tool_result_text_falls_back_to_text_content(web_client):
+    assert web_client.tool_result_text(tool_result("solo texto")) == "solo texto"
+
+
+def test_tool_errors_are_reported_instead_of_raising(web_client):
+    session = FakeSession(tool_result("Unknown tool: obtener_horoscopo", is_error=True))
+
+    reply = asyncio.run(web_client.process_message(session, "horóscopo de leo"))
+    assert reply == "❌ La herramienta falló: Unknown tool: obtener_horoscopo"
+    assert session.calls == [("obtener_horoscopo", {"sign": "Leo"})]
+
+    events = collect(web_client.stream_message_events(session, "horóscopo de leo"))
+    assert events[-2:] == [("result", {"text": reply}), ("done", {"response": reply})]
+
+
+def test_session_pool_serves_concurrent_calls(web_client):
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(Path(web_client.__file__).parent / "server.py")],
+    )
+
+    async def scenario():
+        pool = web_client.SessionPool(params, size=2)
+        await pool.start()
+        try:
+            return await asyncio.gather(
+                *(
+                    pool.call_tool("obtener_horoscopo", {"sign": "aries"})
+                    for _ in range(4)
+                )
+            )
+        finally:
+            await pool.close()
+
+    results = asyncio.run(scenario())
+    assert all(
+        web_client.tool_result_text(result).startswith("El horóscopo de hoy para Aries")
+        for result in results
+    )
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["el precio de la libra hoy", "cancer de piel hoy", "hoy leo un libro"],
+)
+def test_web_router_sends_ordinary_sentences_to_the_llm(web_client, message):
+    assert (
+        Path(sys.modules["intent_router"].__file__).parent
+        == Path(web_client.__file__).parent
+    )
+    assert web_client.router.classify(message) is None
+    assert web_client.router.classify("horóscopo de leo") == "Leo"
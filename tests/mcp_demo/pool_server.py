@@ -0,0 +1,23 @@
+"""Minimal stdio MCP server used by the session pool tests."""
+
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("PoolTestServer")
+
+
+@mcp.tool()
+def pid() -> int:
+    """Return the server process id."""
+    return os.getpid()
+
+
+@mcp.tool()
+def crash() -> None:
+    """Terminate the server process without answering."""
+    os._exit(1)
+
+
+if __name__ == "__main__":
+    mcp.run()
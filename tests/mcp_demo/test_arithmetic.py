@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from mcp_demo.arithmetic import (  # noqa: E402
+    FLOAT64_EXACT_LIMIT,
+    INT64_SAFE_LIMIT,
+    batch_apply,
+    batch_calculate,
+)
+
+INT64_MAX = 2**63 - 1
+
+
+def test_vectorized_results_match_python_operators():
+    a, b = [1, -7, 12, 0], [2, 3, -4, 5]
+    assert batch_apply("add", a, b) == [3, -4, 8, 5]
+    assert batch_apply("subtract", a, b) == [-1, -10, 16, -5]
+    assert batch_apply("multiply", a, b) == [2, -21, -48, 0]
+    assert batch_apply("divide", a, b) == [x / y for x, y in zip(a, b)]
+
+
+def test_int64_overflow_falls_back_to_python_integers():
+    assert batch_apply("add", [INT64_MAX, 1], [1, 1]) == [2**63, 2]
+    assert batch_apply("subtract", [-INT64_MAX], [2]) == [-(2**63) - 1]
+
+
+def test_multiplication_near_the_safe_limit_is_exact():
+    root = int(INT64_SAFE_LIMIT**0.5)
+    # Just under the limit stays on NumPy, just over falls back; both exact
+    assert batch_apply("multiply", [root - 1, root], [root, root + 1]) == [
+        (root - 1) * root,
+        root * (root + 1),
+    ]
+    assert batch_apply("multiply", [3037000500], [3037000500]) == [3037000500**2]
+
+
+def test_operands_beyond_int64_are_supported():
+    assert batch_apply("add", [2**70, 5], [1, 5]) == [2**70 + 1, 10]
+
+
+def test_division_beyond_float64_exact_range_matches_scalar_division():
+    a = FLOAT64_EXACT_LIMIT + 1
+    # float(a) / 3 rounds twice and differs from the correctly rounded a / 3
+    assert float(a) / 3 != a / 3
+    assert batch_apply("divide", [a, 10], [3, 4]) == [a / 3, 2.5]
+
+
+def test_division_by_zero_returns_zero_like_divide():
+    assert batch_apply("divide", [5, 6, 0], [0, 3, 0]) == [0, 2.0, 0]
+    assert batch_apply("divide", [2**70], [0]) == [0]
+
+
+def test_empty_columns():
+    assert batch_apply("add", [], []) == []
+    assert batch_calculate([], [], []) == []
+
+
+def test_length_mismatch_raises_value_error():
+    with pytest.raises(ValueError, match="same length"):
+        batch_apply("add", [1, 2], [1])
+    with pytest.raises(ValueError, match="same length"):
+        batch_calculate(["add"], [1, 2], [1, 2])
+
+
+def test_unknown_operation_raises_value_error():
+    with pytest.raises(ValueError, match="Unknown operation 'power'"):
+        batch_apply("power", [1], [2])
+    with pytest.raises(ValueError, match="at row 1"):
+        batch_calculate(["add", "power"], [1, 2], [3, 4])
+
+
+def test_batch_calculate_preserves_row_order_across_mixed_ops():
+    ops = ["multiply", "add", "divide", "add", "subtract", "divide", "multiply"]
+    a = [3, 1, 9, 2**63 - 1, 10, 4, 2**40]
+    b = [4, 2, 3, 1, 20, 0, 2**40]
+
+    assert batch_calculate(ops, a, b) == [12, 3, 3.0, 2**63, -10, 0, 2**80]
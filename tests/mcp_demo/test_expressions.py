@@ -0,0 +1,111 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from mcp_demo.expressions import (  # noqa: E402
+    MAX_EXPRESSION_DEPTH,
+    MAX_EXPRESSION_LENGTH,
+    compile_expression,
+)
+
+
+def evaluate(source, *bindings):
+    return compile_expression(source).evaluate(list(bindings) or [{}])
+
+
+def test_arithmetic_follows_operator_precedence():
+    assert evaluate("(a + b) * c / d", {"a": 1, "b": 2, "c": 4, "d": 3}) == [4.0]
+    assert evaluate("-2 + 3 * 4") == [10.0]
+
+
+def test_bindings_are_evaluated_row_by_row():
+    assert evaluate("x * 2 + y", {"x": 1, "y": 0}, {"x": 2, "y": 1}) == [2.0, 5.0]
+
+
+def test_division_by_zero_returns_zero_like_divide():
+    assert evaluate("a / b", {"a": 5, "b": 0}, {"a": 6, "b": 3}) == [0.0, 2.0]
+
+
+def test_allowed_functions():
+    assert evaluate("max(1, x, 3)", {"x": 7}) == [7.0]
+    assert evaluate("min(4, 2)") == [2.0]
+    assert evaluate("abs(-2) + floor(1.5) + ceil(1.5) + round(2.4)") == [7.0]
+
+
+def test_non_finite_results_are_none():
+    assert evaluate("sqrt(x)", {"x": -1}, {"x": 9}) == [None, 3.0]
+    assert evaluate("1e400") == [None]
+
+
+def test_empty_bindings_return_no_results():
+    assert compile_expression("x + 1").evaluate([]) == []
+
+
+def test_variables_are_reported_sorted():
+    assert compile_expression("b + a * b").variables == ("a", "b")
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "__import__('os')",
+        "x.real",
+        "x ** 2",
+        "x // 2",
+        "sqrt(x=1)",
+        "min(1)",
+        "sqrt(1, 2)",
+        "True + 1",
+        "'a' + 'b'",
+        "[1, 2]",
+        "lambda: 1",
+        "1 +",
+    ],
+)
+def test_unsupported_expressions_are_rejected(source):
+    with pytest.raises(ValueError):
+        compile_expression(source)
+
+
+def test_length_and_depth_limits():
+    with pytest.raises(ValueError, match="longer"):
+        compile_expression("1" * (MAX_EXPRESSION_LENGTH + 1))
+    with pytest.raises(ValueError, match="nested"):
+        compile_expression("-" * (MAX_EXPRESSION_DEPTH + 2) + "1")
+    with pytest.raises(ValueError, match="nested"):
+        depth = MAX_EXPRESSION_DEPTH + 2
+        compile_expression("(1 + " * depth + "1" + ")" * depth)
+
+
+def test_long_flat_sums_are_not_limited_by_depth():
+    assert evaluate("1+" * 60 + "1") == [61.0]
+
+    names = [f"a{n}" for n in range(1, 53)]
+    binding = {name: 1 for name in names}
+    assert evaluate(" + ".join(names), binding) == [52.0]
+
+    longest = "1+" * ((MAX_EXPRESSION_LENGTH - 1) // 2) + "1"
+    assert len(longest) <= MAX_EXPRESSION_LENGTH
+    assert evaluate(longest) == [(MAX_EXPRESSION_LENGTH + 1) // 2]
+
+
+def test_huge_integer_literal_raises_value_error():
+    with pytest.raises(ValueError, match="too large"):
+        compile_expression("9" * 400)
+
+
+def test_huge_variable_value_raises_value_error():
+    with pytest.raises(ValueError, match="too large"):
+        compile_expression("x + 1").evaluate([{"x": 10**400}])
+
+
+def test_missing_variable_names_the_rows():
+    with pytest.raises(ValueError, match=r"'y'.*\[1\]"):
+        compile_expression("x + y").evaluate([{"x": 1, "y": 2}, {"x": 1}])
+
+
+def test_compiled_expressions_are_cached():
+    compile_expression.cache_clear()
+    first = compile_expression("a + 1")
+    assert compile_expression("a + 1") is first
+    assert compile_expression.cache_info().hits == 1
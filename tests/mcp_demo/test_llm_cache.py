@@ -0,0 +1,55 @@
+from mcp_demo.llm_cache import LLMSelectionCache, make_llm_cache_key
+
+FUNCTIONS = [{"type": "function", "function": {"name": "add"}}]
+CALLS = [{"name": "add", "args": {"a": 1, "b": 2}}]
+
+
+def test_key_depends_on_every_input():
+    key = make_llm_cache_key("model", "system", "prompt", FUNCTIONS)
+    assert key == make_llm_cache_key("model", "system", "prompt", FUNCTIONS)
+    assert key != make_llm_cache_key("other", "system", "prompt", FUNCTIONS)
+    assert key != make_llm_cache_key("model", "other", "prompt", FUNCTIONS)
+    assert key != make_llm_cache_key("model", "system", "other", FUNCTIONS)
+    assert key != make_llm_cache_key("model", "system", "prompt", [])
+
+
+def test_results_persist_across_instances(tmp_path):
+    path = tmp_path / "cache" / "selections.sqlite3"
+    writer = LLMSelectionCache(path)
+    writer.set("key", CALLS)
+    writer.close()
+
+    reader = LLMSelectionCache(path)
+    assert reader.get("key") == CALLS
+    assert reader.get("missing") is None
+    assert reader.snapshot()["hits"] == 1
+    assert reader.snapshot()["misses"] == 1
+    reader.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("mcp_demo.llm_cache.time.time", lambda: now[0])
+    cache = LLMSelectionCache(tmp_path / "selections.sqlite3", max_entries=2)
+
+    for key in ("a", "b"):
+        now[0] += 1
+        cache.set(key, CALLS)
+    now[0] += 1
+    cache.get("a")
+    now[0] += 1
+    cache.set("c", CALLS)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == CALLS
+    assert cache.get("c") == CALLS
+    assert cache.stats.evictions == 1
+    cache.close()
+
+
+def test_clear_removes_everything(tmp_path):
+    cache = LLMSelectionCache(tmp_path / "selections.sqlite3")
+    cache.set("key", CALLS)
+    cache.clear()
+    assert cache.snapshot()["entries"] == 0
+    cache.close()
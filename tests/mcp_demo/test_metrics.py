@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp import types  # noqa: E402
+from mcp.server.fastmcp import FastMCP  # noqa: E402
+
+from mcp_demo.metrics import HandlerMetrics, ServerMetrics, instrument  # noqa: E402
+
+
+def test_percentiles_come_from_buckets_and_never_exceed_the_max():
+    metrics = HandlerMetrics(kind="tool", name="add")
+    for seconds in (0.0004, 0.0004, 0.0004, 0.003):
+        metrics.observe(seconds, error=False)
+    assert metrics.percentile(0.5) == 0.001
+    assert metrics.percentile(0.99) == 0.003
+    assert HandlerMetrics(kind="tool", name="idle").percentile(0.5) is None
+
+
+def test_prometheus_histogram_is_cumulative():
+    registry = ServerMetrics("Demo")
+    registry.handler("tool", "add").observe(0.002, error=True)
+    text = registry.prometheus()
+    labels = 'server="Demo",kind="tool",name="add"'
+    assert f"mcp_requests_total{{{labels}}} 1" in text
+    assert f"mcp_request_errors_total{{{labels}}} 1" in text
+    assert f'mcp_request_duration_seconds_bucket{{{labels},le="0.001"}} 0' in text
+    assert f'mcp_request_duration_seconds_bucket{{{labels},le="0.0025"}} 1' in text
+    assert f'mcp_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+
+
+def test_instrumented_server_records_tool_calls_and_resource_reads():
+    mcp = FastMCP("Demo")
+
+    @mcp.tool()
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    @mcp.resource("greeting://{name}")
+    def greeting(name: str) -> str:
+        return f"Hello, {name}!"
+
+    metrics = instrument(mcp)
+    handlers = mcp._mcp_server.request_handlers
+
+    # Drive the wrapped request handlers the way a client request would
+    async def via_handlers():
+        await handlers[types.CallToolRequest](
+            types.CallToolRequest(
+                method="tools/call",
+                params=types.CallToolRequestParams(
+                    name="add", arguments={"a": 1, "b": 2}
+                ),
+            )
+        )
+        await handlers[types.ReadResourceRequest](
+            types.ReadResourceRequest(
+                method="resources/read",
+                params=types.ReadResourceRequestParams(uri="greeting://Ana"),
+            )
+        )
+        return await handlers[types.ReadResourceRequest](
+            types.ReadResourceRequest(
+                method="resources/read",
+                params=types.ReadResourceRequestParams(uri="metrics://server"),
+            )
+        )
+
+    result = asyncio.run(via_handlers())
+    snapshot = json.loads(result.root.contents[0].text)
+    calls = {(h["kind"], h["name"]): h["calls"] for h in snapshot["handlers"]}
+    assert calls[("tool", "add")] == 1
+    assert calls[("resource", "greeting://")] == 1
+    assert metrics.handler("resource", "metrics://").calls == 1
@@ -0,0 +1,78 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp import StdioServerParameters  # noqa: E402
+
+from mcp_demo.session_pool import SessionPool  # noqa: E402
+
+SERVER = StdioServerParameters(
+    command=sys.executable, args=[str(Path(__file__).with_name("pool_server.py"))]
+)
+
+
+def run(coro, timeout=60):
+    return asyncio.run(asyncio.wait_for(coro, timeout))
+
+
+def server_pid(result):
+    return int(result.content[0].text)
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        SessionPool(SERVER, size=0)
+
+
+def test_concurrent_calls_share_the_warm_sessions():
+    async def scenario():
+        async with SessionPool(SERVER, size=2) as pool:
+            results = await asyncio.gather(*(pool.call_tool("pid") for _ in range(6)))
+            return {server_pid(result) for result in results}, pool.snapshot()
+
+    pids, snapshot = run(scenario())
+    assert 1 <= len(pids) <= 2
+    assert snapshot["checkouts"] == 6
+    assert snapshot["idle"] == 2
+
+
+def test_dead_session_is_respawned():
+    async def scenario():
+        # health_check_interval=0 pings every session before handing it out
+        async with SessionPool(SERVER, size=1, health_check_interval=0) as pool:
+            before = server_pid(await pool.call_tool("pid"))
+            try:
+                await asyncio.wait_for(pool.call_tool("crash"), 10)
+            except Exception:
+                pass
+            after = server_pid(await pool.call_tool("pid"))
+            return before, after, pool.stats
+
+    before, after, stats = run(scenario())
+    assert before != after
+    assert stats.respawns == 1
+
+
+def test_start_failure_raises_and_closed_pool_refuses_checkout():
+    broken = StdioServerParameters(
+        command=sys.executable, args=["-c", "import sys; sys.exit(1)"]
+    )
+
+    async def start_broken():
+        await SessionPool(broken, size=1, start_timeout=10).start()
+
+    with pytest.raises(RuntimeError):
+        run(start_broken())
+
+    async def use_closed():
+        pool = SessionPool(SERVER, size=1)
+        await pool.start()
+        await pool.close()
+        await pool.call_tool("pid")
+
+    with pytest.raises(RuntimeError, match="closed"):
+        run(use_closed())
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp.types import (  # noqa: E402
+    ListToolsResult,
+    ServerNotification,
+    Tool,
+    ToolListChangedNotification,
+)
+
+from mcp_demo.tool_catalog import ToolCatalog  # noqa: E402
+
+SCHEMA = {"type": "object", "properties": {"a": {"type": "number"}}, "required": ["a"]}
+
+TOOLS = [
+    Tool(name="add", description="Add two numbers", inputSchema=SCHEMA),
+    Tool(name="subtract", description="Subtract b from a", inputSchema=SCHEMA),
+    Tool(name="multiply", description="Multiply two numbers", inputSchema=SCHEMA),
+    Tool(name="divide", description="Divide a by b", inputSchema=SCHEMA),
+    Tool(name="batch_add", description="Add many pairs at once", inputSchema=SCHEMA),
+    Tool(name="batch_subtract", description="Subtract many pairs", inputSchema=SCHEMA),
+    Tool(name="batch_multiply", description="Multiply many pairs", inputSchema=SCHEMA),
+    Tool(name="batch_divide", description="Divide many pairs", inputSchema=SCHEMA),
+    Tool(name="batch_calculate", description="Mixed operations", inputSchema=SCHEMA),
+    Tool(name="evaluate", description="Evaluate an expression", inputSchema=SCHEMA),
+]
+
+
+class FakeSession:
+    """Serves TOOLS three per page, like a paginating server."""
+
+    def __init__(self, tools=TOOLS, page_size=3):
+        self.tools = list(tools)
+        self.page_size = page_size
+        self.calls = 0
+
+    async def list_tools(self, cursor=None):
+        self.calls += 1
+        start = int(cursor or 0)
+        end = start + self.page_size
+        next_cursor = str(end) if end < len(self.tools) else None
+        return ListToolsResult(tools=self.tools[start:end], nextCursor=next_cursor)
+
+
+def names(schemas):
+    return [schema["function"]["name"] for schema in schemas]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_tools_are_fetched_once_across_pages():
+    session = FakeSession()
+    catalog = ToolCatalog(session)
+
+    async def scenario():
+        first = await catalog.tools()
+        second = await catalog.schemas()
+        return first, second
+
+    tools, schemas = run(scenario())
+    assert [tool.name for tool in tools] == [tool.name for tool in TOOLS]
+    assert schemas[0]["function"]["parameters"]["required"] == ["a"]
+    assert session.calls == 4
+    assert catalog.snapshot() == {
+        "cached": True,
+        "tools": 10,
+        "fetches": 1,
+        "invalidations": 0,
+    }
+
+
+def test_list_changed_notification_invalidates_the_cache():
+    session = FakeSession()
+    catalog = ToolCatalog(session)
+    notification = ServerNotification(
+        ToolListChangedNotification(method="notifications/tools/list_changed")
+    )
+
+    async def scenario():
+        await catalog.tools()
+        session.tools = session.tools[:1]
+        await catalog.handle_message(notification)
+        return await catalog.tools()
+
+    assert [tool.name for tool in run(scenario())] == ["add"]
+    assert catalog.fetches == 2
+    assert catalog.invalidations == 1
+
+
+def test_select_ranks_name_matches_first():
+    catalog = ToolCatalog(FakeSession())
+    selected = run(catalog.select("multiply 3 by 4", limit=2))
+    assert names(selected) == ["multiply", "batch_multiply"]
+
+
+def test_select_fills_the_budget_with_unmatched_tools():
+    catalog = ToolCatalog(FakeSession())
+
+    # Names "evaluate" but also needs divide, which the prompt does not mention
+    selected = names(run(catalog.select("evaluate x over y")))
+    assert selected[0] == "evaluate"
+    assert "divide" in selected
+    assert len(selected) == 8
+
+    selected = run(catalog.select("evaluate x over y", limit=4))
+    assert names(selected) == ["evaluate", "add", "subtract", "multiply"]
+
+    async def scenario():
+        entries = await catalog.entries()
+        budget = len(entries[-1].serialized) + len(entries[0].serialized)
+        return await catalog.select("evaluate x over y", max_chars=budget)
+
+    assert names(run(scenario())) == ["evaluate", "add"]
+
+
+def test_select_without_matches_returns_every_tool():
+    catalog = ToolCatalog(FakeSession())
+    selected = run(catalog.select("hello there", limit=3))
+    assert names(selected) == [tool.name for tool in TOOLS]
+
+
+def test_select_respects_the_character_budget():
+    catalog = ToolCatalog(FakeSession())
+
+    async def scenario():
+        entries = await catalog.entries()
+        budget = len(entries[0].serialized) + 1
+        return await catalog.select("unrelated prompt", max_chars=budget)
+
+    assert names(run(scenario())) == ["add"]
+
+
+def test_unbound_catalog_raises():
+    with pytest.raises(RuntimeError):
+        run(ToolCatalog().tools())
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from mcp.types import CallToolResult, TextContent  # noqa: E402
+
+from mcp_demo.tool_dispatch import dispatch_tool_calls  # noqa: E402
+
+
+class FakeCaller:
+    """call_tool double: ``sleep`` waits, ``fail`` raises, ``bad`` returns isError."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def call_tool(self, name, arguments=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(arguments.get("seconds", 0.01))
+            if name == "fail":
+                raise RuntimeError("boom")
+            return CallToolResult(
+                content=[TextContent(type="text", text=f"{name}:{arguments}")],
+                isError=name == "bad",
+            )
+        finally:
+            self.in_flight -= 1
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_outcomes_keep_the_call_order():
+    calls = [
+        {"name": "slow", "args": {"seconds": 0.05}},
+        {"name": "fast", "args": {"seconds": 0.0}},
+    ]
+    outcomes = run(dispatch_tool_calls(FakeCaller(), calls))
+    assert [outcome.name for outcome in outcomes] == ["slow", "fast"]
+    assert all(outcome.ok for outcome in outcomes)
+    assert outcomes[1].text == "fast:{'seconds': 0.0}"
+
+
+def test_concurrency_is_capped():
+    caller = FakeCaller()
+    calls = [{"name": "add", "args": {"seconds": 0.02}} for _ in range(10)]
+    run(dispatch_tool_calls(caller, calls, max_concurrency=3))
+    assert caller.peak == 3
+
+
+def test_failures_and_timeouts_do_not_cancel_other_calls():
+    calls = [
+        {"name": "fail", "args": {}},
+        {"name": "hang", "args": {"seconds": 5}},
+        {"name": "bad", "args": {}},
+        {"name": "add", "args": {}},
+    ]
+    outcomes = run(
+        dispatch_tool_calls(FakeCaller(), calls, timeout=5, timeouts={"hang": 0.05})
+    )
+    fail, hang, bad, add = outcomes
+    assert fail.error == "Tool fail failed: boom"
+    assert hang.error == "Tool hang timed out after 0.05s"
+    assert not bad.ok and bad.error is None
+    assert add.ok
+    assert fail.text == fail.error
+
+
+def test_missing_args_default_to_empty():
+    class Recorder:
+        async def call_tool(self, name, arguments=None):
+            return CallToolResult(content=[], isError=False)
+
+    (outcome,) = run(dispatch_tool_calls(Recorder(), [{"name": "ping"}]))
+    assert outcome.args == {}
+    assert outcome.ok and outcome.text == ""
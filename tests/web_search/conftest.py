@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The web search server is a script directory, not a package; its modules
+# import each other by bare name (``from cache import SearchCache``).
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "mcp_server_web_search"))
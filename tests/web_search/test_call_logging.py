@@ -0,0 +1,78 @@
+import asyncio
+import logging
+
+import pytest
+
+pytest.importorskip("mcp")
+
+from call_logging import CallLogger, ClientLogPolicy  # noqa: E402
+
+
+class FakeSession:
+    pass
+
+
+class FakeContext:
+    """Records what CallLogger sends to the client."""
+
+    def __init__(self):
+        self.session = FakeSession()
+        self.sent = []
+
+    async def log(self, level, message):
+        self.sent.append((level, message))
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_policy_rejects_unknown_level_and_mode():
+    with pytest.raises(ValueError):
+        ClientLogPolicy(default_level="verbose")
+    with pytest.raises(ValueError):
+        ClientLogPolicy(mode="loud")
+
+
+def test_immediate_mode_sends_enabled_messages():
+    ctx = FakeContext()
+    log = CallLogger(ctx, ClientLogPolicy(default_level="info"))
+    run(log.info("Found %d results", 3))
+    run(log.debug("not sent"))
+    assert ctx.sent == [("info", "Found 3 results")]
+
+
+def test_batched_mode_sends_one_notification_at_highest_level():
+    ctx = FakeContext()
+    policy = ClientLogPolicy(default_level="info", mode="batched")
+    log = CallLogger(ctx, policy)
+    run(log.info("first"))
+    run(log.error("second"))
+    assert ctx.sent == []
+    run(log.flush())
+    assert ctx.sent == [("error", "first\nsecond")]
+    assert policy.stats.notifications == 1
+
+
+def test_quiet_mode_writes_to_the_server_logger(caplog):
+    ctx = FakeContext()
+    policy = ClientLogPolicy(mode="quiet")
+    log = CallLogger(ctx, policy)
+    with caplog.at_level(logging.INFO, logger="call_logging"):
+        run(log.error("Request to SerpApi failed: %s", "timeout"))
+    assert ctx.sent == []
+    assert policy.stats.suppressed == 1
+    assert [(r.levelno, r.getMessage()) for r in caplog.records] == [
+        (logging.ERROR, "Request to SerpApi failed: timeout")
+    ]
+
+
+def test_messages_below_client_level_go_to_the_server_logger(caplog):
+    ctx = FakeContext()
+    log = CallLogger(ctx, ClientLogPolicy(default_level="error"))
+    with caplog.at_level(logging.DEBUG, logger="call_logging"):
+        run(log.warning("Rate limited, retrying"))
+    assert ctx.sent == []
+    assert [(r.levelno, r.getMessage()) for r in caplog.records] == [
+        (logging.WARNING, "Rate limited, retrying")
+    ]
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from concurrency import SingleFlight, TokenBucket
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_single_flight_shares_one_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "data"
+
+    async def scenario():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.run("key", fetch) for _ in range(5)))
+        return results, flight.snapshot()
+
+    results, snapshot = run(scenario())
+    assert results == ["data"] * 5
+    assert calls == [1]
+    assert snapshot == {"in_flight": 0, "started": 1, "coalesced": 4}
+
+
+def test_single_flight_cancelled_caller_does_not_cancel_others():
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "data"
+
+    async def scenario():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.run("key", fetch))
+        second = asyncio.ensure_future(flight.run("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert run(scenario()) == "data"
+
+
+def test_token_bucket_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=0.5)
+
+
+def test_token_bucket_allows_a_burst_then_waits():
+    async def scenario():
+        bucket = TokenBucket(rate=100, capacity=2)
+        for _ in range(3):
+            await bucket.acquire()
+        return bucket.waits
+
+    assert run(scenario()) >= 1
+
+
+def test_try_acquire_never_waits():
+    async def scenario():
+        bucket = TokenBucket(rate=0.001, capacity=1)
+        return bucket.try_acquire(), bucket.try_acquire()
+
+    assert run(scenario()) == (True, False)
+
+
+def test_try_acquire_does_not_jump_the_queue():
+    async def scenario():
+        bucket = TokenBucket(rate=50, capacity=1)
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        taken = bucket.try_acquire()
+        await waiter
+        return taken
+
+    assert run(scenario()) is False
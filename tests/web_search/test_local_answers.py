@@ -0,0 +1,50 @@
+import asyncio
+import importlib
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("mcp")
+
+NEWS_HIT = {
+    "link": "https://news",
+    "title": "mcp release",
+    "snippet": "new spec",
+    "source": {"name": "Example Times"},
+    "date": "2 hours ago",
+}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("SERPAPI_KEY", "test-key")
+    monkeypatch.setenv("SERPAPI_CACHE_ENABLED", "0")
+    monkeypatch.setenv("LOCAL_INDEX_ENABLED", "0")
+    return importlib.import_module("server")
+
+
+def local_hits(server, data, engine):
+    async def scenario():
+        index = server.LocalIndex()
+        await index.add_response(data, engine)
+        return await index.search("mcp release")
+
+    return asyncio.run(scenario())
+
+
+def test_local_news_answers_match_upstream_formatting(server):
+    hits = local_hits(server, {"news_results": [NEWS_HIT]}, "google_news")
+
+    upstream = server.format_news_result(1, NEWS_HIT)
+    assert server.format_local_hits(hits, server.format_news_result) == upstream
+    assert "**Source**: Example Times" in upstream
+    assert "**Date**: 2 hours ago" in upstream
+
+
+def test_local_search_formats_each_hit_for_its_engine(server):
+    hits = local_hits(server, {"news_results": [NEWS_HIT]}, "google_news")
+    assert server.format_local_hits(hits) == server.format_news_result(1, NEWS_HIT)
+
+    web_hit = {"link": "https://web", "title": "mcp release", "snippet": "docs"}
+    hits = local_hits(server, {"organic_results": [web_hit]}, "google")
+    assert server.format_local_hits(hits) == server.format_organic_result(1, web_hit)
@@ -0,0 +1,166 @@
+import asyncio
+import sqlite3
+
+from local_index import LocalIndex, tokenize
+
+
+def result(link, title, snippet=""):
+    return {"link": link, "title": title, "snippet": snippet}
+
+
+def response(*results, key="organic_results"):
+    return {key: list(results)}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    assert tokenize("La Canción de los Búhos") == ["cancion", "buhos"]
+
+
+def test_bm25_ranks_matching_documents_and_reports_coverage():
+    index = LocalIndex()
+    run(
+        index.add_response(
+            response(
+                result(
+                    "https://a", "python async http client", "httpx supports asyncio"
+                ),
+                result("https://b", "python packaging guide", "wheels and sdists"),
+                result("https://c", "gardening tips"),
+            ),
+            engine="google",
+        )
+    )
+
+    hits = run(index.search("async python client"))
+    assert [hit.document.link for hit in hits] == ["https://a", "https://b"]
+    assert hits[0].coverage == 1.0
+    assert hits[1].coverage == 1 / 3
+    assert hits[0].score > hits[1].score
+    assert run(index.search("quantum chromodynamics")) == []
+
+
+def test_search_can_filter_by_engine():
+    index = LocalIndex()
+    run(index.add_response(response(result("https://web", "mcp servers")), "google"))
+    news = response(result("https://news", "mcp servers"), key="news_results")
+    run(index.add_response(news, "google_news"))
+
+    hits = run(index.search("mcp servers", engine="google_news"))
+    assert [hit.document.link for hit in hits] == ["https://news"]
+
+
+def test_readding_a_link_replaces_its_postings():
+    index = LocalIndex()
+    run(index.add_response(response(result("https://a", "old title")), "google"))
+    run(index.add_response(response(result("https://a", "new title")), "google"))
+
+    assert len(index) == 1
+    assert run(index.search("old")) == []
+    assert index.snapshot()["terms"] == len(tokenize("new title https://a"))
+
+
+def test_oldest_documents_are_evicted_in_memory_and_on_disk(tmp_path):
+    db_path = tmp_path / "index.sqlite3"
+
+    async def scenario():
+        index = LocalIndex(db_path=db_path, max_documents=2)
+        await index.open()
+        for name in ("first", "second", "third"):
+            await index.add_response(
+                response(result(f"https://{name}", f"{name} page")), "google"
+            )
+        await index.close()
+        return index
+
+    index = run(scenario())
+    assert run(index.search("first")) == []
+    assert len(index) == 2
+
+    with sqlite3.connect(db_path) as db:
+        links = {row[0] for row in db.execute("SELECT link FROM documents")}
+    assert links == {"https://second", "https://third"}
+
+
+def test_documents_are_reloaded_from_disk(tmp_path):
+    db_path = tmp_path / "index.sqlite3"
+
+    async def scenario():
+        writer = LocalIndex(db_path=db_path)
+        await writer.open()
+        await writer.add_response(
+            response(result("https://a", "persisted doc")), "google"
+        )
+        await writer.close()
+
+        reader = LocalIndex(db_path=db_path)
+        await reader.open()
+        await reader.close()
+        return reader
+
+    reader = run(scenario())
+    assert [hit.document.link for hit in run(reader.search("persisted"))] == [
+        "https://a"
+    ]
+
+
+def test_news_source_and_date_survive_a_restart(tmp_path):
+    db_path = tmp_path / "index.sqlite3"
+    news = response(
+        {
+            "link": "https://news",
+            "title": "mcp release",
+            "snippet": "new spec",
+            "source": {"name": "Example Times", "icon": "https://icon"},
+            "date": "2 hours ago",
+        },
+        key="news_results",
+    )
+
+    async def scenario():
+        writer = LocalIndex(db_path=db_path)
+        await writer.open()
+        await writer.add_response(news, "google_news")
+        await writer.close()
+
+        reader = LocalIndex(db_path=db_path)
+        await reader.open()
+        await reader.close()
+        return await reader.search("mcp release")
+
+    (hit,) = run(scenario())
+    assert hit.document.as_result() == {
+        "title": "mcp release",
+        "link": "https://news",
+        "snippet": "new spec",
+        "source": "Example Times",
+        "date": "2 hours ago",
+    }
+
+
+def test_index_files_without_news_columns_are_migrated(tmp_path):
+    db_path = tmp_path / "index.sqlite3"
+    with sqlite3.connect(db_path) as db:
+        db.execute(
+            "CREATE TABLE documents (link TEXT PRIMARY KEY, title TEXT NOT NULL, "
+            "snippet TEXT NOT NULL, engine TEXT NOT NULL, added_at REAL NOT NULL)"
+        )
+        db.execute(
+            "INSERT INTO documents VALUES ('https://a', 'old doc', '', 'google', 1.0)"
+        )
+
+    async def scenario():
+        index = LocalIndex(db_path=db_path)
+        await index.open()
+        await index.add_response(
+            response(result("https://b", "new doc"), key="news_results"), "google_news"
+        )
+        await index.close()
+        return index
+
+    index = run(scenario())
+    assert len(index) == 2
+    assert run(index.search("old"))[0].document.source == ""
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+import resilience
+from resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    RetryPolicy,
+    hedged,
+)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def attempts(*delays, error_on=()):
+    """Factory whose n-th call sleeps ``delays[n]`` and returns n (or raises)."""
+    calls = []
+
+    async def attempt():
+        number = len(calls)
+        calls.append(number)
+        await asyncio.sleep(delays[number])
+        if number in error_on:
+            raise RuntimeError(f"attempt {number} failed")
+        return number
+
+    return attempt, calls
+
+
+def test_fast_attempt_is_not_hedged():
+    attempt, calls = attempts(0.0)
+    hedges = []
+    assert run(hedged(attempt, 0.05, on_hedge=lambda: hedges.append(1))) == 0
+    assert calls == [0] and hedges == []
+
+
+def test_slow_attempt_is_hedged_and_hedge_wins():
+    attempt, calls = attempts(1.0, 0.0)
+    hedges = []
+    assert run(hedged(attempt, 0.01, on_hedge=lambda: hedges.append(1))) == 1
+    assert calls == [0, 1] and hedges == [1]
+
+
+def test_hedge_is_skipped_when_not_allowed():
+    attempt, calls = attempts(0.05)
+    hedges = []
+    result = run(
+        hedged(
+            attempt,
+            0.01,
+            on_hedge=lambda: hedges.append(1),
+            may_hedge=lambda: False,
+        )
+    )
+    assert result == 0
+    assert calls == [0] and hedges == []
+
+
+def test_failed_attempt_lets_the_other_decide():
+    attempt, _ = attempts(0.05, 0.0, error_on={1})
+    assert run(hedged(attempt, 0.01)) == 0
+
+
+def test_error_is_raised_when_every_attempt_fails():
+    attempt, _ = attempts(0.05, 0.0, error_on={0, 1})
+    with pytest.raises(RuntimeError):
+        run(hedged(attempt, 0.01))
+
+
+def test_loser_is_cancelled():
+    cancelled = []
+
+    async def attempt(delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    delays = iter([1.0, 0.0])
+    assert run(hedged(lambda: attempt(next(delays)), 0.01)) == 0.0
+    assert cancelled == [1.0]
+
+
+def test_latency_tracker_waits_for_enough_samples():
+    tracker = LatencyTracker(window=10, min_samples=3)
+    tracker.record(0.1)
+    tracker.record(0.2)
+    assert tracker.percentile(0.95) is None
+    tracker.record(0.3)
+    assert tracker.percentile(0.5) == 0.2
+    assert tracker.percentile(0.95) == 0.3
+
+
+def test_latency_tracker_keeps_a_rolling_window():
+    tracker = LatencyTracker(window=3, min_samples=1)
+    for seconds in (5.0, 0.1, 0.2, 0.3):
+        tracker.record(seconds)
+    assert tracker.percentile(1.0) == 0.3
+
+
+def test_breaker_opens_after_threshold_and_rejects(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+
+    breaker.before_request()
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    assert breaker.rejected == 1
+
+
+def test_breaker_allows_one_half_open_trial(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+
+    now[0] += 10
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_failed_half_open_trial_reopens(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+    for _ in range(3):
+        breaker.record_failure()
+
+    now[0] += 10
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.times_opened == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_released_trial_lets_the_next_request_through(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    now[0] += 10
+
+    breaker.before_request()
+    breaker.release()
+    breaker.before_request()
+
+
+def test_retry_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(max_attempts=0, base_delay=0.2, max_delay=1.0)
+    assert policy.max_attempts == 1
+    for attempt in range(10):
+        delay = policy.backoff(attempt)
+        assert 0 <= delay <= min(1.0, 0.2 * 2**attempt)
@@ -0,0 +1,75 @@
+import asyncio
+import importlib
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("mcp")
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"organic_results": []}
+
+
+class FakeClient:
+    """Stands in for httpx.AsyncClient with a fixed upstream latency."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests = 0
+
+    async def get(self, url, params):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return FakeResponse()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("SERPAPI_KEY", "test-key")
+    monkeypatch.setenv("SERPAPI_CACHE_ENABLED", "0")
+    monkeypatch.setenv("LOCAL_INDEX_ENABLED", "0")
+    return importlib.import_module("server")
+
+
+def test_rate_limit_wait_does_not_trigger_hedges(server, monkeypatch):
+    # 20 requests against a 2-token burst at 50 rps queue for up to ~0.36 s,
+    # longer than the hedge delay, while the upstream itself answers in 0.05 s
+    monkeypatch.setattr(server, "HEDGE_DEFAULT_DELAY", 0.2)
+    client = FakeClient(latency=0.05)
+
+    async def scenario():
+        app = server.AppContext(
+            http_client=client, rate_limiter=server.TokenBucket(50, 2)
+        )
+        params = [{"engine": "google", "q": f"query {n}"} for n in range(20)]
+        await asyncio.gather(*(server.resilient_fetch(app, p) for p in params))
+        return app.upstream_stats
+
+    stats = asyncio.run(scenario())
+    assert stats.hedges == 0
+    assert client.requests == stats.attempts == 20
+
+
+def test_losing_hedge_attempts_are_recorded(server, monkeypatch):
+    monkeypatch.setattr(server, "HEDGE_DEFAULT_DELAY", 0.02)
+    latencies = iter([1.0, 0.0])
+
+    class SlowThenFastClient(FakeClient):
+        async def get(self, url, params):
+            self.requests += 1
+            await asyncio.sleep(next(latencies))
+            return FakeResponse()
+
+    async def scenario():
+        app = server.AppContext(http_client=SlowThenFastClient(latency=0))
+        await server.resilient_fetch(app, {"engine": "google", "q": "slow"})
+        return app
+
+    app = asyncio.run(scenario())
+    assert app.upstream_stats.hedges == 1
+    assert app.latency.snapshot()["samples"] == 2
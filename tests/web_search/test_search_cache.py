@@ -0,0 +1,149 @@
+import asyncio
+
+import cache as cache_module
+import pytest
+from cache import SearchCache, make_cache_key
+
+PARAMS = {"engine": "google", "q": "Model Context Protocol", "num": 5}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable replacement for time.time() inside cache.py."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_cache_key_ignores_case_whitespace_and_unrelated_params():
+    other = {"engine": "google", "q": "  model   context PROTOCOL ", "num": "5"}
+    assert make_cache_key(PARAMS) == make_cache_key({**other, "api_key": "x"})
+    assert make_cache_key(PARAMS) != make_cache_key({**PARAMS, "num": 10})
+
+
+def test_fresh_stale_and_expired_lookups(clock):
+    cache = SearchCache(default_ttl=60, stale_seconds=30)
+    run(cache.set(PARAMS, {"answer": 1}))
+
+    clock[0] += 60
+    assert run(cache.get(PARAMS)) == ({"answer": 1}, False)
+
+    clock[0] += 10
+    assert run(cache.get(PARAMS)) == ({"answer": 1}, True)
+    assert cache.stats.stale_hits == 1
+
+    clock[0] += 30
+    assert run(cache.get(PARAMS)) == (None, False)
+    assert cache.snapshot()["memory_entries"] == 0
+
+
+def test_engine_ttl_overrides_default(clock):
+    cache = SearchCache(
+        engine_ttls={"google_news": 10}, default_ttl=100, stale_seconds=0
+    )
+    news = {**PARAMS, "engine": "google_news"}
+    run(cache.set(news, {"news": True}))
+    run(cache.set(PARAMS, {"web": True}))
+
+    clock[0] += 50
+    assert run(cache.get(news)) == (None, False)
+    assert run(cache.get(PARAMS)) == ({"web": True}, False)
+
+
+def test_lru_evicts_least_recently_used(clock):
+    cache = SearchCache(max_entries=2)
+    first, second, third = ({**PARAMS, "q": q} for q in ("a", "b", "c"))
+    run(cache.set(first, {"q": "a"}))
+    run(cache.set(second, {"q": "b"}))
+    run(cache.get(first))
+    run(cache.set(third, {"q": "c"}))
+
+    assert run(cache.get(second)) == (None, False)
+    assert run(cache.get(first))[0] == {"q": "a"}
+    assert cache.stats.evictions == 1
+
+
+def test_disk_tier_survives_restart(clock, tmp_path):
+    db_path = tmp_path / "serpapi.sqlite3"
+
+    async def scenario():
+        writer = SearchCache(db_path=db_path)
+        await writer.open()
+        await writer.set(PARAMS, {"persisted": True})
+        await writer.close()
+
+        reader = SearchCache(db_path=db_path)
+        await reader.open()
+        try:
+            return await reader.get(PARAMS), reader.stats.disk_hits
+        finally:
+            await reader.close()
+
+    assert run(scenario()) == (({"persisted": True}, False), 1)
+
+
+def test_expired_disk_rows_do_not_evict_live_entries(clock, tmp_path):
+    db_path = tmp_path / "serpapi.sqlite3"
+    live = {**PARAMS, "q": "live"}
+
+    async def scenario():
+        cache = SearchCache(
+            db_path=db_path, max_entries=1, default_ttl=60, stale_seconds=0
+        )
+        await cache.open()
+        await cache.set(PARAMS, {"old": True})
+        clock[0] += 120
+        await cache.set(live, {"live": True})
+        try:
+            assert await cache.get(PARAMS) == (None, False)
+            return await cache.get(live), cache.stats.memory_hits
+        finally:
+            await cache.close()
+
+    # The live entry is still served from memory, not reloaded from disk
+    assert run(scenario()) == (({"live": True}, False), 1)
+
+
+def test_refresh_runs_once_per_key(clock):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return {"fresh": True}
+
+    async def scenario():
+        cache = SearchCache(default_ttl=10, stale_seconds=100)
+        await cache.set(PARAMS, {"fresh": False})
+        clock[0] += 20
+        cache.schedule_refresh(PARAMS, fetch)
+        cache.schedule_refresh(PARAMS, fetch)
+        await asyncio.gather(*cache._refreshing.values())
+        return await cache.get(PARAMS), cache.stats.refreshes
+
+    assert run(scenario()) == (({"fresh": True}, False), 1)
+    assert len(calls) == 1
+
+
+def test_expired_disk_rows_are_pruned_while_running(clock, tmp_path):
+    db_path = tmp_path / "serpapi.sqlite3"
+
+    async def scenario():
+        cache = SearchCache(
+            db_path=db_path, default_ttl=60, stale_seconds=0, prune_every=3
+        )
+        await cache.open()
+        try:
+            await cache.set({**PARAMS, "q": "old"}, {"old": True})
+            clock[0] += 120
+            await cache.set({**PARAMS, "q": "a"}, {"q": "a"})
+            await cache.set({**PARAMS, "q": "b"}, {"q": "b"})
+            return cache._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        finally:
+            await cache.close()
+
+    assert run(scenario()) == 2
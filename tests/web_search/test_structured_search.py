@@ -0,0 +1,88 @@
+import asyncio
+import importlib
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("mcp")
+
+from mcp.shared.memory import create_connected_server_and_client_session  # noqa: E402
+
+RESPONSE = {
+    "answer_box": {"snippet": "Paris is the capital of France."},
+    "organic_results": [
+        {"title": "Paris", "link": "https://example.org/paris", "snippet": "City"},
+    ],
+}
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("SERPAPI_KEY", "test-key")
+    monkeypatch.setenv("SERPAPI_CACHE_ENABLED", "0")
+    monkeypatch.setenv("LOCAL_INDEX_ENABLED", "0")
+    module = importlib.import_module("server")
+    requests = []
+
+    async def fake_request(ctx, params, log):
+        requests.append(params)
+        return RESPONSE
+
+    monkeypatch.setattr(module, "make_serpapi_request", fake_request)
+    module.requests = requests
+    return module
+
+
+def call_tool(server, name, arguments):
+    async def scenario():
+        async with create_connected_server_and_client_session(
+            server.mcp._mcp_server
+        ) as session:
+            return await session.call_tool(name, arguments)
+
+    return asyncio.run(scenario())
+
+
+def test_search_type_schema_lists_valid_values(server):
+    async def scenario():
+        tools = await server.mcp.list_tools()
+        return next(tool for tool in tools if tool.name == "structured_search")
+
+    schema = asyncio.run(scenario()).inputSchema["properties"]["search_type"]
+    assert schema["enum"] == ["general", "news", "product", "qna"]
+
+
+def test_qna_search_returns_answer_box_and_organic_records(server):
+    result = call_tool(
+        server,
+        "structured_search",
+        {"query": "capital of france", "search_type": "qna"},
+    )
+
+    assert not result.isError
+    assert result.structuredContent["answer"] == "Paris is the capital of France."
+    assert result.structuredContent["results"] == [
+        {
+            "position": 1,
+            "title": "Paris",
+            "link": "https://example.org/paris",
+            "snippet": "City",
+        }
+    ]
+    assert server.requests[0]["engine"] == "google"
+
+
+def test_general_search_has_no_answer(server):
+    result = call_tool(server, "structured_search", {"query": "capital of france"})
+
+    assert result.structuredContent["answer"] is None
+    assert result.structuredContent["count"] == 1
+
+
+def test_unknown_search_type_is_rejected_by_the_schema(server):
+    result = call_tool(
+        server, "structured_search", {"query": "x", "search_type": "images"}
+    )
+
+    assert result.isError
+    assert server.requests == []